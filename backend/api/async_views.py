@@ -0,0 +1,179 @@
+"""
+Async variants of the read endpoints, for the ASGI deployment (uvicorn/daphne).
+
+Status and list polling are I/O bound: under ASGI a waiting request costs a
+coroutine instead of a worker thread. These views use Django's async ORM,
+the async cache API and redis.asyncio for Celery task state, and return the
+same JSON as their APIView counterparts in views.py.
+"""
+import asyncio
+import json
+import weakref
+
+import redis.asyncio as aioredis
+from celery import states
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.http import JsonResponse
+from django.views import View
+
+from utils.http_cache import acached_response
+from utils.jwt_helpers import verify_token
+from .models import Video, Transcript, Summary, ProcessingCheckpoint
+from .permissions import IsJwtAuthenticated
+from .serializers import VideoSerializer, VideoDetailSerializer, SummarySerializer
+from .views import parse_since, transcript_payload, transcript_resource
+
+User = get_user_model()
+
+# One connection pool per event loop (pools can't be shared across loops)
+_result_clients = weakref.WeakKeyDictionary()
+
+
+def result_backend():
+    loop = asyncio.get_running_loop()
+    client = _result_clients.get(loop)
+    if client is None:
+        client = _result_clients[loop] = aioredis.from_url(settings.CELERY_RESULT_BACKEND)
+    return client
+
+
+async def task_meta(task_id):
+    """Celery's stored state for a task, read straight from the Redis result backend"""
+    raw = await result_backend().get(f'celery-task-meta-{task_id}')
+    if raw is None:
+        return {'status': states.PENDING, 'result': None}
+    return json.loads(raw)
+
+
+def task_error(result):
+    """Mirror str(AsyncResult.info) for a serialized exception"""
+    if not isinstance(result, dict):
+        return str(result)
+    message = result.get('exc_message', '')
+    if isinstance(message, (list, tuple)):
+        return ' '.join(str(part) for part in message)
+    return str(message)
+
+
+async def authenticate(request):
+    """Async counterpart of IsJwtAuthenticated; returns the user or None"""
+    header = request.headers.get('Authorization', '')
+    if not header.startswith('Bearer '):
+        return None
+    verified, data = verify_token(header.split(' ', 1)[1].strip())
+    if not verified:
+        return None
+    return await User.objects.filter(id=data.get('user_id')).afirst()
+
+
+def not_found():
+    return JsonResponse({"detail": "Not found."}, status=404)
+
+
+class AsyncJwtView(View):
+    http_method_names = ['get', 'options']
+
+    async def dispatch(self, request, *args, **kwargs):
+        request.user = await authenticate(request)
+        if request.user is None:
+            return JsonResponse({"detail": IsJwtAuthenticated.message}, status=403)
+        return await super().dispatch(request, *args, **kwargs)
+
+    async def get_video(self, request, video_id):
+        return await Video.objects.filter(id=video_id, user=request.user).afirst()
+
+
+class AsyncVideoListView(AsyncJwtView):
+    async def get(self, request):
+        videos = [video async for video in Video.objects.filter(user=request.user).order_by('-uploaded_at')]
+        return JsonResponse({
+            "videos": VideoSerializer(videos, many=True).data,
+            "count": len(videos)
+        })
+
+
+class AsyncVideoDetailView(AsyncJwtView):
+    async def get(self, request, video_id):
+        video = await self.get_video(request, video_id)
+        if video is None:
+            return not_found()
+
+        async def build():
+            detailed = await Video.objects.prefetch_related('transcript_set', 'summary_set').aget(id=video.id)
+            return VideoDetailSerializer(detailed).data, 200
+
+        return await acached_response(request, video, 'detail', build)
+
+
+class AsyncVideoTranscriptView(AsyncJwtView):
+    async def get(self, request, video_id):
+        video = await self.get_video(request, video_id)
+        if video is None:
+            return not_found()
+        since = request.GET.get('since')
+        try:
+            filters = parse_since(since) if since is not None else None
+        except ValueError as e:
+            return JsonResponse({"error": str(e)}, status=400)
+
+        async def build():
+            transcripts = Transcript.objects.filter(video=video).order_by('start_time', 'id').defer('word_timings')
+            if filters:
+                transcripts = transcripts.filter(**filters)
+            transcripts = [t async for t in transcripts]
+            if filters is None and not transcripts:
+                return {
+                    "message": "No transcript available for this video. Make sure the video has been processed."
+                }, 404
+            complete = video.processed or await ProcessingCheckpoint.objects.filter(
+                video=video, stage='transcript'
+            ).aexists()
+            return transcript_payload(video, transcripts, complete, filters), 200
+
+        return await acached_response(request, video, transcript_resource(filters), build)
+
+
+class AsyncVideoSummaryView(AsyncJwtView):
+    async def get(self, request, video_id):
+        video = await self.get_video(request, video_id)
+        if video is None:
+            return not_found()
+
+        async def build():
+            summaries = [s async for s in Summary.objects.filter(video=video)]
+            if not summaries:
+                return {
+                    "message": "No summary available for this video. Make sure the video has been processed."
+                }, 404
+            return {
+                "video_id": video.id,
+                "video_title": video.title,
+                "summaries": SummarySerializer(summaries, many=True).data
+            }, 200
+
+        return await acached_response(request, video, 'summary', build)
+
+
+class AsyncTaskStatusView(AsyncJwtView):
+    async def get(self, request, task_id):
+        try:
+            meta = await task_meta(task_id)
+        except Exception as e:
+            return JsonResponse({'error': f'Failed to get task status: {str(e)}'}, status=400)
+
+        task_status = meta.get('status', states.PENDING)
+        result = meta.get('result')
+        response_data = {
+            'task_id': task_id,
+            'status': task_status,
+            'ready': task_status in states.READY_STATES,
+        }
+        if task_status == states.SUCCESS:
+            response_data['result'] = result
+        elif task_status in states.READY_STATES:
+            response_data['error'] = task_error(result)
+        elif isinstance(result, dict) and result:
+            # Task is still running; result holds the progress meta
+            response_data['progress'] = result
+        return JsonResponse(response_data)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='model_selection_reason',
+            field=models.TextField(blank=True, default=''),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='quality',
+            field=models.CharField(choices=[('auto', 'Auto'), ('fast', 'Fast'), ('quality', 'Quality')], default='auto', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='whisper_model',
+            field=models.CharField(blank=True, default='', max_length=32),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_video_model_selection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='language',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='language',
+            field=models.CharField(blank=True, default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_language_detection'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='batch_state',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='batch_token',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:04
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_status(apps, schema_editor):
+    Video = apps.get_model('api', 'Video')
+    Video.objects.filter(processed=True).update(status='completed')
+    Video.objects.filter(queued_at__isnull=True).update(queued_at=F('uploaded_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_video_batch_state'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='dispatched_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='queued_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='status',
+            field=models.CharField(choices=[('waiting', 'Waiting'), ('queued', 'Queued'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='waiting', max_length=16),
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='task_id',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_status, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_video_scheduling'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='not_before',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='status',
+            field=models.CharField(choices=[('waiting', 'Waiting'), ('deferred', 'Deferred'), ('queued', 'Queued'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='waiting', max_length=16),
+        ),
+        migrations.CreateModel(
+            name='StageMetric',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=32)),
+                ('audio_seconds', models.FloatField()),
+                ('elapsed_seconds', models.FloatField()),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'stage_metrics',
+                'indexes': [models.Index(fields=['stage', '-created_at'], name='stage_metri_stage_db00e2_idx')],
+            },
+        ),
+    ]
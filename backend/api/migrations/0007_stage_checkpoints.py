@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:09
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_admission_control'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProcessingCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('stage', models.CharField(max_length=32)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('completed_at', models.DateTimeField(auto_now=True)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='checkpoints', to='api.video')),
+            ],
+            options={
+                'db_table': 'processing_checkpoints',
+                'constraints': [models.UniqueConstraint(fields=('video', 'stage'), name='unique_checkpoint_per_stage')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SummaryChunk',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index', models.PositiveIntegerField()),
+                ('start_time', models.FloatField(default=0.0)),
+                ('end_time', models.FloatField(default=0.0)),
+                ('text_hash', models.CharField(max_length=64)),
+                ('summary', models.TextField()),
+                ('created_at', models.DateTimeField(auto_now=True)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='summary_chunks', to='api.video')),
+            ],
+            options={
+                'db_table': 'summary_chunks',
+                'ordering': ['index'],
+                'constraints': [models.UniqueConstraint(fields=('video', 'index'), name='unique_summary_chunk')],
+            },
+        ),
+    ]
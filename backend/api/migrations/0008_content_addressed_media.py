@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:12
+
+import utils.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_stage_checkpoints'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('size', models.BigIntegerField(default=0)),
+                ('ref_count', models.IntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'media_blobs',
+            },
+        ),
+        migrations.AddField(
+            model_name='video',
+            name='audio_file',
+            field=models.FileField(blank=True, storage=utils.storage.media_storage, upload_to='audio/'),
+        ),
+        migrations.AlterField(
+            model_name='video',
+            name='file',
+            field=models.FileField(blank=True, storage=utils.storage.media_storage, upload_to='videos/'),
+        ),
+    ]
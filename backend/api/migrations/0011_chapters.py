@@ -0,0 +1,35 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:36
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_content_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summarychunk',
+            name='title',
+            field=models.CharField(blank=True, default='', max_length=200),
+        ),
+        migrations.CreateModel(
+            name='Chapter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('start_time', models.FloatField()),
+                ('end_time', models.FloatField()),
+                ('title', models.CharField(max_length=200)),
+                ('summary', models.TextField()),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='chapters', to='api.video')),
+            ],
+            options={
+                'db_table': 'chapters',
+                'ordering': ['start_time'],
+                'indexes': [models.Index(fields=['video', 'start_time'], name='chapters_video_i_9a652f_idx')],
+            },
+        ),
+    ]
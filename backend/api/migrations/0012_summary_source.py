@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0011_chapters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='summary',
+            name='source',
+            field=models.CharField(choices=[('llm', 'LLM'), ('extractive', 'Extractive')], default='llm', max_length=16),
+        ),
+    ]
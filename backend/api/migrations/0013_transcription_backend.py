@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0012_summary_source'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='transcription_backend',
+            field=models.CharField(blank=True, choices=[('', 'Worker default'), ('whisper', 'Whisper'), ('whisper-int8', 'Whisper, int8-quantized (CPU)')], default='', max_length=16),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 10:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transcript',
+            name='word_timings',
+            field=models.BinaryField(blank=True, default=b''),
+        ),
+    ]
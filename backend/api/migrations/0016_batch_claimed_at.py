@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0015_word_timings'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='video',
+            name='batch_claimed_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 11:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0016_batch_claimed_at'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='video',
+            name='status',
+            field=models.CharField(choices=[('waiting', 'Waiting'), ('deferred', 'Deferred'), ('queued', 'Queued'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed')], db_index=True, default='waiting', max_length=16),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:09
+
+from django.db import migrations, models
+
+
+def create_dispatch_lock(apps, schema_editor):
+    apps.get_model('api', 'SchedulerLock').objects.get_or_create(name='dispatch')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0018_outbox_claims'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchedulerLock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=32, unique=True)),
+                ('acquired_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'db_table': 'scheduler_locks',
+            },
+        ),
+        migrations.RunPython(create_dispatch_lock, migrations.RunPython.noop),
+    ]
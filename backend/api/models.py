@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from utils.storage import media_storage
 # Create your models here.
 
 class User(AbstractUser):
@@ -16,12 +17,53 @@ class User(AbstractUser):
 
 
 class Video(models.Model):
+    STATUS_CHOICES = [
+        ('waiting', 'Waiting'),      # held by the scheduler
+        ('deferred', 'Deferred'),    # accepted under load, not scheduled before not_before
+        ('queued', 'Queued'),        # dispatched to Celery
+        ('processing', 'Processing'),  # picked up by a worker
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+    QUALITY_CHOICES = [
+        ('auto', 'Auto'),
+        ('fast', 'Fast'),
+        ('quality', 'Quality'),
+    ]
+    BACKEND_CHOICES = [
+        ('', 'Worker default'),
+        ('whisper', 'Whisper'),
+        ('whisper-int8', 'Whisper, int8-quantized (CPU)'),
+    ]
+
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='videos')
     title = models.CharField(max_length=255)
-    file = models.FileField(upload_to='videos/')
+    file = models.FileField(upload_to='videos/', storage=media_storage, blank=True)
+    audio_file = models.FileField(upload_to='audio/', storage=media_storage, blank=True)  # compact Opus derivative
     uploaded_at = models.DateTimeField(auto_now_add=True)
     processed = models.BooleanField(default=False)
     duration = models.FloatField(null=True, blank=True)  # in seconds
+    # Container metadata, probed from the file header at upload
+    audio_codec = models.CharField(max_length=32, blank=True)
+    sample_rate = models.IntegerField(null=True, blank=True)
+    bitrate = models.IntegerField(null=True, blank=True)  # bits per second, whole file
+    stream_count = models.PositiveSmallIntegerField(null=True, blank=True)
+    quality = models.CharField(max_length=16, choices=QUALITY_CHOICES, default='auto')
+    transcription_backend = models.CharField(max_length=16, choices=BACKEND_CHOICES, blank=True, default='')
+    whisper_model = models.CharField(max_length=32, blank=True, default='')
+    model_selection_reason = models.TextField(blank=True, default='')
+    language = models.CharField(max_length=16, blank=True, default='')  # detected language code
+    # Short-clip batching: '' (not batched), pending, claimed, done, failed
+    batch_state = models.CharField(max_length=16, blank=True, default='', db_index=True)
+    batch_token = models.CharField(max_length=64, blank=True, default='')
+    batch_claimed_at = models.DateTimeField(null=True, blank=True)
+    status = models.CharField(max_length=16, choices=STATUS_CHOICES, default='waiting', db_index=True)
+    queued_at = models.DateTimeField(null=True, blank=True)
+    not_before = models.DateTimeField(null=True, blank=True)
+    dispatched_at = models.DateTimeField(null=True, blank=True)
+    task_id = models.CharField(max_length=64, blank=True, default='')
+    # Bumped whenever transcript or summary rows change; part of the API ETags
+    content_version = models.PositiveIntegerField(default=0)
 
     class Meta:
         db_table = 'videos'
@@ -35,6 +77,9 @@ class Transcript(models.Model):
     text = models.TextField()
     start_time = models.FloatField(default=0.0)  # start time in seconds
     end_time = models.FloatField(default=0.0)    # end time in seconds
+    language = models.CharField(max_length=16, blank=True, default='')
+    # Packed uint32 word starts/ends (ms) and text offsets, see utils/word_timings.py
+    word_timings = models.BinaryField(blank=True, default=b'')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -45,9 +90,102 @@ class Transcript(models.Model):
         return f"Transcript for {self.video.title} ({self.start_time}s - {self.end_time}s)"
 
 
+class MediaBlob(models.Model):
+    """A content-addressed file in media storage, shared by every video that references it"""
+    name = models.CharField(max_length=255, unique=True)  # storage path (blobs/aa/bb/<sha256><ext>)
+    size = models.BigIntegerField(default=0)
+    ref_count = models.IntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'media_blobs'
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class ProcessingCheckpoint(models.Model):
+    """Output marker of a completed pipeline stage, so retries can resume"""
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='checkpoints')
+    stage = models.CharField(max_length=32)
+    data = models.JSONField(default=dict, blank=True)
+    completed_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'processing_checkpoints'
+        constraints = [
+            models.UniqueConstraint(fields=['video', 'stage'], name='unique_checkpoint_per_stage'),
+        ]
+
+    def __str__(self):
+        return f"{self.stage} checkpoint for video {self.video_id}"
+
+
+class SummaryChunk(models.Model):
+    """LLM summary of one chunk of a transcript (the map step of summarization)"""
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='summary_chunks')
+    index = models.PositiveIntegerField()
+    start_time = models.FloatField(default=0.0)
+    end_time = models.FloatField(default=0.0)
+    text_hash = models.CharField(max_length=64)  # hash of the chunk's transcript text
+    title = models.CharField(max_length=200, blank=True, default='')
+    summary = models.TextField()
+    created_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'summary_chunks'
+        ordering = ['index']
+        constraints = [
+            models.UniqueConstraint(fields=['video', 'index'], name='unique_summary_chunk'),
+        ]
+
+    def __str__(self):
+        return f"Chunk {self.index} summary for video {self.video_id}"
+
+
+class Chapter(models.Model):
+    """A topic section of a video; one per summary chunk, rewritten with the summary"""
+    video = models.ForeignKey(Video, on_delete=models.CASCADE, related_name='chapters')
+    start_time = models.FloatField()
+    end_time = models.FloatField()
+    title = models.CharField(max_length=200)
+    summary = models.TextField()
+
+    class Meta:
+        db_table = 'chapters'
+        ordering = ['start_time']
+        indexes = [models.Index(fields=['video', 'start_time'])]
+
+    def __str__(self):
+        return f"{self.title} ({self.start_time:.0f}s - {self.end_time:.0f}s)"
+
+
+class StageMetric(models.Model):
+    """Timing of one pipeline stage run, used to estimate throughput"""
+    STAGES = ['transcribe', 'summarize']
+
+    stage = models.CharField(max_length=32)
+    audio_seconds = models.FloatField()
+    elapsed_seconds = models.FloatField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'stage_metrics'
+        indexes = [models.Index(fields=['stage', '-created_at'])]
+
+    def __str__(self):
+        return f"{self.stage}: {self.audio_seconds:.0f}s audio in {self.elapsed_seconds:.1f}s"
+
+
 class Summary(models.Model):
+    SOURCE_CHOICES = [
+        ('llm', 'LLM'),
+        ('extractive', 'Extractive'),  # local sentence extraction: preview, fallback or no-LLM tier
+    ]
+
     video = models.ForeignKey(Video, on_delete=models.CASCADE)
     text = models.TextField()
+    source = models.CharField(max_length=16, choices=SOURCE_CHOICES, default='llm')
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
@@ -56,3 +194,40 @@ class Summary(models.Model):
     def __str__(self):
         return f"Summary for {self.video.title}"
 
+
+
+class OutboxMessage(models.Model):
+    """
+    A Celery task to publish, written in the same transaction as the rows it
+    refers to; the outbox relay sends it to the broker after commit.
+    """
+    task = models.CharField(max_length=128)  # registered task name
+    args = models.JSONField(default=list)
+    task_id = models.CharField(max_length=255, blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)  # taken by a relay that is publishing it
+    attempts = models.PositiveIntegerField(default=0)  # rejected publishes; parked at OUTBOX_MAX_ATTEMPTS
+    last_error = models.TextField(blank=True, default='')
+
+    class Meta:
+        db_table = 'outbox_messages'
+        indexes = [models.Index(fields=['published_at', 'id'])]
+
+    def __str__(self):
+        return f"{self.task}{tuple(self.args)} ({'published' if self.published_at else 'pending'})"
+
+
+class SchedulerLock(models.Model):
+    """
+    A row each dispatcher locks (by updating it) for the whole count-and-claim,
+    so concurrent dispatchers never hand out the same free worker slot twice.
+    """
+    name = models.CharField(max_length=32, unique=True)
+    acquired_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'scheduler_locks'
+
+    def __str__(self):
+        return self.name
@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import User, Video, Transcript, Summary
+from .models import User, Video, Transcript, Summary, Chapter
 from django.contrib.auth import authenticate
 
 class SignupSerializer(serializers.Serializer):
@@ -35,33 +35,52 @@ class AuthenticateSerializer(serializers.Serializer):
         return data
     
 class VideoSerializer(serializers.ModelSerializer):
+    processing_status = serializers.CharField(source='status', read_only=True)
+
     class Meta:
         model = Video
-        fields = ["id", "title", "file", "uploaded_at", "processed", "duration"]
-        read_only_fields = ["uploaded_at", "processed", "duration"]
+        fields = ["id", "title", "file", "uploaded_at", "processed", "duration",
+                  "audio_codec", "sample_rate", "bitrate", "stream_count",
+                  "quality", "transcription_backend", "whisper_model", "model_selection_reason", "language",
+                  "processing_status"]
+        read_only_fields = ["uploaded_at", "processed", "duration",
+                            "audio_codec", "sample_rate", "bitrate", "stream_count",
+                            "whisper_model", "model_selection_reason", "language"]
+        # The model field is blank-able (originals may be dropped after processing)
+        extra_kwargs = {"file": {"required": True, "allow_null": False}}
 
 
 class TranscriptSerializer(serializers.ModelSerializer):
     class Meta:
         model = Transcript
-        fields = ["id", "video", "text", "start_time", "end_time", "created_at"]
+        fields = ["id", "video", "text", "start_time", "end_time", "language", "created_at"]
         read_only_fields = ["created_at"]
 
 
 class SummarySerializer(serializers.ModelSerializer):
     class Meta:
         model = Summary
-        fields = ["id", "video", "text", "created_at"]
+        fields = ["id", "video", "text", "source", "created_at"]
         read_only_fields = ["created_at"]
 
 
+class ChapterSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Chapter
+        fields = ["id", "start_time", "end_time", "title", "summary"]
+
+
 class VideoDetailSerializer(serializers.ModelSerializer):
     transcript = TranscriptSerializer(source='transcript_set', many=True, read_only=True)
     summary = SummarySerializer(source='summary_set', many=True, read_only=True)
-    
+    processing_status = serializers.CharField(source='status', read_only=True)
+
     class Meta:
         model = Video
-        fields = ["id", "title", "file", "uploaded_at", "processed", "duration", "transcript", "summary"]
+        fields = ["id", "title", "file", "uploaded_at", "processed", "duration",
+                  "audio_codec", "sample_rate", "bitrate", "stream_count",
+                  "quality", "whisper_model", "model_selection_reason", "language",
+                  "processing_status", "transcript", "summary"]
 
 class UserEditSerializer(serializers.ModelSerializer):
     class Meta:
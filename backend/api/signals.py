@@ -0,0 +1,16 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from utils.storage import acquire_blob, release_blob
+from .models import Video
+
+
+@receiver(post_save, sender=Video)
+def reference_uploaded_media(sender, instance, created, **kwargs):
+    if created:
+        acquire_blob(instance.file.name)
+
+
+@receiver(post_delete, sender=Video)
+def release_video_media(sender, instance, **kwargs):
+    release_blob(instance.file.name)
+    release_blob(instance.audio_file.name)
@@ -2,12 +2,38 @@
 Celery tasks for async video processing
 """
 from celery import shared_task
+from celery.exceptions import Ignore, MaxRetriesExceededError, SoftTimeLimitExceeded
+from datetime import timedelta
 from django.apps import apps
+from django.utils import timezone
 import whisper
 import os
-from utils.video_helper import get_video_duration, generate_summary
+import time
+from utils.video_helper import (
+    get_video_duration,
+    load_whisper_model,
+    choose_model,
+    detect_video_language,
+    is_batchable,
+    transcribe_clip_batch,
+    ensure_audio,
+    release_audio,
+    archive_media,
+    media_source_path,
+    transcribe_video,
+    transcript_segments,
+    save_transcript,
+    needs_continuation,
+    initial_progress,
+    transcribe_next_window,
+)
+from utils.summary_helper import generate_summary, save_preview_summary, StreamingSummarizer
+from utils.checkpoints import get_checkpoint, save_checkpoint
 from groq import Groq
 from django.conf import settings
+from utils.scheduler import dispatch_pending, begin_processing, heartbeat, reap_stalled
+from utils.outbox import relay_outbox
+from utils.admission import record_stage_timing
 
 client = Groq(api_key=settings.GROQ_API_KEY)
 
@@ -22,58 +48,396 @@ def update_progress(self, current, total, message, state='PROGRESS'):
         }
     )
 
+def notify_uploader(video, summary, full_text):
+    """Send email notification to the uploader"""
+    from django.core.mail import send_mail
+    subject = f'Your video "{video.title}" is processed!'
+    message = f'Hello {video.user.username},\n\nYour video "{video.title}" has been processed successfully.\n\nDuration: {video.duration} seconds\nSummary: {summary.text}\n\nTranscript (first 500 chars):\n{full_text[:500]}...'
+    recipient_list = [video.user.email]
+    send_mail(subject, message, None, recipient_list, fail_silently=True)
+
+
+def success_result(video, transcripts, summary):
+    return {
+        'status': 'SUCCESS',
+        'current': 100,
+        'total': 100,
+        'message': f'Video "{video.title}" processed successfully!',
+        'transcript_id': transcripts[0].id if transcripts else None,
+        'transcript_segments': len(transcripts),
+        'summary_id': summary.id,
+        'duration': video.duration
+    }
+
+
+def finish_video(video, summary):
+    """Mark a video processed, notify the uploader and free its scheduler slot"""
+    transcripts = transcript_segments(video)
+    video.processed = True
+    video.status = 'completed'
+    video.language = video.language or (transcripts[0].language if transcripts else '')
+    video.save()
+    archive_media(video)
+    release_audio(video)
+    notify_uploader(video, summary, ' '.join(t.text for t in transcripts))
+    dispatch_pending_videos.delay()
+    return success_result(video, transcripts, summary)
+
+
+def summarize_stage(video, final_attempt=True):
+    """
+    Stage 3: chunk summaries + reduce, skipped if already checkpointed.
+    An extractive preview is saved first so readers get a summary at once;
+    if the LLM still fails on the final attempt, the extractive summary is kept.
+    """
+    Summary = apps.get_model('api', 'Summary')
+    summary = Summary.objects.filter(video=video).order_by('-id').first()
+    if summary and get_checkpoint(video, 'summary') is not None:
+        return summary
+    if summary is None and settings.SUMMARY_EXTRACTIVE_PREVIEW and settings.SUMMARY_BACKEND == 'llm':
+        save_preview_summary(video)
+    started = time.monotonic()
+    summary = summarize_with_fallback(video, final_attempt)
+    record_stage_timing('summarize', video.duration, time.monotonic() - started)
+    return summary
+
+
+def summarize_with_fallback(video, final_attempt, keep_chunks=False):
+    """generate_summary, falling back to the extractive summary when the LLM fails on the final attempt"""
+    try:
+        return generate_summary(video, keep_chunks=keep_chunks)
+    except ValueError:
+        raise
+    except Exception as exc:
+        if not (final_attempt and settings.SUMMARY_EXTRACTIVE_FALLBACK):
+            raise
+        print(f"LLM summary failed for video {video.id} ({exc}); keeping the extractive summary")
+        return generate_summary(video, source='extractive')
+
+
+def streaming_summarizer(video):
+    """Chunk summaries overlapping transcription, unless disabled or not using the LLM"""
+    if settings.SUMMARY_STREAMING and settings.SUMMARY_BACKEND == 'llm':
+        return StreamingSummarizer(video)
+    return None
+
+
+def last_attempt(task):
+    return task.request.retries >= settings.PROCESSING_MAX_RETRIES
+
+
+def retry_or_fail(self, video_id, exc, fail_video=True):
+    """
+    Retry with exponential backoff (resuming from checkpoints), then give up.
+    With fail_video=False (follow-up work on a finished video) giving up
+    leaves the video as it is.
+    """
+    Video = apps.get_model('api', 'Video')
+    if not isinstance(exc, ValueError) and self.request.retries < settings.PROCESSING_MAX_RETRIES:
+        countdown = settings.PROCESSING_RETRY_BACKOFF * 2 ** self.request.retries
+        # Let the retry claim the video again
+        Video.objects.filter(id=video_id, status='processing').update(status='queued')
+        update_progress(self, 0, 100, f'Processing failed ({exc}); retrying in {countdown}s...')
+        raise self.retry(exc=exc, countdown=countdown, max_retries=settings.PROCESSING_MAX_RETRIES)
+    if fail_video:
+        Video.objects.filter(id=video_id).update(status='failed')
+        dispatch_pending_videos.delay()
+    update_progress(self, 0, 100, f'Processing failed: {str(exc)}', state='FAILURE')
+    raise exc
+
+
 @shared_task(bind=True)
 def process_video_async(self, video_id):
     """
-    Async task to process video in background with progress tracking
+    Async task to process video in background with progress tracking.
+    Each stage (audio decode, transcript, summary) is checkpointed, so an
+    automatic retry resumes after the last completed stage.
     """
+    Video = apps.get_model('api', 'Video')
     try:
-        Video = apps.get_model('api', 'Video')
-        Transcript = apps.get_model('api', 'Transcript')
         video = Video.objects.get(id=video_id)
-        file_path = video.file.path
+        if not begin_processing(video, self.request.id):
+            # Duplicate or stale delivery: leave the task state to the run that owns the video
+            raise Ignore()
+        heartbeat(video_id)
+        file_path = media_source_path(video)
 
         update_progress(self, 10, 100, 'Initializing video processing...')
-        update_progress(self, 20, 100, 'Loading speech recognition model...')
-        model = whisper.load_model("tiny")  # Much faster than "base"
-        update_progress(self, 30, 100, 'Transcribing audio... (This may take a while)')
-        result = model.transcribe(file_path)
-        full_text = result["text"]
-        update_progress(self, 70, 100, 'Audio transcription completed. Getting video info...')
-        video_duration = get_video_duration(file_path)
-        update_progress(self, 80, 100, 'Saving transcript...')
-        transcript = Transcript.objects.create(
-            video=video,
-            text=full_text,
-            start_time=0.0,
-            end_time=video_duration
-        )
+        video_duration = video.duration or get_video_duration(file_path)
+        if get_checkpoint(video, 'transcript') is None and is_batchable(video_duration):
+            # Short clip: hand over to the batching worker, which keeps this task id
+            video.duration = video_duration
+            video.batch_state = 'pending'
+            video.save(update_fields=['duration', 'batch_state'])
+            update_progress(self, 20, 100, 'Waiting for a transcription batch...')
+            return self.replace(
+                process_short_clip_batch.s(video_id).set(countdown=settings.WHISPER_BATCH_DEADLINE)
+            )
+
+        if get_checkpoint(video, 'transcript') is None:
+            update_progress(self, 12, 100, 'Extracting audio...')
+            # Streaming mode decodes through a pipe while transcribing instead of caching PCM
+            audio_path = file_path if settings.AUDIO_STREAM_DECODE else ensure_audio(video)
+            update_progress(self, 15, 100, 'Detecting spoken language...')
+            language = detect_video_language(video, audio_path)
+            model_name = choose_model(video, video_duration, language)
+            if needs_continuation(video_duration, model_name):
+                # Too long for one task: continue window by window under this task id
+                update_progress(self, 20, 100, 'Long video: transcribing in windows...')
+                return self.replace(transcribe_window.s(video_id, 0.0))
+            update_progress(self, 20, 100, f'Loading speech recognition model ({model_name})...')
+            started = time.monotonic()
+            model = load_whisper_model(model_name, video.transcription_backend)
+            update_progress(self, 30, 100, 'Transcribing audio... (This may take a while)')
+            summarizer = streaming_summarizer(video)
+            try:
+                transcribe_video(video, model, audio_path, language, summarizer)
+                record_stage_timing('transcribe', video_duration, time.monotonic() - started)
+                if summarizer is not None:
+                    update_progress(self, 85, 100, 'Collecting chunk summaries...')
+                    summarizer.finish()
+            finally:
+                if summarizer is not None:
+                    summarizer.close()
+        else:
+            update_progress(self, 80, 100, 'Transcript already available, resuming...')
+
+        video.duration = video_duration
+        video.language = video.language or (get_checkpoint(video, 'transcript') or {}).get('language', '')
         update_progress(self, 90, 100, 'Generating AI summary...')
-        summary = generate_summary(transcript)
+        summary = summarize_stage(video, last_attempt(self))
         update_progress(self, 95, 100, 'Finalizing...')
-        video.processed = True
-        video.duration = video_duration
-        video.save()
-
-        # Send email notification to the uploader
-        from django.core.mail import send_mail
-        subject = f'Your video "{video.title}" is processed!'
-        message = f'Hello {video.user.username},\n\nYour video "{video.title}" has been processed successfully.\n\nDuration: {video.duration} seconds\nSummary: {summary.text}\n\nTranscript (first 500 chars):\n{full_text[:500]}...'
-        recipient_list = [video.user.email]
-        send_mail(subject, message, None, recipient_list, fail_silently=True)
-
-        return {
-            'status': 'SUCCESS',
-            'current': 100,
-            'total': 100,
-            'message': f'Video "{video.title}" processed successfully!',
-            'transcript_id': transcript.id,
-            'summary_id': summary.id,
-            'duration': video.duration
-        }
+        return finish_video(video, summary)
+    except Ignore:
+        raise
     except Video.DoesNotExist:
         update_progress(self, 0, 100, f'Video with ID {video_id} not found', state='FAILURE')
         raise Exception(f'Video with ID {video_id} not found')
     except Exception as exc:
-        update_progress(self, 0, 100, f'Processing failed: {str(exc)}', state='FAILURE')
-        raise exc
+        retry_or_fail(self, video_id, exc)
+
+
+@shared_task(bind=True)
+def transcribe_window(self, video_id, offset):
+    """
+    Continuation task for long videos: transcribes one bounded window, persists
+    its segments, then replaces itself with the task for the next window (so
+    the original task id keeps tracking progress). If the soft time limit hits
+    mid-window, the window is halved and retried from the last checkpoint.
+    `offset` only labels the invocation; the progress checkpoint is authoritative.
+    """
+    Video = apps.get_model('api', 'Video')
+    try:
+        video = Video.objects.get(id=video_id)
+        heartbeat(video_id)
+        progress = get_checkpoint(video, 'transcript_progress') or initial_progress(video)
+        if not progress['done']:
+            duration = video.duration or progress['offset'] + progress['window']
+            percent = 30 + int(50 * min(1.0, progress['offset'] / duration))
+            update_progress(self, percent, 100, f'Transcribing from {progress["offset"]:.0f}s of {duration:.0f}s...')
+            audio_path = ensure_audio(video)  # windows span tasks, so always from the PCM cache
+            model = load_whisper_model(video.whisper_model, video.transcription_backend)
+            window_start = progress['offset']
+            started = time.monotonic()
+            # Chunks sealed by earlier windows are summarized while this one is transcribed
+            summarizer = streaming_summarizer(video)
+            try:
+                if summarizer is not None:
+                    summarizer.submit()
+                try:
+                    progress = transcribe_next_window(video, model, audio_path, progress)
+                except SoftTimeLimitExceeded:
+                    progress['window'] = max(settings.TRANSCRIPTION_MIN_WINDOW_SECONDS, progress['window'] / 2)
+                    save_checkpoint(video, 'transcript_progress', progress)
+                    return self.replace(transcribe_window.s(video_id, progress['offset']))
+                # Outside the handler above: this window is committed, so a slow LLM reply
+                # must not shrink the next one. Unfinished chunks are left to the final summary.
+                if summarizer is not None:
+                    try:
+                        summarizer.finish()
+                    except SoftTimeLimitExceeded:
+                        print(f"Chunk summaries for video {video_id} outlived the time limit; left to the final summary")
+            finally:
+                if summarizer is not None:
+                    summarizer.close()
+            record_stage_timing('transcribe', progress['offset'] - window_start, time.monotonic() - started)
+            if not progress['done']:
+                return self.replace(transcribe_window.s(video_id, progress['offset']))
+
+        return self.replace(finish_processing.s(video_id))
+    except Ignore:
+        raise
+    except Exception as exc:
+        retry_or_fail(self, video_id, exc)
+
+
+@shared_task(bind=True)
+def finish_processing(self, video_id):
+    """Summary stage and finalization, run in a fresh task after continuation mode"""
+    Video = apps.get_model('api', 'Video')
+    try:
+        video = Video.objects.get(id=video_id)
+        heartbeat(video_id)
+        video.language = video.language or (get_checkpoint(video, 'transcript') or {}).get('language', '')
+        update_progress(self, 90, 100, 'Generating AI summary...')
+        summary = summarize_stage(video, last_attempt(self))
+        update_progress(self, 95, 100, 'Finalizing...')
+        return finish_video(video, summary)
+    except Exception as exc:
+        retry_or_fail(self, video_id, exc)
+
+
+@shared_task(bind=True)
+def resummarize_video(self, video_id):
+    """
+    Refresh the summary after transcript edits: chunk boundaries are kept, so
+    only the edited chunks go back to the LLM before the reduce step.
+    """
+    Video = apps.get_model('api', 'Video')
+    try:
+        video = Video.objects.get(id=video_id)
+        update_progress(self, 50, 100, 'Re-summarizing edited chunks...')
+        started = time.monotonic()
+        summary = summarize_with_fallback(video, last_attempt(self), keep_chunks=True)
+        record_stage_timing('summarize', video.duration, time.monotonic() - started)
+        return {'video_id': video.id, 'summary_id': summary.id}
+    except Exception as exc:
+        retry_or_fail(self, video_id, exc, fail_video=False)
+
+
+def fail_batched_clip(self, video_id, message):
+    """Give up on a batched clip: mark it failed, free its slot and report FAILURE"""
+    Video = apps.get_model('api', 'Video')
+    Video.objects.filter(id=video_id).update(batch_state='failed', status='failed')
+    dispatch_pending_videos.delay()
+    update_progress(self, 0, 100, message, state='FAILURE')
+
+
+def reclaim_stale_batches():
+    """Return clips claimed by a batch task that died (older than the hard time limit) to pending"""
+    Video = apps.get_model('api', 'Video')
+    cutoff = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    return Video.objects.filter(batch_state='claimed', batch_claimed_at__lt=cutoff).update(
+        batch_state='pending', batch_token='', batch_claimed_at=None
+    )
+
+
+@shared_task(bind=True)
+def process_short_clip_batch(self, video_id):
+    """
+    Batching worker mode for short clips. Whichever batch task runs first claims
+    every pending short clip (up to WHISPER_BATCH_MAX_CLIPS), transcribes their
+    30 s windows in shared encoder/decoder passes and fans the results back out.
+    Tasks whose clip was claimed by another batch wait for it to finish, for at
+    most WHISPER_BATCH_MAX_WAITS checks; claims of dead batches are reclaimed.
+    """
+    Video = apps.get_model('api', 'Video')
+    Summary = apps.get_model('api', 'Summary')
+
+    video = Video.objects.get(id=video_id)
+    heartbeat(video_id)
+    if video.batch_state == 'done':
+        return success_result(
+            video,
+            transcript_segments(video),
+            Summary.objects.filter(video=video).order_by('-id').first(),
+        )
+    if video.batch_state == 'failed':
+        update_progress(self, 0, 100, 'Batched transcription failed', state='FAILURE')
+        raise Exception(f'Batched transcription failed for video {video_id}')
+
+    reclaim_stale_batches()
+    token = self.request.id
+    # The task's own clip always rides in the batch it claims
+    candidates = [video_id] + list(
+        Video.objects.filter(batch_state='pending').exclude(id=video_id)
+        .order_by('uploaded_at')
+        .values_list('id', flat=True)[:settings.WHISPER_BATCH_MAX_CLIPS - 1]
+    )
+    Video.objects.filter(id__in=candidates, batch_state='pending').update(
+        batch_state='claimed', batch_token=token, batch_claimed_at=timezone.now()
+    )
+    claimed = list(Video.objects.filter(batch_state='claimed', batch_token=token))
+    if video_id not in [v.id for v in claimed]:
+        # Another batch owns this clip: hand back anything claimed alongside it
+        # and check back once that batch is likely done
+        Video.objects.filter(batch_state='claimed', batch_token=token).update(
+            batch_state='pending', batch_token='', batch_claimed_at=None
+        )
+        try:
+            raise self.retry(countdown=settings.WHISPER_BATCH_DEADLINE, max_retries=settings.WHISPER_BATCH_MAX_WAITS)
+        except MaxRetriesExceededError:
+            fail_batched_clip(self, video_id, 'Timed out waiting for a transcription batch')
+            raise Exception(f'Timed out waiting for the batch of video {video_id}')
+
+    update_progress(self, 30, 100, f'Transcribing a batch of {len(claimed)} short clips...')
+    outcomes = {}
+    groups = {}
+    for clip in claimed:
+        try:
+            # Same routing as single videos: a detected language is pinned and English gets `.en`
+            language = detect_video_language(clip, media_source_path(clip))
+            model_name = choose_model(clip, clip.duration, language)
+        except Exception as exc:
+            outcomes[clip.id] = exc
+            continue
+        groups.setdefault((model_name, clip.transcription_backend, language), []).append(clip)
+
+    for (model_name, backend, language), clips in groups.items():
+        started = time.monotonic()
+        try:
+            windows = transcribe_clip_batch(
+                load_whisper_model(model_name, backend), [media_source_path(c) for c in clips], language
+            )
+        except Exception as exc:
+            for clip in clips:
+                outcomes[clip.id] = exc
+            continue
+        record_stage_timing('transcribe', sum(c.duration or 0 for c in clips), time.monotonic() - started)
+        for clip, clip_windows in zip(clips, windows):
+            outcomes[clip.id] = clip_windows
+
+    # Every claimed clip is finished or failed before this task reports its own outcome,
+    # so no clip is left claimed behind a failure
+    own_result = None
+    own_error = None
+    for clip in claimed:
+        clip_windows = outcomes[clip.id]
+        try:
+            if isinstance(clip_windows, Exception):
+                raise clip_windows
+            languages = [w['language'] for w in clip_windows if w['language']]
+            language = max(set(languages), key=languages.count) if languages else ''
+            save_transcript(clip, clip_windows, language)
+            clip.language = clip.language or language
+            summary = summarize_stage(clip)
+            clip.batch_state = 'done'
+            result = finish_video(clip, summary)
+            if clip.id == video_id:
+                own_result = result
+        except Exception as exc:
+            print(f"Batched processing failed for video {clip.id}: {exc}")
+            clip.batch_state = 'failed'
+            clip.status = 'failed'
+            clip.save(update_fields=['batch_state', 'status'])
+            if clip.id == video_id:
+                own_error = exc
+
+    dispatch_pending_videos.delay()
+    if own_error is not None:
+        update_progress(self, 0, 100, f'Processing failed: {str(own_error)}', state='FAILURE')
+        raise own_error
+    return own_result
+
+
+@shared_task
+def dispatch_pending_videos():
+    """
+    Free the slots of lost tasks, hand waiting videos to workers in fair-share /
+    shortest-job-first order, then relay the outbox so dispatches from workers
+    don't wait for the relay.
+    """
+    reap_stalled()
+    dispatched = dispatch_pending()
+    relay_outbox()
+    return dispatched
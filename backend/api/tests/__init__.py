@@ -0,0 +1,19 @@
+import tempfile
+from django.test import override_settings
+
+
+class TempDirsMixin:
+    """Point the `temp_dir_settings` at fresh temporary directories for the test class, removed afterwards"""
+    temp_dir_settings = ('MEDIA_ROOT',)
+
+    @classmethod
+    def setUpClass(cls):
+        directories = {}
+        for name in cls.temp_dir_settings:
+            directory = tempfile.TemporaryDirectory()
+            cls.addClassCleanup(directory.cleanup)
+            directories[name] = directory.name
+        override = override_settings(**directories)
+        override.enable()
+        cls.addClassCleanup(override.disable)
+        super().setUpClass()
@@ -0,0 +1,86 @@
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from rest_framework import status
+from api.models import Video, StageMetric, OutboxMessage
+from utils.admission import decide, processing_cost, estimate_wait, ACCEPT, DEFER, REJECT
+from utils.jwt_helpers import generate_tokens
+from utils.media_probe import MediaInfo
+from . import TempDirsMixin
+
+User = get_user_model()
+
+LIMITS = dict(
+    ADMISSION_DEFER_WAIT=600,
+    ADMISSION_REJECT_WAIT=3600,
+    ADMISSION_USER_DEFER_PENDING=3,
+    ADMISSION_USER_REJECT_PENDING=5,
+    ADMISSION_MIN_RETRY_AFTER=60,
+    ADMISSION_DEFER_DELAY=900,
+    SCHEDULER_MAX_IN_FLIGHT=1,
+)
+
+
+@override_settings(**LIMITS)
+class AdmissionDecisionTest(TestCase):
+    def test_decisions(self):
+        self.assertEqual(decide(10, 0).decision, ACCEPT)
+        self.assertEqual(decide(700, 0).decision, DEFER)
+        self.assertEqual(decide(10, 3).decision, DEFER)
+        self.assertEqual(decide(10, 5).decision, REJECT)
+        rejected = decide(4000, 0)
+        self.assertEqual(rejected.decision, REJECT)
+        self.assertEqual(rejected.retry_after, 3400)
+
+    def test_throughput_from_recent_stage_metrics(self):
+        StageMetric.objects.create(stage='transcribe', audio_seconds=100, elapsed_seconds=20)
+        StageMetric.objects.create(stage='transcribe', audio_seconds=300, elapsed_seconds=20)
+        StageMetric.objects.create(stage='summarize', audio_seconds=400, elapsed_seconds=4)
+        self.assertAlmostEqual(processing_cost(), 0.11)
+
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        Video.objects.create(user=user, title='a', file='videos/a.mp4', duration=1000, status='queued')
+        Video.objects.create(user=user, title='b', file='videos/b.mp4', duration=50, status='completed')
+        self.assertAlmostEqual(estimate_wait(), 110)
+
+
+@override_settings(**LIMITS)
+@patch('api.views.probe_video', return_value=MediaInfo(120.0, 'aac', 44100, 128000, 2))
+@patch('api.tasks.process_video_async.apply_async')
+class UploadAdmissionTest(TempDirsMixin, TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        tokens = generate_tokens(self.user)
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {tokens["access_token"]}')
+
+    def upload(self):
+        return self.client.post('/api/video/upload', {
+            'title': 'Clip',
+            'file': SimpleUploadedFile('clip.mp4', b'fake video content', 'video/mp4'),
+        }, format='multipart')
+
+    def test_accepted_upload_reports_estimate(self, mock_apply, mock_duration):
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'processing_queued')
+        self.assertIn('estimated_completion', response.data)
+        # The request only writes the outbox; the relay talks to the broker
+        mock_apply.assert_not_called()
+        self.assertEqual(OutboxMessage.objects.get().args, [response.data['id']])
+
+    def test_user_limits_defer_then_reject(self, mock_apply, mock_duration):
+        for _ in range(3):
+            self.upload()
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['status'], 'processing_deferred')
+        self.assertEqual(Video.objects.get(id=response.data['id']).status, 'deferred')
+
+        self.upload()
+        response = self.upload()
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertIn('Retry-After', response)
+        self.assertEqual(Video.objects.count(), 5)
@@ -0,0 +1,61 @@
+from unittest.mock import patch, AsyncMock
+from django.core.cache import cache
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video
+from utils.jwt_helpers import generate_tokens
+from utils.summary_helper import save_summary
+from utils.video_helper import save_transcript
+
+User = get_user_model()
+
+
+class AsyncReadViewsTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.headers = {'Authorization': f'Bearer {generate_tokens(self.user)["access_token"]}'}
+        self.video = Video.objects.create(user=self.user, title='Talk', file='videos/talk.mp4', status='completed')
+        save_transcript(self.video, [{'start': 0.0, 'end': 2.0, 'text': 'Hello there.'}], 'en')
+        save_summary(self.video, 'A greeting.')
+        self.sync_client = APIClient()
+        self.sync_client.credentials(HTTP_AUTHORIZATION=self.headers['Authorization'])
+
+    async def test_requires_token(self):
+        response = await self.async_client.get('/api/async/videos/')
+        self.assertEqual(response.status_code, 403)
+
+    async def test_same_payloads_as_sync_views(self):
+        for path in ('videos/', f'video/{self.video.id}/', f'video/{self.video.id}/transcript/',
+                     f'video/{self.video.id}/summary/'):
+            response = await self.async_client.get(f'/api/async/{path}', headers=self.headers)
+            self.assertEqual(response.status_code, 200, path)
+            expected = await self.sync_get(f'/api/{path}')
+            self.assertEqual(response.json(), expected, path)
+
+    async def sync_get(self, url):
+        from asgiref.sync import sync_to_async
+        return (await sync_to_async(self.sync_client.get)(url)).json()
+
+    async def test_conditional_get_and_missing_video(self):
+        url = f'/api/async/video/{self.video.id}/transcript/'
+        etag = (await self.async_client.get(url, headers=self.headers))['ETag']
+        response = await self.async_client.get(url, headers={**self.headers, 'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        response = await self.async_client.get('/api/async/video/999/', headers=self.headers)
+        self.assertEqual(response.status_code, 404)
+
+    async def test_task_status_from_result_backend(self):
+        progress = {'status': 'PROGRESS', 'result': {'current': 30, 'total': 100, 'message': 'Transcribing'}}
+        with patch('api.async_views.task_meta', AsyncMock(return_value=progress)):
+            data = (await self.async_client.get('/api/async/task/abc/status/', headers=self.headers)).json()
+        self.assertEqual(data, {'task_id': 'abc', 'status': 'PROGRESS', 'ready': False,
+                                'progress': progress['result']})
+
+        failure = {'status': 'FAILURE', 'result': {'exc_type': 'Exception', 'exc_message': ['Video not found']}}
+        with patch('api.async_views.task_meta', AsyncMock(return_value=failure)):
+            data = (await self.async_client.get('/api/async/task/abc/status/', headers=self.headers)).json()
+        self.assertEqual(data['error'], 'Video not found')
+        self.assertTrue(data['ready'])
@@ -0,0 +1,96 @@
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, MediaBlob, ProcessingCheckpoint
+from utils.checkpoints import save_checkpoint
+from utils.outbox import relay_outbox
+from utils.jwt_helpers import generate_tokens
+from utils.media_probe import MediaInfo
+from . import TempDirsMixin
+
+User = get_user_model()
+
+
+@override_settings(SCHEDULER_MAX_IN_FLIGHT=2)
+@patch('utils.bulk_ops.probe_video', return_value=MediaInfo(30.0, 'aac', 44100, 96000, 2))
+@patch('api.tasks.process_video_async.apply_async')
+class BulkEndpointsTest(TempDirsMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(self.user)["access_token"]}')
+
+    def files(self, count, same=False):
+        return [
+            SimpleUploadedFile(f'clip{i}.mp4', b'video' if same else f'video {i}'.encode(), content_type='video/mp4')
+            for i in range(count)
+        ]
+
+    def test_bulk_upload(self, apply_async, probe):
+        uploads = self.files(4) + [SimpleUploadedFile('empty.mp4', b'', content_type='video/mp4')]
+        response = self.client.post('/api/video/bulk-upload', {
+            'files': uploads,
+            'titles': ['First'],
+        }, format='multipart')
+        self.assertEqual(response.status_code, 201)
+        data = response.json()
+        self.assertEqual([r['status'] for r in data['results']], ['created'] * 4 + ['error'])
+        self.assertEqual(data['results'][0]['processing_status'], 'waiting')
+        self.assertIn('items_per_second', data)
+        self.assertEqual(list(Video.objects.order_by('id').values_list('title', flat=True)),
+                         ['First', 'clip1', 'clip2', 'clip3'])
+
+        # Two free slots: both relayed by the outbox, not by the request
+        apply_async.assert_not_called()
+        self.assertEqual(relay_outbox(), 2)
+        self.assertEqual(apply_async.call_count, 2)
+        self.assertEqual(Video.objects.filter(status='queued').count(), 2)
+        self.assertEqual(MediaBlob.objects.filter(ref_count=1).count(), 4)
+
+    def test_bulk_upload_counts_shared_blobs(self, apply_async, probe):
+        self.client.post('/api/video/bulk-upload', {'files': self.files(3, same=True)}, format='multipart')
+        self.assertEqual(MediaBlob.objects.get().ref_count, 3)
+
+    def test_query_count_does_not_grow_with_batch_size(self, apply_async, probe):
+        counts = []
+        for size in (3, 8):
+            Video.objects.update(status='completed')  # same free slots for both batches
+            with CaptureQueriesContext(connection) as queries:
+                self.client.post('/api/video/bulk-upload', {'files': self.files(size)}, format='multipart')
+            counts.append(len(queries))
+        self.assertEqual(counts[0], counts[1])
+
+    def test_bulk_delete(self, apply_async, probe):
+        self.client.post('/api/video/bulk-upload', {'files': self.files(2, same=True)}, format='multipart')
+        ids = list(Video.objects.values_list('id', flat=True))
+        other = User.objects.create_user(username='o', email='o@example.com', password='pw')
+        foreign = Video.objects.create(user=other, title='x', file='videos/x.mp4')
+
+        response = self.client.post('/api/video/bulk-delete', {'ids': ids + [foreign.id]}, format='json')
+        self.assertEqual([r['status'] for r in response.json()['results']], ['deleted', 'deleted', 'not_found'])
+        self.assertTrue(Video.objects.filter(id=foreign.id).exists())
+        self.assertEqual(MediaBlob.objects.exclude(name='videos/x.mp4').get().ref_count, 0)
+
+        self.assertEqual(self.client.post('/api/video/bulk-delete', {'ids': 'all'}, format='json').status_code, 400)
+
+    def test_bulk_reprocess(self, apply_async, probe):
+        done = Video.objects.create(user=self.user, title='a', file='videos/a.mp4', status='completed', processed=True)
+        failed = Video.objects.create(user=self.user, title='b', file='videos/b.mp4', status='failed')
+        waiting = Video.objects.create(user=self.user, title='c', file='videos/c.mp4', status='waiting',
+                                       queued_at=timezone.now())
+        save_checkpoint(done, 'transcript', {'segments': 3, 'language': 'en'})
+
+        response = self.client.post('/api/video/bulk-reprocess',
+                                    {'ids': [done.id, failed.id, waiting.id, 999]}, format='json')
+        self.assertEqual([r['status'] for r in response.json()['results']],
+                         ['queued', 'queued', 'skipped', 'not_found'])
+        self.assertFalse(ProcessingCheckpoint.objects.filter(video=done).exists())
+        done.refresh_from_db()
+        self.assertFalse(done.processed)
+        self.assertEqual(done.task_id, response.json()['results'][0]['task_id'])
+        self.assertEqual(Video.objects.filter(status='queued').count(), 2)
@@ -0,0 +1,127 @@
+import random
+from collections import namedtuple
+from unittest.mock import patch
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, Chapter
+from utils.chapters import boundary_scores, topic_chunks, split_title
+from utils.jwt_helpers import generate_tokens
+from utils.summary_helper import generate_summary
+from utils.video_helper import save_transcript
+
+User = get_user_model()
+
+Segment = namedtuple('Segment', ['text', 'start_time', 'end_time'])
+
+COOKING = 'We whisk the eggs with flour and butter, then bake the batter in the oven.'
+ASTRONOMY = 'Telescopes collect starlight so astronomers can measure distant galaxies and planets.'
+
+
+def lecture(topic_lengths=(12, 12), pause=3.0):
+    """Segments of alternating topics, with a pause before each new topic"""
+    segments = []
+    t = 0.0
+    for index, count in enumerate(topic_lengths):
+        if index:
+            t += pause
+        for _ in range(count):
+            segments.append({'start': t, 'end': t + 4, 'text': COOKING if index % 2 == 0 else ASTRONOMY})
+            t += 4
+    return segments
+
+
+class BoundaryDetectionTest(TestCase):
+    def segments(self, **kwargs):
+        return [Segment(s['text'], s['start'], s['end']) for s in lecture(**kwargs)]
+
+    def test_topic_change_with_pause_scores_highest(self):
+        scores = boundary_scores(self.segments())
+        self.assertEqual(len(scores), 23)
+        self.assertEqual(scores.index(max(scores)), 11)
+        self.assertGreater(scores[11], 0.9)
+        self.assertLess(max(scores[:4]), 0.01)  # both windows inside the first topic
+
+    def test_chunks_end_at_topic_boundaries(self):
+        chunks = topic_chunks(self.segments(topic_lengths=(12, 12, 12)), max_chars=100000, min_chars=200)
+        self.assertEqual([len(chunk) for chunk in chunks], [12, 12, 12])
+
+    def test_oversized_chunk_is_cut_at_the_best_gap(self):
+        segments = self.segments(topic_lengths=(10, 10), pause=0.0)
+        chunks = topic_chunks(segments, max_chars=1200, min_chars=200, threshold=2.0)
+        self.assertEqual(len(chunks[0]), 10)
+        self.assertTrue(all(sum(len(s.text) + 1 for s in chunk) <= 1200 for chunk in chunks))
+
+    def test_chunks_never_exceed_max_chars(self):
+        rng = random.Random(7)
+        words = (COOKING + ' ' + ASTRONOMY).split()
+        for _ in range(200):
+            segments = []
+            t = 0.0
+            for _ in range(rng.randint(1, 80)):
+                text = ' '.join(rng.choices(words, k=rng.randint(1, 40)))
+                segments.append(Segment(text, t, t + 4))
+                t += 4 + rng.choice([0.0, 0.5, 3.0])
+            max_chars = rng.randint(50, 2000)
+            min_chars = rng.randint(0, max_chars // 2)
+            chunks = topic_chunks(segments, max_chars, min_chars, threshold=rng.uniform(0.2, 2.0))
+
+            self.assertEqual([s for chunk in chunks for s in chunk], segments)
+            for chunk in chunks:
+                # Only a single segment longer than max_chars may exceed it
+                if len(chunk) > 1:
+                    self.assertLessEqual(sum(len(s.text.strip()) + 1 for s in chunk), max_chars)
+
+    def test_split_title(self):
+        self.assertEqual(split_title('Title: "Baking"\nWe bake bread.'), ('Baking', 'We bake bread.'))
+        self.assertEqual(split_title('We bake bread.'), ('', 'We bake bread.'))
+
+
+@override_settings(SUMMARY_CHUNK_CHARS=100000, CHAPTER_MIN_CHARS=200)
+class ChapterGenerationTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4', language='en')
+        save_transcript(self.video, lecture(), 'en')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(user)["access_token"]}')
+
+    def reply(self, language, content):
+        if content.startswith('These are summaries'):
+            return 'Baking, then astronomy.'
+        topic = 'Baking' if 'whisk' in content else 'Astronomy'
+        return f'Title: {topic}\n{topic} is discussed.'
+
+    def test_chapters_come_from_the_map_step(self):
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply) as mock_llm:
+            summary = generate_summary(self.video)
+
+        self.assertEqual(mock_llm.call_count, 3)  # two chunks + reduce, no chapter-only calls
+        self.assertEqual(summary.text, 'Baking, then astronomy.')
+        chapters = list(Chapter.objects.filter(video=self.video))
+        self.assertEqual([c.title for c in chapters], ['Baking', 'Astronomy'])
+        self.assertEqual([c.summary for c in chapters], ['Baking is discussed.', 'Astronomy is discussed.'])
+        self.assertEqual((chapters[1].start_time, chapters[1].end_time), (51.0, 99.0))
+
+        # Regenerating reuses the stored chunk results and replaces the chapters
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply) as mock_llm:
+            generate_summary(self.video)
+        self.assertEqual(mock_llm.call_count, 1)
+        self.assertEqual(Chapter.objects.filter(video=self.video).count(), 2)
+
+    def test_chapters_endpoint(self):
+        url = f'/api/video/{self.video.id}/chapters/'
+        self.assertEqual(self.client.get(url).status_code, 404)
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply):
+            generate_summary(self.video)
+
+        response = self.client.get(url)
+        self.assertEqual([c['title'] for c in response.json()['chapters']], ['Baking', 'Astronomy'])
+        response = self.client.get(f'{url}?at=60')
+        self.assertEqual([c['title'] for c in response.json()['chapters']], ['Astronomy'])
+        # In the pause between the chapters (48 s - 51 s) the earlier one is still playing
+        response = self.client.get(f'{url}?at=49.5')
+        self.assertEqual([c['title'] for c in response.json()['chapters']], ['Baking'])
+        self.assertEqual(self.client.get(f'{url}?at=soon').status_code, 400)
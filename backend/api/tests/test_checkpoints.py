@@ -0,0 +1,170 @@
+import os
+import tempfile
+from unittest.mock import patch, MagicMock
+import numpy as np
+from celery.exceptions import SoftTimeLimitExceeded
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video, Transcript, Summary, SummaryChunk
+from api.tasks import process_video_async
+from utils.checkpoints import get_checkpoint
+
+User = get_user_model()
+
+SEGMENTS = [
+    {'start': 0.0, 'end': 4.0, 'text': ' Hello and welcome.'},
+    {'start': 4.0, 'end': 9.5, 'text': ' Today we talk about queues.'},
+]
+
+
+@override_settings(PROCESSING_MAX_RETRIES=2, PROCESSING_RETRY_BACKOFF=0, WHISPER_BATCH_SHORT_CLIPS=False)
+@patch('api.tasks.dispatch_pending_videos')
+@patch('api.tasks.update_progress')
+@patch('api.tasks.get_video_duration', return_value=9.5)
+@patch('api.tasks.ensure_audio', return_value='/tmp/fake.pcm')
+@patch('api.tasks.detect_video_language', return_value='en')
+@patch('utils.video_helper.load_pcm', return_value=np.zeros(int(9.5 * 16000), dtype=np.float32))
+class CheckpointResumeTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Talk', file='videos/talk.mp4', status='queued')
+        self.model = MagicMock()
+        self.model.transcribe.return_value = {'text': 'ignored', 'segments': SEGMENTS, 'language': 'en'}
+
+    def run_task(self):
+        with patch('api.tasks.load_whisper_model', return_value=self.model):
+            return process_video_async.apply(args=[self.video.id])
+
+    def test_retry_resumes_after_transcription(self, *mocks):
+        with patch('utils.summary_helper.ask_llm', side_effect=[Exception('rate limited'), 'A short summary']):
+            result = self.run_task()
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.model.transcribe.assert_called_once()
+        self.assertEqual(Transcript.objects.filter(video=self.video).count(), 2)
+        self.assertEqual(Summary.objects.filter(video=self.video).count(), 1)
+        self.video.refresh_from_db()
+        self.assertTrue(self.video.processed)
+        self.assertEqual(self.video.status, 'completed')
+        self.assertIsNotNone(get_checkpoint(self.video, 'summary'))
+
+    def test_rerun_is_idempotent(self, *mocks):
+        with patch('utils.summary_helper.ask_llm', return_value='A short summary') as mock_llm:
+            self.run_task()
+            self.run_task()
+
+        self.model.transcribe.assert_called_once()
+        mock_llm.assert_called_once()
+        self.assertEqual(Transcript.objects.filter(video=self.video).count(), 2)
+        self.assertEqual(Summary.objects.filter(video=self.video).count(), 1)
+        self.assertEqual(SummaryChunk.objects.filter(video=self.video).count(), 1)
+
+    def test_duplicate_delivery_is_skipped(self, *mocks):
+        # Resent while the first delivery is still running
+        Video.objects.filter(id=self.video.id).update(status='processing')
+        with patch('utils.summary_helper.ask_llm') as mock_llm:
+            result = self.run_task()
+        self.assertEqual(result.state, 'IGNORED')
+        self.model.transcribe.assert_not_called()
+        mock_llm.assert_not_called()
+
+        # A message of an earlier dispatch, after the video was requeued under a new task id
+        Video.objects.filter(id=self.video.id).update(status='queued', task_id='current-dispatch')
+        self.assertEqual(self.run_task().state, 'IGNORED')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, 'queued')
+
+    @override_settings(SUMMARY_EXTRACTIVE_FALLBACK=False)
+    def test_gives_up_after_max_retries(self, *mocks):
+        with patch('utils.summary_helper.ask_llm', side_effect=Exception('down')) as mock_llm:
+            result = self.run_task()
+
+        self.assertTrue(result.failed())
+        self.assertEqual(mock_llm.call_count, 3)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, 'failed')
+
+    def test_extractive_summary_when_llm_stays_down(self, *mocks):
+        with patch('utils.summary_helper.ask_llm', side_effect=Exception('down')) as mock_llm:
+            result = self.run_task()
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(mock_llm.call_count, 3)
+        summary = Summary.objects.get(video=self.video)
+        self.assertEqual(summary.source, 'extractive')
+        self.assertEqual(summary.text, 'Today we talk about queues.')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, 'completed')
+
+
+def fake_window_transcribe(audio, language=None, initial_prompt=None, word_timestamps=False):
+    seconds = len(audio) / 16000
+    return {'text': '', 'language': 'en', 'segments': [{'start': 0.0, 'end': seconds, 'text': f' {seconds:.0f}s window'}]}
+
+
+@override_settings(
+    PROCESSING_MAX_RETRIES=0,
+    TRANSCRIPTION_WINDOW_SECONDS=10,
+    TRANSCRIPTION_MIN_WINDOW_SECONDS=1,
+    WHISPER_BATCH_SHORT_CLIPS=False,
+)
+@patch('api.tasks.dispatch_pending_videos')
+@patch('api.tasks.update_progress')
+@patch('api.tasks.get_video_duration', return_value=25.0)
+@patch('api.tasks.detect_video_language', return_value='en')
+@patch('api.tasks.needs_continuation', return_value=True)
+@patch('utils.summary_helper.ask_llm', return_value='A short summary')
+class ContinuationTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4', status='queued')
+        pcm = tempfile.NamedTemporaryFile(suffix='.pcm', delete=False)
+        pcm.write(np.zeros(25 * 16000, dtype=np.int16).tobytes())
+        pcm.close()
+        self.pcm_path = pcm.name
+        self.addCleanup(os.remove, self.pcm_path)
+        self.model = MagicMock()
+
+    def run_task(self):
+        with patch('api.tasks.load_whisper_model', return_value=self.model), \
+                patch('api.tasks.ensure_audio', return_value=self.pcm_path):
+            return process_video_async.apply(args=[self.video.id])
+
+    def test_long_video_is_transcribed_window_by_window(self, *mocks):
+        self.model.transcribe.side_effect = fake_window_transcribe
+        result = self.run_task()
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(self.model.transcribe.call_count, 3)
+        prompts = [c.kwargs['initial_prompt'] for c in self.model.transcribe.call_args_list]
+        self.assertEqual(prompts, [None, '10s window', '10s window'])
+        starts = list(Transcript.objects.filter(video=self.video).order_by('start_time').values_list('start_time', flat=True))
+        self.assertEqual(starts, [0.0, 10.0, 20.0])
+        self.video.refresh_from_db()
+        self.assertTrue(self.video.processed)
+
+    def test_soft_time_limit_halves_the_window(self, *mocks):
+        calls = []
+
+        def transcribe(audio, **kwargs):
+            calls.append(len(audio) / 16000)
+            if len(calls) == 1:
+                raise SoftTimeLimitExceeded()
+            return fake_window_transcribe(audio, **kwargs)
+
+        self.model.transcribe.side_effect = transcribe
+        result = self.run_task()
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(calls, [10.0, 5.0, 5.0, 5.0, 5.0, 5.0])
+        self.assertEqual(Transcript.objects.filter(video=self.video).count(), 5)
+
+    @override_settings(SUMMARY_STREAMING=True, SUMMARY_BACKEND='llm')
+    def test_slow_chunk_summaries_keep_the_window(self, *mocks):
+        self.model.transcribe.side_effect = fake_window_transcribe
+        with patch('api.tasks.StreamingSummarizer.finish', side_effect=[SoftTimeLimitExceeded(), None, None]):
+            result = self.run_task()
+
+        self.assertTrue(result.successful(), result.traceback)
+        windows = [len(c.args[0]) / 16000 for c in self.model.transcribe.call_args_list]
+        self.assertEqual(windows, [10.0, 10.0, 5.0])
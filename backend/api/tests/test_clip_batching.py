@@ -0,0 +1,88 @@
+from datetime import timedelta
+from unittest.mock import patch, MagicMock
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from api.models import Video, Transcript
+from api.tasks import process_short_clip_batch
+
+User = get_user_model()
+
+
+def clip_windows(model, paths, language=None):
+    """One segment per clip, naming the file it came from"""
+    return [
+        [{'start': 0.0, 'end': 5.0, 'text': f'Clip {path.rsplit("/", 1)[-1]} explains queues.', 'language': 'en'}]
+        for path in paths
+    ]
+
+
+@override_settings(SUMMARY_BACKEND='extractive', WHISPER_BATCH_MAX_WAITS=0)
+@patch('api.tasks.dispatch_pending_videos')
+@patch('api.tasks.update_progress')
+@patch('api.tasks.load_whisper_model', return_value=MagicMock())
+@patch('api.tasks.detect_video_language', return_value='en')
+class ClipBatchTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.clips = [
+            Video.objects.create(user=user, title=f'Clip {i}', file=f'videos/clip{i}.mp4', duration=20,
+                                 quality='fast', status='queued', batch_state='pending')
+            for i in range(3)
+        ]
+
+    def states(self):
+        return [(v.batch_state, v.status) for v in Video.objects.order_by('id')]
+
+    def test_one_task_transcribes_every_pending_clip(self, *mocks):
+        with patch('api.tasks.transcribe_clip_batch', side_effect=clip_windows) as mock_batch:
+            result = process_short_clip_batch.apply(args=[self.clips[0].id])
+
+        self.assertTrue(result.successful(), result.traceback)
+        mock_batch.assert_called_once()
+        self.assertEqual(len(mock_batch.call_args.args[1]), 3)
+        self.assertEqual(mock_batch.call_args.args[2], 'en')
+        self.assertEqual(self.states(), [('done', 'completed')] * 3)
+        for clip in self.clips:
+            transcript = Transcript.objects.get(video=clip)
+            self.assertIn(f'clip{clip.id - self.clips[0].id}.mp4', transcript.text)
+            clip.refresh_from_db()
+            self.assertTrue(clip.whisper_model.endswith('.en'), clip.whisper_model)
+        self.assertEqual(result.result['transcript_segments'], 1)
+
+    def test_own_failure_still_finishes_the_other_clips(self, mock_detect, *mocks):
+        own = self.clips[0]
+        mock_detect.side_effect = lambda clip, path: self.fail_for(own, clip)
+        with patch('api.tasks.transcribe_clip_batch', side_effect=clip_windows):
+            result = process_short_clip_batch.apply(args=[own.id])
+
+        self.assertTrue(result.failed())
+        self.assertEqual(self.states(), [('failed', 'failed'), ('done', 'completed'), ('done', 'completed')])
+        # The other clips' tasks find their results instead of waiting
+        self.assertTrue(process_short_clip_batch.apply(args=[self.clips[1].id]).successful())
+
+    def fail_for(self, failing, clip):
+        if clip.id == failing.id:
+            raise RuntimeError('unreadable file')
+        return 'en'
+
+    def test_claim_of_a_dead_batch_is_reclaimed(self, *mocks):
+        stale = timezone.now() - timedelta(hours=2)
+        Video.objects.filter(id=self.clips[0].id).update(batch_state='claimed', batch_token='dead',
+                                                         batch_claimed_at=stale)
+        with patch('api.tasks.transcribe_clip_batch', side_effect=clip_windows):
+            result = process_short_clip_batch.apply(args=[self.clips[0].id])
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(self.states(), [('done', 'completed')] * 3)
+
+    def test_waiting_on_a_live_batch_is_bounded(self, *mocks):
+        Video.objects.filter(id=self.clips[0].id).update(batch_state='claimed', batch_token='other',
+                                                         batch_claimed_at=timezone.now())
+        with patch('api.tasks.transcribe_clip_batch', side_effect=clip_windows) as mock_batch:
+            result = process_short_clip_batch.apply(args=[self.clips[0].id])
+
+        self.assertTrue(result.failed())
+        mock_batch.assert_not_called()
+        # The other clips are left for their own tasks rather than stranded in this claim
+        self.assertEqual(self.states(), [('failed', 'failed'), ('pending', 'queued'), ('pending', 'queued')])
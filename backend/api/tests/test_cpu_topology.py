@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+from unittest.mock import patch
+from django.test import SimpleTestCase, override_settings
+from utils.cpu_topology import cgroup_cpu_limit, available_cpus, plan_threads, configure_worker_threads
+from utils.management.commands.bench_threads import default_splits
+
+
+_roots = []
+
+
+def tearDownModule():
+    for root in _roots:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+def cgroup_dir(files):
+    root = tempfile.mkdtemp()
+    _roots.append(root)
+    for name, content in files.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(content + '\n')
+    return root
+
+
+class CgroupLimitTest(SimpleTestCase):
+    def test_v2_quota(self):
+        self.assertEqual(cgroup_cpu_limit(cgroup_dir({'cpu.max': '250000 100000'})), 2.5)
+        self.assertIsNone(cgroup_cpu_limit(cgroup_dir({'cpu.max': 'max 100000'})))
+
+    def test_v1_quota(self):
+        root = cgroup_dir({'cpu/cpu.cfs_quota_us': '400000', 'cpu/cpu.cfs_period_us': '100000'})
+        self.assertEqual(cgroup_cpu_limit(root), 4.0)
+        root = cgroup_dir({'cpu/cpu.cfs_quota_us': '-1', 'cpu/cpu.cfs_period_us': '100000'})
+        self.assertIsNone(cgroup_cpu_limit(root))
+
+    def test_quota_caps_the_affinity_mask(self):
+        with patch('utils.cpu_topology.allowed_cores', return_value=list(range(16))):
+            self.assertEqual(available_cpus(cgroup_dir({'cpu.max': '250000 100000'})), 2)
+            self.assertEqual(available_cpus(cgroup_dir({})), 16)
+
+
+class ThreadPlanTest(SimpleTestCase):
+    def test_children_split_the_cores(self):
+        plans = [plan_threads(8, 4, index) for index in range(4)]
+        self.assertEqual({plan.intra_op for plan in plans}, {2})
+        self.assertEqual([plan.cores for plan in plans], [[0, 1], [2, 3], [4, 5], [6, 7]])
+
+    def test_more_children_than_cores_get_one_thread(self):
+        plan = plan_threads(2, 8, 5)
+        self.assertEqual(plan.intra_op, 1)
+        self.assertEqual(plan.cores, [1])
+
+    def test_pinning_follows_the_allowed_cores(self):
+        plan = plan_threads(4, 2, 1, cores=[4, 5, 6, 7])
+        self.assertEqual(plan.cores, [6, 7])
+
+    @override_settings(WORKER_TORCH_THREADS=0, WORKER_INTEROP_THREADS=1, WORKER_PIN_CORES=True)
+    @patch.dict(os.environ, {'WORKER_CHILD_CONCURRENCY': '2'})
+    @patch('utils.cpu_topology.child_index', return_value=1)
+    @patch('utils.cpu_topology.available_cpus', return_value=8)
+    @patch('utils.cpu_topology.allowed_cores', return_value=list(range(8)))
+    def test_worker_child_configuration(self, *mocks):
+        with patch('torch.set_num_threads') as set_threads, \
+                patch('torch.set_num_interop_threads'), \
+                patch('os.sched_setaffinity') as set_affinity:
+            plan = configure_worker_threads()
+        set_threads.assert_called_once_with(4)
+        set_affinity.assert_called_once_with(0, [4, 5, 6, 7])
+        self.assertEqual(os.environ['OMP_NUM_THREADS'], '4')
+        self.assertEqual(plan.intra_op, 4)
+
+    def test_benchmark_splits(self):
+        self.assertEqual(default_splits(8), [(1, 8), (2, 4), (4, 2), (8, 1)])
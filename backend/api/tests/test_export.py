@@ -0,0 +1,86 @@
+import json
+import tracemalloc
+from unittest.mock import patch, MagicMock
+from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, Transcript
+from utils.captions import format_timestamp
+from utils.jwt_helpers import generate_tokens
+
+User = get_user_model()
+
+
+class TranscriptExportTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(self.user)["access_token"]}')
+
+    def create_video(self, segments):
+        video = Video.objects.create(user=self.user, title='Long Lecture', file='videos/lecture.mp4')
+        Transcript.objects.bulk_create([
+            Transcript(video=video, text=f' Sentence {i} of the lecture --> ', start_time=i * 2.5, end_time=i * 2.5 + 2)
+            for i in range(segments)
+        ], batch_size=2000)
+        return video
+
+    def export(self, video, fmt, **headers):
+        return self.client.get(f'/api/video/{video.id}/transcript/export/{fmt}/', **headers)
+
+    def test_formats(self):
+        video = self.create_video(3)
+
+        response = self.export(video, 'srt')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="long-lecture.srt"')
+        srt = b''.join(response.streaming_content).decode()
+        self.assertTrue(srt.startswith('1\n00:00:00,000 --> 00:00:02,000\nSentence 0 of the lecture ->\n\n2\n'))
+
+        vtt = b''.join(self.export(video, 'vtt').streaming_content).decode()
+        self.assertTrue(vtt.startswith('WEBVTT\n\n00:00:00.000 --> 00:00:02.000\nSentence 0 of the lecture ->\n\n'))
+
+        lines = b''.join(self.export(video, 'ndjson').streaming_content).decode().splitlines()
+        self.assertEqual(json.loads(lines[2]), {'start': 5.0, 'end': 7.0, 'text': 'Sentence 2 of the lecture -->'})
+
+        self.assertEqual(self.export(video, 'docx').status_code, 400)
+        self.assertEqual(format_timestamp(3723.4567, ','), '01:02:03,457')
+
+    def test_edited_multiline_segment_stays_one_cue(self):
+        video = self.create_video(2)
+        Video.objects.filter(id=video.id).update(processed=True)
+        segment = Transcript.objects.filter(video=video).order_by('start_time').first()
+        with patch('api.tasks.resummarize_video.delay', return_value=MagicMock(id='task-1')):
+            response = self.client.patch(f'/api/video/{video.id}/transcript/', {
+                'segments': [{'id': segment.id, 'text': 'First line\r\n\n\nsecond --> line\n \nthird'}],
+            }, format='json')
+        self.assertEqual(response.status_code, 202)
+
+        srt = b''.join(self.export(video, 'srt').streaming_content).decode()
+        self.assertTrue(srt.startswith('1\n00:00:00,000 --> 00:00:02,000\nFirst line\nsecond -> line\nthird\n\n2\n'))
+        vtt = b''.join(self.export(video, 'vtt').streaming_content).decode()
+        cues = vtt.split('\n\n')
+        self.assertEqual(cues[1], '00:00:00.000 --> 00:00:02.000\nFirst line\nsecond -> line\nthird')
+        self.assertEqual(len(cues), 4)  # header, two cues, trailing empty
+
+    def test_conditional_get(self):
+        video = self.create_video(2)
+        etag = self.export(video, 'vtt')['ETag']
+        self.assertEqual(self.export(video, 'vtt', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def peak_memory(self, video):
+        response = self.export(video, 'srt')
+        tracemalloc.start()
+        size = 0
+        for chunk in response.streaming_content:
+            size += len(chunk)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return peak, size
+
+    def test_memory_is_flat_in_transcript_length(self):
+        # The smaller transcript already spans two cursor chunks (2000 rows each)
+        small_peak, small_size = self.peak_memory(self.create_video(4000))
+        large_peak, large_size = self.peak_memory(self.create_video(10000))
+        self.assertGreater(large_size, 2.4 * small_size)
+        # 2.5 times the segments must not mean more memory
+        self.assertLess(large_peak, 1.25 * small_peak)
@@ -0,0 +1,89 @@
+import time
+from unittest.mock import patch
+from django.conf import settings
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video, Summary, Chapter
+from utils.extractive import extractive_summary, split_sentences
+from utils.summary_helper import generate_summary, save_preview_summary
+from utils.video_helper import save_transcript
+
+User = get_user_model()
+
+TEXT = (
+    "The queue stores uploaded videos until a worker is free. "
+    "Workers take videos from the queue in fair order. "
+    "Lunch was great today. "
+    "A worker transcribes each video from the queue and stores the transcript. "
+    "Ok. "
+    "The weather might change tomorrow afternoon."
+)
+
+
+class ExtractiveSummaryTest(TestCase):
+    def test_picks_central_sentences_in_order(self):
+        summary = extractive_summary(TEXT, max_sentences=2)
+        self.assertEqual(split_sentences(summary), [
+            "The queue stores uploaded videos until a worker is free.",
+            "A worker transcribes each video from the queue and stores the transcript.",
+        ])
+
+    def test_short_text_is_returned_whole(self):
+        self.assertEqual(extractive_summary("One short sentence here.", max_sentences=3), "One short sentence here.")
+
+    @override_settings(SUMMARY_EXTRACTIVE_TEXTRANK_LIMIT=10)
+    def test_centroid_ranking_for_long_transcripts(self):
+        summary = extractive_summary(' '.join([TEXT] * 5), max_sentences=2)
+        self.assertIn("queue", summary)
+        self.assertNotIn("weather", summary)
+
+    def test_cjk_sentences_are_split(self):
+        self.assertEqual(split_sentences('队列保存上传的视频。工人按顺序处理视频！转录完成了吗？'),
+                         ['队列保存上传的视频。', '工人按顺序处理视频！', '转录完成了吗？'])
+
+    def test_unpunctuated_transcript_is_not_returned_whole(self):
+        segments = [f'and then the worker {i} takes video {i % 7} from the queue and stores it' for i in range(200)]
+        text = ' '.join(segments)
+        for summary in (extractive_summary(text, segments=segments), extractive_summary(text)):
+            self.assertLessEqual(len(summary), settings.SUMMARY_EXTRACTIVE_MAX_CHARS)
+            self.assertIn('queue', summary)
+        self.assertIn(extractive_summary(text, max_sentences=1, segments=segments), segments)
+
+    def test_summary_is_capped(self):
+        self.assertEqual(extractive_summary('word ' * 1000, max_chars=100), ' '.join(['word'] * 20))
+
+    def test_long_transcript_in_milliseconds(self):
+        text = ' '.join(f"Sentence {i} talks about topic {i % 37} and the queue of videos." for i in range(1500))
+        started = time.perf_counter()
+        extractive_summary(text)
+        self.assertLess(time.perf_counter() - started, 2.0)
+
+
+class ExtractiveTierTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Talk', file='videos/talk.mp4')
+        save_transcript(self.video, [
+            {'start': i * 4.0, 'end': i * 4.0 + 4, 'text': sentence}
+            for i, sentence in enumerate(split_sentences(TEXT))
+        ], 'en')
+
+    @override_settings(SUMMARY_BACKEND='extractive')
+    def test_no_llm_tier(self):
+        with patch('utils.summary_helper.ask_llm') as mock_llm:
+            summary = generate_summary(self.video)
+        mock_llm.assert_not_called()
+        self.assertEqual(summary.source, 'extractive')
+        self.assertIn('queue', summary.text)
+        self.assertTrue(Chapter.objects.filter(video=self.video).exclude(title='').exists())
+
+    def test_preview_is_replaced_by_the_llm_summary(self):
+        preview = save_preview_summary(self.video)
+        self.assertEqual(preview.source, 'extractive')
+        self.assertFalse(self.video.checkpoints.filter(stage='summary').exists())
+
+        with patch('utils.summary_helper.ask_llm', return_value='Title: Queues\nHow the queue works.'):
+            summary = generate_summary(self.video)
+        self.assertEqual(summary.source, 'llm')
+        self.assertEqual(list(Summary.objects.filter(video=self.video)), [summary])
+        self.assertEqual(set(Chapter.objects.filter(video=self.video).values_list('title', flat=True)), {'Queues'})
@@ -0,0 +1,77 @@
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video
+from utils.jwt_helpers import generate_tokens
+from utils.summary_helper import save_summary
+from utils.video_helper import save_transcript
+
+User = get_user_model()
+
+
+class ConditionalGetTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(self.user)["access_token"]}')
+        self.video = Video.objects.create(user=self.user, title='Talk', file='videos/talk.mp4', status='completed')
+        self.segments = [
+            {'start': i * 5.0, 'end': i * 5.0 + 5, 'text': f'Segment number {i} of a long transcript.'}
+            for i in range(200)
+        ]
+        save_transcript(self.video, self.segments, 'en')
+        self.url = f'/api/video/{self.video.id}/transcript/'
+
+    def test_not_modified_until_transcript_changes(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertIn('no-cache', response['Cache-Control'])
+        self.assertIn('private', response['Cache-Control'])
+
+        with self.assertNumQueries(2):  # JWT user + ownership lookup, no transcript rows
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+
+        save_transcript(self.video, self.segments[:10], 'en')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(response.json()['transcripts']), 10)
+
+    def test_server_side_cache_reused_and_invalidated(self):
+        self.client.get(self.url)
+        with self.assertNumQueries(2):
+            response = self.client.get(self.url)
+        self.assertEqual(len(response.json()['transcripts']), 200)
+
+        summary_url = f'/api/video/{self.video.id}/summary/'
+        self.assertEqual(self.client.get(summary_url).status_code, 404)
+        save_summary(self.video, 'A short summary.')
+        response = self.client.get(summary_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['summaries'][0]['text'], 'A short summary.')
+
+    def test_detail_etag_follows_row_changes(self):
+        url = f'/api/video/{self.video.id}/'
+        etag = self.client.get(url)['ETag']
+        Video.objects.filter(id=self.video.id).update(title='Renamed')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Renamed')
+
+    @override_settings(API_COMPRESSION_MIN_BYTES=1024)
+    def test_gzip_keeps_strong_etag_per_encoding(self):
+        plain = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertLess(len(response.content), len(plain.content) / 4)
+        self.assertEqual(response['ETag'], plain['ETag'][:-1] + '-gzip"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+
+        # A compressed representation's validator revalidates the resource
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag'], HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response.status_code, 304)
@@ -0,0 +1,123 @@
+import os
+import tempfile
+from unittest.mock import MagicMock
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, Transcript
+from utils.jwt_helpers import generate_tokens
+from utils.video_helper import transcribe_video, transcribe_window_audio, initial_progress, save_transcript
+
+User = get_user_model()
+
+
+@override_settings(TRANSCRIPTION_STREAM_WINDOW_SECONDS=10)
+class WindowedTranscriptionTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4', status='queued')
+        pcm = tempfile.NamedTemporaryFile(suffix='.pcm', delete=False)
+        pcm.write(np.zeros(25 * 16000, dtype=np.int16).tobytes())
+        pcm.close()
+        self.pcm_path = pcm.name
+        self.addCleanup(os.remove, self.pcm_path)
+
+    def test_each_window_is_committed_before_the_next_starts(self):
+        visible = []
+
+        def transcribe(audio, **kwargs):
+            visible.append(Transcript.objects.filter(video=self.video).count())
+            seconds = len(audio) / 16000
+            return {'text': '', 'language': 'en', 'segments': [{'start': 0.0, 'end': seconds, 'text': ' part'}]}
+
+        model = MagicMock()
+        model.transcribe.side_effect = transcribe
+        segments = transcribe_video(self.video, model, self.pcm_path, 'en')
+
+        self.assertEqual(visible, [0, 1, 2])
+        self.assertEqual([s.start_time for s in segments], [0.0, 10.0, 20.0])
+        self.assertEqual(segments[-1].end_time, 25.0)
+
+    def test_segment_cut_by_a_window_is_redone_by_the_next(self):
+        lengths = []
+
+        def transcribe(audio, **kwargs):
+            # A segment every 4 s, the last one running to the end of the audio
+            seconds = len(audio) / 16000
+            lengths.append(seconds)
+            starts = range(0, int(seconds + 3) // 4 * 4, 4)
+            return {'text': '', 'language': 'en', 'segments': [
+                {'start': float(t), 'end': min(seconds, t + 4.0), 'text': f' from {t}'} for t in starts
+            ]}
+
+        model = MagicMock()
+        model.transcribe.side_effect = transcribe
+        segments = transcribe_video(self.video, model, self.pcm_path, 'en')
+
+        # 8-10 s touches the first cut, so the second window starts at 8 s (12 s of audio)
+        self.assertEqual(lengths, [10.0, 12.0, 9.0])
+        self.assertEqual([s.start_time for s in segments], [0.0, 4.0, 8.0, 12.0, 16.0, 20.0, 24.0])
+        self.assertEqual(segments[-1].end_time, 25.0)
+
+    def test_redelivered_window_keeps_segment_ids(self):
+        model = MagicMock()
+        model.transcribe.return_value = {'text': '', 'language': 'en', 'segments': [
+            {'start': 0.0, 'end': 4.0, 'text': ' One.'}, {'start': 4.0, 'end': 6.0, 'text': ' Two.'},
+        ]}
+        progress = {**initial_progress(self.video), 'window': 10, 'offset': 0.0}
+        audio = np.zeros(6 * 16000, dtype=np.float32)
+        transcribe_window_audio(self.video, model, audio, progress)
+        first = list(Transcript.objects.filter(video=self.video).order_by('start_time').values_list('id', flat=True))
+
+        model.transcribe.return_value['segments'] = [{'start': 0.0, 'end': 6.0, 'text': ' One, two.'}]
+        transcribe_window_audio(self.video, model, audio, progress)
+        second = list(Transcript.objects.filter(video=self.video).values_list('id', 'text'))
+        self.assertEqual(second, [(first[0], 'One, two.')])
+
+
+class TranscriptSinceTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(user)["access_token"]}')
+        self.video = Video.objects.create(user=user, title='Talk', file='videos/talk.mp4', status='queued')
+        self.url = f'/api/video/{self.video.id}/transcript/'
+
+    def add_segments(self, start, count):
+        Transcript.objects.bulk_create([
+            Transcript(video=self.video, text=f'Segment at {start + i * 5}', start_time=start + i * 5,
+                       end_time=start + i * 5 + 5, language='en')
+            for i in range(count)
+        ])
+        Video.objects.filter(id=self.video.id).update(content_version=self.video.content_version + 1)
+        self.video.refresh_from_db()
+
+    def test_polling_by_segment_id(self):
+        self.add_segments(0, 3)
+        first = self.client.get(f'{self.url}?since=0').json()
+        self.assertEqual(len(first['transcripts']), 3)
+        self.assertFalse(first['complete'])
+
+        empty = self.client.get(f'{self.url}?since={first["next_since"]}')
+        self.assertEqual(empty.status_code, 200)
+        self.assertEqual(empty.json()['transcripts'], [])
+        self.assertEqual(empty.json()['next_since'], first['next_since'])
+
+        self.add_segments(15, 2)
+        update = self.client.get(f'{self.url}?since={first["next_since"]}').json()
+        self.assertEqual([t['start_time'] for t in update['transcripts']], [15.0, 20.0])
+        self.assertGreater(update['next_since'], first['next_since'])
+
+    def test_polling_by_time_and_completion(self):
+        save_transcript(self.video, [{'start': i * 5.0, 'end': i * 5.0 + 5, 'text': f'Part {i}'} for i in range(6)], 'en')
+        response = self.client.get(f'{self.url}?since=12.5s').json()
+        self.assertEqual([t['start_time'] for t in response['transcripts']], [15.0, 20.0, 25.0])
+        self.assertTrue(response['complete'])
+
+    def test_without_since_and_invalid_values(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.assertEqual(self.client.get(f'{self.url}?since=0').status_code, 200)
+        self.assertEqual(self.client.get(f'{self.url}?since=abc').status_code, 400)
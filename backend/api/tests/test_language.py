@@ -0,0 +1,96 @@
+from unittest.mock import patch, MagicMock
+import numpy as np
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video
+from utils.summary_helper import system_prompt, ask_llm, generate_summary
+from utils.video_helper import detect_language, detect_video_language, english_model, choose_model, save_transcript
+
+User = get_user_model()
+
+
+@override_settings(WHISPER_LANGUAGE_MIN_PROBABILITY=0.5)
+class LanguageDetectionTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Talk', file='videos/talk.mp4')
+
+    @patch('utils.video_helper.load_audio', return_value=np.zeros(16000, dtype=np.float32))
+    @patch('utils.video_helper.load_whisper_model')
+    def test_detect_language_picks_the_most_likely(self, load_model, load_audio):
+        load_model.return_value.dims.n_mels = 80
+        load_model.return_value.device = 'cpu'
+        load_model.return_value.detect_language.return_value = (None, {'en': 0.15, 'de': 0.8, 'fr': 0.05})
+        self.assertEqual(detect_language('/tmp/talk.pcm'), ('de', 0.8))
+
+        load_model.return_value.detect_language.side_effect = RuntimeError('no weights')
+        self.assertEqual(detect_language('/tmp/talk.pcm'), (None, 0.0))
+
+    @patch('utils.video_helper.detect_language', return_value=('de', 0.9))
+    def test_confident_detection_is_stored(self, detect):
+        self.assertEqual(detect_video_language(self.video, '/tmp/talk.pcm'), 'de')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.language, 'de')
+
+    def test_unsure_or_failed_detection_pins_nothing(self):
+        for detected in (('fr', 0.3), (None, 0.0)):
+            with patch('utils.video_helper.detect_language', return_value=detected):
+                self.assertIsNone(detect_video_language(self.video, '/tmp/talk.pcm'))
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.language, '')
+
+
+@override_settings(
+    WHISPER_MODEL_LADDER=['tiny', 'base', 'small', 'medium', 'large'],
+    WHISPER_REALTIME_FACTORS={'tiny': 0.1, 'base': 0.2, 'small': 0.5, 'medium': 1.0, 'large': 2.0},
+    WHISPER_MAX_AUTO_MODEL='small',
+    WHISPER_QUALITY_MODEL='large',
+    WHISPER_TARGET_TURNAROUND=600,
+    WHISPER_WORKER_CONCURRENCY=1,
+)
+class EnglishRoutingTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+
+    def test_english_model(self):
+        self.assertEqual(english_model('base'), 'base.en')
+        self.assertEqual(english_model('large'), 'large')  # no English-only large checkpoint
+
+    def test_english_videos_get_the_en_checkpoint(self):
+        video = Video.objects.create(user=self.user, title='Talk', file='videos/talk.mp4')
+        self.assertEqual(choose_model(video, 600, 'en'), 'small.en')
+        video.refresh_from_db()
+        self.assertEqual(video.whisper_model, 'small.en')
+        self.assertIn('English detected', video.model_selection_reason)
+
+        self.assertEqual(choose_model(video, 600, 'de'), 'small')
+        self.assertEqual(choose_model(video, 600, None), 'small')
+
+    def test_no_en_checkpoint_keeps_the_model(self):
+        video = Video.objects.create(user=self.user, title='Talk', file='videos/talk.mp4', quality='quality')
+        self.assertEqual(choose_model(video, 600, 'en'), 'large')
+
+
+class SummaryLanguageTest(TestCase):
+    def test_system_prompt_names_the_language(self):
+        self.assertIn('write the summary in German', system_prompt('de'))
+        self.assertNotIn('write the summary in', system_prompt(''))
+        self.assertNotIn('write the summary in', system_prompt('xx'))
+
+    @patch('utils.summary_helper.client')
+    def test_ask_llm_sends_the_language_prompt(self, client):
+        client.chat.completions.create.return_value.choices = [MagicMock(message=MagicMock(content='Resumen.'))]
+        self.assertEqual(ask_llm('es', 'Texto'), 'Resumen.')
+        messages = client.chat.completions.create.call_args.kwargs['messages']
+        self.assertEqual(messages[0]['role'], 'system')
+        self.assertIn('Spanish', messages[0]['content'])
+        self.assertEqual(messages[1], {'role': 'user', 'content': 'Texto'})
+
+    def test_summary_requests_use_the_video_language(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        video = Video.objects.create(user=user, title='Talk', file='videos/talk.mp4', language='fr')
+        save_transcript(video, [{'start': 0.0, 'end': 4.0, 'text': 'Bonjour à tous.'}], 'fr')
+        with patch('utils.summary_helper.ask_llm', return_value='Title: Accueil\nUn accueil.') as mock_llm:
+            generate_summary(video)
+        self.assertTrue(mock_llm.called)
+        self.assertTrue(all(c.args[0] == 'fr' for c in mock_llm.call_args_list))
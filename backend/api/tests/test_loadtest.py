@@ -0,0 +1,48 @@
+from unittest.mock import patch
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video, Transcript, Summary
+from api.tasks import process_video_async
+from utils import loadtest_stubs
+from utils.management.commands.loadtest import Stats
+from . import TempDirsMixin
+
+User = get_user_model()
+
+
+@override_settings(WHISPER_BATCH_SHORT_CLIPS=False, LOADTEST_TRANSCRIBE_DELAY=0.0)
+@patch('api.tasks.dispatch_pending_videos')
+@patch('api.tasks.update_progress')
+class StubBackendsTest(TempDirsMixin, TestCase):
+    temp_dir_settings = ('MEDIA_ROOT', 'AUDIO_CACHE_DIR')
+
+    def setUp(self):
+        loadtest_stubs.install()
+        self.addCleanup(loadtest_stubs.uninstall)
+
+    def test_pipeline_runs_offline(self, *mocks):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        video = Video(user=user, title='Clip', status='queued')
+        video.file.save('clip.mp4', ContentFile(loadtest_stubs.synthetic_mp4(42.0)), save=False)
+        video.save()
+
+        result = process_video_async.apply(args=[video.id])
+
+        self.assertTrue(result.successful(), result.traceback)
+        video.refresh_from_db()
+        self.assertEqual(video.status, 'completed')
+        self.assertEqual(video.language, 'en')
+        self.assertEqual(Transcript.objects.filter(video=video).count(), 9)  # 5 s stub segments
+        self.assertTrue(Summary.objects.get(video=video).text.startswith('Summary:'))
+
+
+class LoadStatsTest(TestCase):
+    def test_percentiles_and_errors(self):
+        stats = Stats()
+        for i in range(100):
+            stats.record('list', (i + 1) / 1000, ok=i != 0)
+        [(endpoint, count, rate, p50, p95, p99, errors)] = stats.rows(duration=10)
+        self.assertEqual((endpoint, count, rate, errors), ('list', 100, 10.0, 1))
+        self.assertAlmostEqual(p50, 50.5)
+        self.assertAlmostEqual(p99, 99.01)
@@ -0,0 +1,117 @@
+import os
+import struct
+import tempfile
+from unittest.mock import patch
+from django.test import SimpleTestCase
+from utils.media_probe import probe, ProbeError, MediaInfo
+from utils.video_helper import probe_video
+
+
+def box(box_type, *children):
+    body = b''.join(children)
+    return struct.pack('>I4s', 8 + len(body), box_type) + body
+
+
+def mp4_file(duration=125.5, moov_last=True, mdat_bytes=100000):
+    timescale = 1000
+    mvhd = box(b'mvhd', struct.pack('>IIIII', 0, 0, 0, timescale, int(duration * timescale)), b'\0' * 80)
+
+    def track(handler, sample_entry):
+        mdhd = box(b'mdhd', struct.pack('>IIIII', 0, 0, 0, 48000, 0), b'\0' * 4)
+        hdlr = box(b'hdlr', struct.pack('>II4s', 0, 0, handler), b'\0' * 13)
+        stsd = box(b'stsd', struct.pack('>II', 0, 1), sample_entry)
+        return box(b'trak', box(b'tkhd', b'\0' * 84),
+                   box(b'mdia', mdhd, hdlr, box(b'minf', box(b'stbl', stsd, box(b'stts', b'\0' * 8)))))
+
+    audio_entry = box(b'mp4a', b'\0' * 6, struct.pack('>H', 1), b'\0' * 8,
+                      struct.pack('>HHHHI', 2, 16, 0, 0, 44100 << 16))
+    video_entry = box(b'avc1', b'\0' * 70)
+    moov = box(b'moov', mvhd, track(b'vide', video_entry), track(b'soun', audio_entry))
+    ftyp = box(b'ftyp', b'isom', b'\0\0\2\0', b'isomiso2mp41')
+    mdat = box(b'mdat', b'\0' * mdat_bytes)
+    return ftyp + mdat + moov if moov_last else ftyp + moov + mdat
+
+
+def ebml(element_id, body):
+    id_bytes = element_id.to_bytes((element_id.bit_length() + 7) // 8, 'big')
+    return id_bytes + bytes([0x01]) + len(body).to_bytes(7, 'big') + body
+
+
+def webm_file(duration_ms=90500.0, with_duration=True):
+    header = ebml(0x1A45DFA3, ebml(0x4282, b'webm'))
+    info_children = ebml(0x2AD7B1, (1000000).to_bytes(3, 'big'))
+    if with_duration:
+        info_children += ebml(0x4489, struct.pack('>d', duration_ms))
+    audio = ebml(0xE1, ebml(0xB5, struct.pack('>d', 48000.0)))
+    tracks = ebml(0x1654AE6B,
+                  ebml(0xAE, ebml(0x83, b'\x01') + ebml(0x86, b'V_VP9')) +
+                  ebml(0xAE, ebml(0x83, b'\x02') + ebml(0x86, b'A_OPUS') + audio))
+    cluster = ebml(0x1F43B675, b'\0' * 5000)
+    # Segment with "unknown" size, as written by live muxers
+    segment = bytes.fromhex('18538067') + b'\x01\xff\xff\xff\xff\xff\xff\xff'
+    return header + segment + ebml(0x1549A966, info_children) + tracks + cluster
+
+
+class MediaProbeTest(SimpleTestCase):
+    def write(self, data, suffix):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, 'wb') as f:
+            f.write(data)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_mp4_with_moov_at_end(self):
+        data = mp4_file()
+        info = probe(self.write(data, '.mp4'))
+        self.assertAlmostEqual(info.duration, 125.5)
+        self.assertEqual(info.audio_codec, 'aac')
+        self.assertEqual(info.sample_rate, 44100)
+        self.assertEqual(info.stream_count, 2)
+        self.assertEqual(info.bitrate, int(len(data) * 8 / 125.5))
+
+    def test_mp4_with_moov_first(self):
+        self.assertAlmostEqual(probe(self.write(mp4_file(duration=3.25, moov_last=False), '.mp4')).duration, 3.25)
+
+    def test_webm(self):
+        info = probe(self.write(webm_file(), '.webm'))
+        self.assertAlmostEqual(info.duration, 90.5)
+        self.assertEqual(info.audio_codec, 'opus')
+        self.assertEqual(info.sample_rate, 48000)
+        self.assertEqual(info.stream_count, 2)
+
+    def test_unsupported_or_incomplete_headers(self):
+        with self.assertRaises(ProbeError):
+            probe(self.write(b'RIFF\0\0\0\0AVI LIST', '.avi'))
+        with self.assertRaises(ProbeError):
+            probe(self.write(webm_file(with_duration=False), '.webm'))
+
+    def test_truncated_header_box(self):
+        # An mvhd cut short inside the timescale/duration fields
+        data = box(b'ftyp', b'isom') + box(b'moov', box(b'mvhd', b'\0' * 14))
+        with self.assertRaises(ProbeError):
+            probe(self.write(data, '.mp4'))
+        with self.assertRaises(ProbeError):
+            probe(self.write(box(b'ftyp', b'isom') + box(b'moov', box(b'mvhd')), '.mp4'))
+
+    @patch('utils.video_helper.subprocess.run')
+    def test_truncated_header_falls_back_to_ffprobe(self, run):
+        run.return_value.returncode = 0
+        run.return_value.stdout = '{"streams": [], "format": {"duration": "7.5"}}'
+        path = self.write(box(b'ftyp', b'isom') + box(b'moov', box(b'mvhd', b'\0' * 14)), '.mp4')
+        self.assertEqual(probe_video(path).duration, 7.5)
+        run.assert_called_once()
+
+    @patch('utils.video_helper.subprocess.run')
+    def test_ffprobe_fallback(self, run):
+        run.return_value.returncode = 0
+        run.return_value.stdout = (
+            '{"streams": [{"codec_type": "video", "codec_name": "mpeg4"},'
+            ' {"codec_type": "audio", "codec_name": "mp3", "sample_rate": "22050"}],'
+            ' "format": {"duration": "12.5", "bit_rate": "64000"}}'
+        )
+        path = self.write(b'RIFF\0\0\0\0AVI LIST', '.avi')
+        self.assertEqual(probe_video(path), MediaInfo(12.5, 'mp3', 22050, 64000, 2))
+
+        run.reset_mock()
+        self.assertAlmostEqual(probe_video(self.write(mp4_file(), '.mp4')).duration, 125.5)
+        run.assert_not_called()
@@ -0,0 +1,47 @@
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video
+from utils.model_policy import select_model, get_backlog
+
+User = get_user_model()
+
+
+@override_settings(
+    WHISPER_MODEL_LADDER=['tiny', 'base', 'small', 'medium'],
+    WHISPER_REALTIME_FACTORS={'tiny': 0.1, 'base': 0.2, 'small': 0.5, 'medium': 1.0},
+    WHISPER_DEFAULT_MODEL='base',
+    WHISPER_MAX_AUTO_MODEL='small',
+    WHISPER_QUALITY_MODEL='medium',
+    WHISPER_TARGET_TURNAROUND=600,
+    WHISPER_WORKER_CONCURRENCY=1,
+)
+class ModelPolicyTest(TestCase):
+    def test_idle_workers_upshift(self):
+        """With an empty queue the largest allowed auto model is used"""
+        model, reason = select_model(600, queue_depth=0, backlog_seconds=0)
+        self.assertEqual(model, 'small')
+        self.assertIn('auto', reason)
+
+    def test_backlog_downshifts(self):
+        """A deep backlog pushes the choice down the ladder"""
+        model, _ = select_model(600, queue_depth=10, backlog_seconds=2000)
+        self.assertEqual(model, 'base')
+        model, reason = select_model(600, queue_depth=50, backlog_seconds=10000)
+        self.assertEqual(model, 'tiny')
+        self.assertIn('not reachable', reason)
+
+    def test_explicit_tiers_ignore_load(self):
+        model, reason = select_model(600, quality='quality', queue_depth=50, backlog_seconds=10000)
+        self.assertEqual(model, 'medium')
+        self.assertIn('quality tier', reason)
+        model, _ = select_model(10, quality='fast', queue_depth=0, backlog_seconds=0)
+        self.assertEqual(model, 'tiny')
+
+    @override_settings(WHISPER_UNKNOWN_DURATION_ESTIMATE=100)
+    def test_backlog_counts_unprocessed_videos(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        Video.objects.create(user=user, title='a', file='videos/a.mp4', duration=50)
+        Video.objects.create(user=user, title='b', file='videos/b.mp4')
+        Video.objects.create(user=user, title='c', file='videos/c.mp4', duration=30, processed=True)
+        Video.objects.create(user=user, title='d', file='videos/d.mp4', duration=40, status='failed')
+        self.assertEqual(get_backlog(), (2, 150))
@@ -0,0 +1,107 @@
+from io import StringIO
+from celery import current_app
+from unittest.mock import patch
+from django.core.management import call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, OutboxMessage
+from api.tasks import process_video_async
+from utils.jwt_helpers import generate_tokens
+from utils.media_probe import MediaInfo
+from utils.outbox import enqueue_tasks, relay_outbox
+from . import TempDirsMixin
+
+User = get_user_model()
+
+
+@override_settings(OUTBOX_RELAY_BATCH=2)
+@patch('api.tasks.process_video_async.apply_async')
+class OutboxTest(TempDirsMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(self.user)["access_token"]}')
+
+    def upload(self):
+        return self.client.post('/api/video/upload', {
+            'title': 'Clip',
+            'file': SimpleUploadedFile('clip.mp4', b'fake video content', 'video/mp4'),
+        }, format='multipart')
+
+    @patch('api.views.probe_video', return_value=MediaInfo(60.0, 'aac', 44100, 128000, 2))
+    def test_upload_never_touches_the_broker(self, probe, mock_apply):
+        mock_apply.side_effect = ConnectionError('broker down')
+        response = self.upload()
+        self.assertEqual(response.status_code, 201)
+
+        message = OutboxMessage.objects.get()
+        self.assertEqual((message.task, message.args), (process_video_async.name, [response.data['id']]))
+        self.assertEqual(message.task_id, response.data['task_id'])
+
+        # Broker outage: the message stays pending with the error (not counted against
+        # the message), and goes out once it is back
+        self.assertEqual(relay_outbox(), 0)
+        message.refresh_from_db()
+        self.assertEqual((message.published_at, message.claimed_at, message.attempts, message.last_error),
+                         (None, None, 0, 'broker down'))
+        mock_apply.side_effect = None
+        self.assertEqual(relay_outbox(), 1)
+        mock_apply.assert_called_with(args=[response.data['id']], task_id=response.data['task_id'])
+        self.assertIsNotNone(OutboxMessage.objects.get().published_at)
+        self.assertEqual(relay_outbox(), 0)
+
+    @patch('api.views.probe_video', side_effect=RuntimeError('probe crashed'))
+    def test_failed_upload_leaves_no_message(self, probe, mock_apply):
+        with self.assertRaises(RuntimeError):
+            self.upload()
+        self.assertFalse(Video.objects.exists())
+        self.assertFalse(OutboxMessage.objects.exists())
+
+    def test_eager_celery_relays_on_commit(self, mock_apply):
+        # No relay process runs next to eager Celery (settings.loadtest)
+        current_app.conf.task_always_eager = True
+        self.addCleanup(setattr, current_app.conf, 'task_always_eager', False)
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_tasks(process_video_async.name, [([7], 'task-7')])
+        mock_apply.assert_called_once_with(args=[7], task_id='task-7')
+        self.assertIsNotNone(OutboxMessage.objects.get().published_at)
+
+    def test_relay_command_publishes_in_batches(self, mock_apply):
+        enqueue_tasks(process_video_async.name, [([i], f'task-{i}') for i in range(5)])
+        out = StringIO()
+        call_command('relay_outbox', '--once', stdout=out)
+
+        self.assertIn('Published 5 messages', out.getvalue())
+        self.assertEqual([c.kwargs['args'] for c in mock_apply.call_args_list], [[i] for i in range(5)])
+        self.assertFalse(OutboxMessage.objects.filter(published_at__isnull=True).exists())
+
+    @override_settings(OUTBOX_MAX_ATTEMPTS=2)
+    def test_poison_message_does_not_block_the_outbox(self, mock_apply):
+        enqueue_tasks('api.tasks.no_such_task', [([1], '')])
+        enqueue_tasks(process_video_async.name, [([2], 'task-2'), ([3], 'task-3')])
+
+        self.assertEqual(relay_outbox(), 1)
+        poison = OutboxMessage.objects.get(task='api.tasks.no_such_task')
+        self.assertEqual((poison.attempts, poison.published_at, poison.claimed_at), (1, None, None))
+        self.assertIn('no_such_task', poison.last_error)
+
+        self.assertEqual(relay_outbox(), 1)
+        # Parked after two attempts: later runs skip it
+        self.assertEqual(OutboxMessage.objects.get(id=poison.id).attempts, 2)
+        self.assertEqual(relay_outbox(), 0)
+        self.assertEqual([c.kwargs['args'] for c in mock_apply.call_args_list], [[2], [3]])
+
+    def test_rows_are_claimed_before_publishing(self, mock_apply):
+        enqueue_tasks(process_video_async.name, [([7], 'task-7')])
+
+        def check_claim(**kwargs):
+            # The claim is committed: the row is marked and not locked during the broker call
+            message = OutboxMessage.objects.get()
+            self.assertIsNotNone(message.claimed_at)
+            self.assertIsNone(message.published_at)
+        mock_apply.side_effect = check_claim
+
+        self.assertEqual(relay_outbox(), 1)
+        self.assertEqual(relay_outbox(), 0)  # already claimed and published
@@ -0,0 +1,109 @@
+from datetime import timedelta
+from unittest.mock import patch
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.contrib.auth import get_user_model
+from django.utils import timezone
+from api.models import Video, SchedulerLock
+from utils.outbox import relay_outbox
+from utils.scheduler import Job, pick_jobs, simulate, schedule_video, dispatch_pending, heartbeat
+from api.tasks import dispatch_pending_videos
+
+User = get_user_model()
+
+
+class PickJobsTest(TestCase):
+    def test_shortest_job_first(self):
+        waiting = [Job(1, 'a', 600, 0), Job(2, 'b', 60, 0), Job(3, 'c', 300, 0)]
+        picked = pick_jobs(waiting, {}, now=0, slots=3, aging_rate=0)
+        self.assertEqual([job.id for job in picked], [2, 3, 1])
+
+    def test_fair_share_interleaves_users(self):
+        """A bulk uploader's jobs don't all go ahead of another user's"""
+        waiting = [Job(i, 'bulk', 100, 0) for i in range(5)] + [Job(10, 'other', 150, 1)]
+        picked = pick_jobs(waiting, {}, now=1, slots=3, aging_rate=0)
+        self.assertIn(10, [job.id for job in picked])
+
+    def test_aging_prevents_starvation(self):
+        waiting = [Job(1, 'a', 3600, 0), Job(2, 'b', 60, 10000)]
+        picked = pick_jobs(waiting, {}, now=10000, slots=1, aging_rate=0.5)
+        self.assertEqual(picked[0].id, 1)
+
+    def test_simulator_fair_policy_helps_short_jobs(self):
+        jobs = [Job(i, 'bulk', 3600, 0) for i in range(10)]
+        jobs += [Job(100 + i, f'u{i}', 60, 10 + i) for i in range(10)]
+        fifo = simulate(jobs, 'fifo', workers=1, realtime_factor=0.1)
+        fair = simulate(jobs, 'fair', workers=1, realtime_factor=0.1, aging_rate=0.01)
+        self.assertEqual(len(fifo), len(jobs))
+        short = range(100, 110)
+        self.assertLess(max(fair[i] for i in short), max(fifo[i] for i in short))
+
+
+@override_settings(SCHEDULER_MAX_IN_FLIGHT=1, SCHEDULER_AGING_RATE=0)
+class DispatchTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+
+    def make_video(self, title):
+        return Video.objects.create(user=self.user, title=title, file=f'videos/{title}.mp4')
+
+    @patch('api.tasks.process_video_async.apply_async')
+    def test_dispatch_respects_slots_and_order(self, mock_apply):
+        long_video = self.make_video('long')
+        schedule_video(long_video, duration=3000)
+        mock_apply.assert_not_called()  # published by the outbox relay
+        self.assertEqual(relay_outbox(), 1)
+        mock_apply.assert_called_once_with(args=[long_video.id], task_id=long_video.task_id)
+
+        short_video = self.make_video('short')
+        longer_video = self.make_video('longer')
+        schedule_video(longer_video, duration=5000)
+        schedule_video(short_video, duration=30)
+        self.assertEqual(relay_outbox(), 0)  # no free slot
+
+        Video.objects.filter(id=long_video.id).update(status='completed')
+        self.assertEqual(dispatch_pending(), [short_video.id])
+        short_video.refresh_from_db()
+        self.assertEqual(short_video.status, 'queued')
+        self.assertIsNotNone(short_video.dispatched_at)
+
+    def test_slots_are_counted_under_the_dispatch_lock(self):
+        schedule_video(self.make_video('first'), duration=60)
+        with CaptureQueriesContext(connection) as queries:
+            dispatch_pending()
+        sql = [query['sql'] for query in queries.captured_queries]
+        lock = next(i for i, q in enumerate(sql) if q.startswith('UPDATE "scheduler_locks"'))
+        count = next(i for i, q in enumerate(sql) if 'COUNT(' in q and '"videos"' in q)
+        release = next(i for i, q in enumerate(sql) if q.startswith('RELEASE SAVEPOINT'))
+        # Count and claim happen after the lock is taken and before it is released
+        self.assertLess(lock, count)
+        self.assertLess(count, release)
+        self.assertIsNotNone(SchedulerLock.objects.get(name='dispatch').acquired_at)
+
+    @override_settings(SCHEDULER_STALL_SECONDS=600)
+    @patch('api.tasks.process_video_async.apply_async')
+    def test_lost_task_frees_its_slot(self, mock_apply):
+        lost = self.make_video('lost')
+        schedule_video(lost, duration=60)
+        relay_outbox()
+        waiting = self.make_video('waiting')
+        schedule_video(waiting, duration=60)
+        Video.objects.filter(id=lost.id).update(dispatched_at=timezone.now() - timedelta(hours=1))
+
+        dispatch_pending_videos()
+        lost.refresh_from_db()
+        waiting.refresh_from_db()
+        self.assertEqual(lost.status, 'failed')
+        self.assertEqual(waiting.status, 'queued')
+        mock_apply.assert_called_with(args=[waiting.id], task_id=waiting.task_id)
+
+    @override_settings(SCHEDULER_STALL_SECONDS=600)
+    def test_heartbeat_keeps_a_long_video_in_flight(self):
+        video = self.make_video('long')
+        Video.objects.filter(id=video.id).update(status='queued', dispatched_at=timezone.now() - timedelta(hours=1))
+        heartbeat(video.id)
+
+        dispatch_pending_videos()
+        video.refresh_from_db()
+        self.assertEqual(video.status, 'queued')
@@ -0,0 +1,142 @@
+import os
+import tempfile
+from unittest.mock import patch
+from django.test import TestCase, override_settings
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, MediaBlob
+from utils.storage import acquire_blob, collect_garbage, media_storage
+from utils.jwt_helpers import generate_tokens
+from utils.media_probe import MediaInfo
+from . import TempDirsMixin
+
+User = get_user_model()
+
+
+class ContentAddressedStorageTest(TestCase):
+    def setUp(self):
+        # A fresh media root per test, so files left by one test are not orphans in the next
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        media = override_settings(MEDIA_ROOT=media_root.name)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+
+    def create_video(self, content, name='clip.mp4'):
+        video = Video(user=self.user, title=name)
+        video.file.save(name, ContentFile(content), save=False)
+        video.save()
+        return video
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self.create_video(b'same bytes', 'a.mp4')
+        second = self.create_video(b'same bytes', 'b.MP4')
+        other = self.create_video(b'other bytes')
+
+        self.assertEqual(first.file.name, second.file.name)
+        self.assertTrue(first.file.name.startswith('blobs/'))
+        self.assertNotEqual(first.file.name, other.file.name)
+        self.assertEqual(MediaBlob.objects.get(name=first.file.name).ref_count, 2)
+        self.assertEqual(MediaBlob.objects.get(name=first.file.name).size, len(b'same bytes'))
+
+    def test_gc_deletes_blob_after_last_reference(self):
+        first = self.create_video(b'shared')
+        second = self.create_video(b'shared')
+        name = first.file.name
+
+        first.delete()
+        self.assertEqual(collect_garbage(min_age=0), (0, 0))
+        self.assertTrue(media_storage().exists(name))
+
+        second.delete()
+        self.assertEqual(collect_garbage(min_age=3600), (0, 0))  # too recently written
+        self.assertEqual(collect_garbage(dry_run=True, min_age=0), (1, len(b'shared')))
+        self.assertTrue(media_storage().exists(name))
+        self.assertEqual(collect_garbage(min_age=0), (1, len(b'shared')))
+        self.assertFalse(media_storage().exists(name))
+        self.assertFalse(MediaBlob.objects.filter(name=name).exists())
+
+    def test_gc_removes_old_orphans_only(self):
+        kept = self.create_video(b'kept')
+        orphan = media_storage().save('videos/orphan.mp4', ContentFile(b'orphan'))
+        fresh = media_storage().save('videos/fresh.mp4', ContentFile(b'fresh'))
+        old = os.path.getmtime(media_storage().path(orphan)) - 7200
+        os.utime(media_storage().path(orphan), (old, old))
+
+        self.assertEqual(collect_garbage(min_age=3600, include_legacy=True), (1, len(b'orphan')))
+        self.assertFalse(media_storage().exists(orphan))
+        self.assertTrue(media_storage().exists(fresh))
+        self.assertTrue(media_storage().exists(kept.file.name))
+
+    @patch('utils.video_helper.subprocess.run')
+    def test_drop_original_after_audio_derivative(self, run):
+        from utils.video_helper import archive_media
+
+        def fake_ffmpeg(cmd, **kwargs):
+            with open(cmd[-1], 'wb') as out:
+                out.write(b'opus audio')
+        run.side_effect = fake_ffmpeg
+
+        video = self.create_video(b'large original video')
+        original = video.file.name
+        with override_settings(MEDIA_DROP_ORIGINAL_AFTER_PROCESSING=True):
+            archive_media(video)
+
+        video.refresh_from_db()
+        self.assertFalse(video.file)
+        self.assertTrue(video.audio_file.name.endswith('.ogg'))
+        self.assertEqual(MediaBlob.objects.get(name=original).ref_count, 0)
+        self.assertEqual(MediaBlob.objects.get(name=video.audio_file.name).ref_count, 1)
+        self.assertEqual(collect_garbage(min_age=0), (1, len(b'large original video')))
+
+    def age(self, name, seconds=7200):
+        old = os.path.getmtime(media_storage().path(name)) - seconds
+        os.utime(media_storage().path(name), (old, old))
+
+    def test_gc_spares_a_blob_reused_by_an_upload_in_progress(self):
+        video = self.create_video(b'reused')
+        name = video.file.name
+        video.delete()
+        self.age(name)
+
+        # The new upload has reused the blob file but its row has not taken a reference yet
+        self.assertEqual(media_storage().save('again.mp4', ContentFile(b'reused')), name)
+        self.assertEqual(collect_garbage(min_age=3600), (0, 0))
+        self.assertTrue(media_storage().exists(name))
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 0)
+
+    def test_gc_keeps_a_blob_acquired_while_it_runs(self):
+        video = self.create_video(b'raced')
+        name = video.file.name
+        video.delete()
+        self.age(name)
+
+        def acquire_then_age(blob_name):
+            acquire_blob(blob_name)  # lands between the candidate listing and the delete
+            return 7200
+
+        with patch('utils.storage.file_age', side_effect=acquire_then_age):
+            self.assertEqual(collect_garbage(min_age=3600), (0, 0))
+        self.assertTrue(media_storage().exists(name))
+        self.assertEqual(MediaBlob.objects.get(name=name).ref_count, 1)
+
+
+@patch('api.views.probe_video', return_value=MediaInfo(60.0, 'aac', 44100, 128000, 2))
+@patch('api.tasks.process_video_async.apply_async')
+class UploadDedupTest(TempDirsMixin, TestCase):
+    def test_reupload_stores_file_once(self, apply_async, duration):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(user)["access_token"]}')
+        for _ in range(2):
+            client.post('/api/video/upload', {
+                'title': 'Clip',
+                'file': SimpleUploadedFile('clip.mp4', b'video bytes', content_type='video/mp4'),
+            }, format='multipart')
+
+        names = set(Video.objects.values_list('file', flat=True))
+        self.assertEqual(len(names), 1)
+        self.assertEqual(MediaBlob.objects.get(name=names.pop()).ref_count, 2)
@@ -0,0 +1,94 @@
+import io
+import subprocess
+import tracemalloc
+from unittest.mock import patch, MagicMock
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video, Transcript
+from utils.checkpoints import get_checkpoint
+from utils.video_helper import transcribe_video, pcm_windows
+
+User = get_user_model()
+
+SAMPLE_RATE = 16000
+
+
+class FakePipe(io.RawIOBase):
+    """ffmpeg stdout producing `seconds` of s16le PCM without holding it in memory"""
+
+    def __init__(self, seconds):
+        self.remaining = int(seconds * SAMPLE_RATE) * 2
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        count = min(len(buffer), self.remaining, 65536)
+        buffer[:count] = b'\x01\x00' * (count // 2)
+        self.remaining -= count
+        return count
+
+
+def fake_ffmpeg(seconds, returncode=0):
+    process = MagicMock()
+    process.stdout = FakePipe(seconds)
+    process.wait.return_value = returncode
+    process.poll.return_value = returncode
+    process.returncode = returncode
+    return process
+
+
+class WindowModel:
+    """Not a MagicMock: recorded call arguments would keep every window alive"""
+
+    def transcribe(self, audio, **kwargs):
+        seconds = len(audio) / SAMPLE_RATE
+        return {'text': '', 'language': 'en', 'segments': [{'start': 0.0, 'end': seconds, 'text': ' words'}]}
+
+
+@override_settings(TRANSCRIPTION_STREAM_WINDOW_SECONDS=30)
+class StreamingDecodeTest(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.model = WindowModel()
+
+    def transcribe(self, seconds, returncode=0):
+        video = Video.objects.create(user=self.user, title='Lecture', file='videos/lecture.mp4')
+        with patch('utils.video_helper.subprocess.Popen', return_value=fake_ffmpeg(seconds, returncode)) as popen:
+            transcribe_video(video, self.model, '/media/lecture.mp4', 'en')
+        return video, popen
+
+    def test_windows_are_read_from_one_pipe(self):
+        video, popen = self.transcribe(95)
+        popen.assert_called_once()
+        self.assertIn('pipe:1', popen.call_args.args[0])
+        starts = list(Transcript.objects.filter(video=video).order_by('start_time').values_list('start_time', flat=True))
+        self.assertEqual(starts, [0.0, 30.0, 60.0, 90.0])
+        self.assertIsNotNone(get_checkpoint(video, 'transcript'))
+
+    def test_peak_memory_does_not_grow_with_duration(self):
+        def peak(seconds):
+            tracemalloc.start()
+            self.transcribe(seconds)
+            _, peak_bytes = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak_bytes
+
+        short, long = peak(5 * 60), peak(60 * 60)
+        # One 30 s window is ~1 MB of s16 plus ~2 MB of float32; a decoded hour would be ~230 MB
+        self.assertLess(long, short * 1.25)
+        self.assertLess(long, 16 * 1024 * 1024)
+
+    def test_ffmpeg_failure_is_not_marked_done(self):
+        with self.assertRaises(subprocess.CalledProcessError):
+            self.transcribe(40, returncode=1)
+        video = Video.objects.latest('id')
+        self.assertIsNone(get_checkpoint(video, 'transcript'))
+        self.assertEqual(get_checkpoint(video, 'transcript_progress')['offset'], 30.0)
+
+    def test_resume_seeks_the_decoder(self):
+        with patch('utils.video_helper.subprocess.Popen', return_value=fake_ffmpeg(10)) as popen:
+            windows = list(pcm_windows('/media/lecture.mp4', 30, start=60.0))
+        cmd = popen.call_args.args[0]
+        self.assertEqual(cmd[cmd.index('-ss') + 1], '60.000')
+        self.assertEqual([len(w) for w in windows], [10 * SAMPLE_RATE])
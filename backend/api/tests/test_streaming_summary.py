@@ -0,0 +1,73 @@
+from collections import namedtuple
+from unittest.mock import patch
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.contrib.auth import get_user_model
+from api.models import Video, Transcript, SummaryChunk, Chapter
+from utils.chapters import topic_chunks
+from utils.summary_helper import generate_summary, StreamingSummarizer
+from .test_chapters import lecture
+
+User = get_user_model()
+
+Segment = namedtuple('Segment', ['text', 'start_time', 'end_time'])
+
+
+def reply(language, content):
+    if content.startswith('These are summaries'):
+        return 'Reduced summary.'
+    topic = 'Baking' if 'whisk' in content else 'Astronomy'
+    return f'Title: {topic}\n{topic} is discussed.'
+
+
+class SealedChunksTest(SimpleTestCase):
+    def test_sealed_chunks_are_a_prefix_of_the_final_chunks(self):
+        segments = [Segment(s['text'], s['start'], s['end']) for s in lecture(topic_lengths=(12, 12, 12, 12))]
+        final = topic_chunks(segments, 100000, 200)
+        self.assertEqual(len(final), 4)
+        sealed_counts = []
+        for end in range(1, len(segments) + 1):
+            sealed = topic_chunks(segments[:end], 100000, 200, final=False)
+            self.assertEqual(sealed, final[:len(sealed)])
+            sealed_counts.append(len(sealed))
+        self.assertEqual(sealed_counts[-1], 3)  # the last chunk waits for the end of the transcript
+        self.assertEqual(sealed_counts, sorted(sealed_counts))
+
+
+@override_settings(SUMMARY_CHUNK_CHARS=100000, CHAPTER_MIN_CHARS=200)
+class StreamingSummarizerTest(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4', language='en')
+
+    def append(self, segments):
+        Transcript.objects.bulk_create([
+            Transcript(video=self.video, text=s['text'], start_time=s['start'], end_time=s['end']) for s in segments
+        ])
+
+    def test_chunks_are_summarized_while_the_transcript_grows(self):
+        segments = lecture(topic_lengths=(12, 12, 12))
+        with patch('utils.summary_helper.ask_llm', side_effect=reply) as mock_llm:
+            summarizer = StreamingSummarizer(self.video, workers=1)
+            for start in range(0, len(segments), 6):  # one "window" of six segments at a time
+                self.append(segments[start:start + 6])
+                summarizer.submit()
+            summarizer.finish()
+        self.assertEqual(mock_llm.call_count, 2)
+        self.assertEqual(list(SummaryChunk.objects.filter(video=self.video).values_list('index', flat=True)), [0, 1])
+
+        with patch('utils.summary_helper.ask_llm', side_effect=reply) as mock_llm:
+            generate_summary(self.video)
+        self.assertEqual(mock_llm.call_count, 2)  # the last chunk + reduce
+        self.assertEqual([c.title for c in Chapter.objects.filter(video=self.video)], ['Baking', 'Astronomy', 'Baking'])
+
+    def test_failed_chunk_is_left_to_the_final_summary(self):
+        self.append(lecture(topic_lengths=(12, 12, 12)))
+        with patch('utils.summary_helper.ask_llm', side_effect=RuntimeError('rate limited')):
+            summarizer = StreamingSummarizer(self.video, workers=1)
+            self.assertEqual(summarizer.submit(), 2)
+            summarizer.finish()
+        self.assertFalse(SummaryChunk.objects.filter(video=self.video).exists())
+
+        with patch('utils.summary_helper.ask_llm', side_effect=reply) as mock_llm:
+            generate_summary(self.video)
+        self.assertEqual(mock_llm.call_count, 4)
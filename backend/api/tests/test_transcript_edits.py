@@ -0,0 +1,124 @@
+from unittest.mock import patch, MagicMock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, Transcript, Summary, Chapter
+from api.tasks import resummarize_video
+from utils.jwt_helpers import generate_tokens
+from utils.summary_helper import generate_summary, stale_chunks
+from utils.video_helper import save_transcript
+from .test_chapters import lecture
+
+User = get_user_model()
+
+
+@override_settings(SUMMARY_CHUNK_CHARS=100000, CHAPTER_MIN_CHARS=200)
+class TranscriptEditTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4',
+                                          language='en', processed=True)
+        save_transcript(self.video, lecture(topic_lengths=(12, 12, 12)), 'en')
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply):
+            generate_summary(self.video)
+        self.url = f'/api/video/{self.video.id}/transcript/'
+        self.segments = list(Transcript.objects.filter(video=self.video).order_by('start_time'))
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(user)["access_token"]}')
+
+    def reply(self, language, content):
+        if content.startswith('These are summaries'):
+            return 'Reduced summary.'
+        topic = 'Baking' if 'whisk' in content else 'Astronomy'
+        return f'Title: {topic}\n{topic} is discussed ({len(content)}).'
+
+    def patch_segments(self, segments):
+        with patch('api.tasks.resummarize_video.delay', return_value=MagicMock(id='task-1')) as mock_delay:
+            response = self.client.patch(self.url, {'segments': segments}, format='json')
+        return response, mock_delay
+
+    def test_edit_resummarizes_only_the_changed_chunk(self):
+        edited = self.segments[14]  # second topic
+        response, mock_delay = self.patch_segments([{'id': edited.id, 'text': ' Radio telescopes see gas clouds. '}])
+
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json(), {'updated': 1, 'changed_chunks': [1], 'task_id': 'task-1'})
+        mock_delay.assert_called_once_with(self.video.id)
+        self.assertEqual(Transcript.objects.get(id=edited.id).text, 'Radio telescopes see gas clouds.')
+
+        with patch('api.tasks.update_progress'), \
+                patch('utils.summary_helper.ask_llm', side_effect=self.reply) as mock_llm:
+            result = resummarize_video.apply(args=[self.video.id]).get()
+
+        self.assertEqual(mock_llm.call_count, 2)  # the edited chunk + reduce
+        self.assertIn('Radio telescopes', mock_llm.call_args_list[0].args[1])
+        self.assertEqual(result['summary_id'], Summary.objects.get(video=self.video).id)
+        self.assertEqual(stale_chunks(self.video), [])
+        self.assertEqual(Chapter.objects.filter(video=self.video).count(), 3)
+
+    def test_chunk_boundaries_survive_topic_changing_edits(self):
+        # Rewriting a whole topic would move the topic boundaries on a fresh chunking
+        edits = [{'id': s.id, 'text': self.segments[0].text} for s in self.segments[12:24]]
+        response, _ = self.patch_segments(edits)
+        self.assertEqual(response.json()['changed_chunks'], [1])
+
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply) as mock_llm:
+            generate_summary(self.video, keep_chunks=True)
+        self.assertEqual(mock_llm.call_count, 2)
+        self.assertEqual([c.start_time for c in Chapter.objects.filter(video=self.video)], [0.0, 51.0, 102.0])
+
+    def test_unchanged_text_needs_no_resummary(self):
+        segment = self.segments[0]
+        response, mock_delay = self.patch_segments([{'id': segment.id, 'text': segment.text}])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'updated': 0, 'changed_chunks': [], 'task_id': None})
+        mock_delay.assert_not_called()
+
+    def test_edit_invalidates_cached_transcript(self):
+        etag = self.client.get(self.url)['ETag']
+        self.patch_segments([{'id': self.segments[0].id, 'text': 'Corrected.'}])
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_invalid_edits(self):
+        other = Video.objects.create(user=self.video.user, title='Other', file='videos/other.mp4', processed=True)
+        save_transcript(other, [{'start': 0, 'end': 1, 'text': 'Other video.'}])
+        foreign = Transcript.objects.get(video=other)
+
+        for segments in ([], [{'id': self.segments[0].id}], [{'id': self.segments[0].id, 'text': '  '}], 'x'):
+            self.assertEqual(self.patch_segments(segments)[0].status_code, 400)
+        response, _ = self.patch_segments([{'id': foreign.id, 'text': 'Hijacked.'}])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Transcript.objects.get(id=foreign.id).text, 'Other video.')
+
+        Video.objects.filter(id=self.video.id).update(processed=False)
+        response, _ = self.patch_segments([{'id': self.segments[0].id, 'text': 'Early.'}])
+        self.assertEqual(response.status_code, 409)
+
+    def test_extractive_summary_is_fully_refreshed(self):
+        # Extractive summaries keep no chunk rows to compare against
+        with patch('utils.summary_helper.ask_llm', side_effect=self.reply):
+            stale = generate_summary(self.video, source='extractive')
+        response, mock_delay = self.patch_segments([{'id': self.segments[0].id, 'text': 'Corrected.'}])
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.json()['changed_chunks'], [0, 1, 2])
+        mock_delay.assert_called_once_with(self.video.id)
+
+        with override_settings(SUMMARY_BACKEND='extractive'), patch('api.tasks.update_progress'):
+            result = resummarize_video.apply(args=[self.video.id]).get()
+        self.assertNotEqual(result['summary_id'], stale.id)
+        self.assertEqual(Summary.objects.get(video=self.video).source, 'extractive')
+
+    @override_settings(PROCESSING_MAX_RETRIES=1, PROCESSING_RETRY_BACKOFF=0)
+    def test_resummary_retries_then_falls_back(self):
+        self.patch_segments([{'id': self.segments[14].id, 'text': 'Radio telescopes see gas clouds.'}])
+        with patch('api.tasks.update_progress'), \
+                patch('utils.summary_helper.ask_llm', side_effect=Exception('rate limited')) as mock_llm:
+            result = resummarize_video.apply(args=[self.video.id])
+
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(mock_llm.call_count, 2)  # first attempt + the retry
+        self.assertEqual(Summary.objects.get(video=self.video).source, 'extractive')
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.status, 'waiting')  # a refresh never fails the video itself
@@ -0,0 +1,89 @@
+import numpy as np
+import torch
+import whisper
+from unittest.mock import patch
+from django.core.files.base import ContentFile
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.contrib.auth import get_user_model
+from whisper.model import ModelDimensions, Whisper
+from api.models import Video, Transcript
+from api.tasks import process_video_async
+from utils import loadtest_stubs
+from utils.transcription_backends import (
+    StubTranscriber, load_backend, quantize_whisper, supports_batching, word_error_rate,
+)
+from utils.video_helper import load_whisper_model
+from . import TempDirsMixin
+
+User = get_user_model()
+
+
+class BackendTest(SimpleTestCase):
+    def test_word_error_rate(self):
+        self.assertEqual(word_error_rate('The cat sat.', 'the cat sat'), 0.0)
+        self.assertAlmostEqual(word_error_rate('the cat sat on the mat', 'the cat sat on mat'), 1 / 6)
+        self.assertAlmostEqual(word_error_rate('a b c', 'a x c d'), 2 / 3)
+
+    def test_stub_is_deterministic(self):
+        audio = np.zeros(12 * 16000, dtype=np.float32)
+        first = StubTranscriber('base').transcribe(audio)
+        self.assertEqual(first, StubTranscriber('base').transcribe(audio))
+        self.assertEqual([s['end'] for s in first['segments']], [5.0, 10.0, 12.0])
+        self.assertFalse(supports_batching(StubTranscriber('base')))
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            load_backend('nope', 'base')
+
+    def test_int8_quantization_keeps_outputs_close(self):
+        torch.manual_seed(0)
+        dims = ModelDimensions(n_mels=80, n_audio_ctx=10, n_audio_state=64, n_audio_head=2, n_audio_layer=2,
+                               n_vocab=100, n_text_ctx=16, n_text_state=64, n_text_head=2, n_text_layer=2)
+        model = Whisper(dims).eval()
+        torch.nn.init.normal_(model.decoder.positional_embedding, std=0.02)  # allocated with torch.empty
+        mel = torch.randn(1, 80, 20)
+        tokens = torch.tensor([[1, 5, 7, 9]])
+        with torch.no_grad():
+            expected = model(mel, tokens)
+            quantized = quantize_whisper(model)
+            actual = quantized(mel, tokens)
+
+        self.assertFalse(any(isinstance(m, torch.nn.Linear) for m in quantized.modules()))
+        self.assertTrue(any(isinstance(m, torch.ao.nn.quantized.dynamic.Linear) for m in quantized.modules()))
+        self.assertTrue(supports_batching(quantized))
+        self.assertLess((actual - expected).abs().max() / expected.abs().max(), 0.1)
+
+
+@override_settings(WHISPER_BATCH_SHORT_CLIPS=False, TRANSCRIPTION_BACKEND='stub')
+@patch('api.tasks.dispatch_pending_videos')
+@patch('api.tasks.update_progress')
+@patch('utils.summary_helper.ask_llm', return_value='Title: Talk\nA talk.')
+class BackendSelectionTest(TempDirsMixin, TestCase):
+    temp_dir_settings = ('MEDIA_ROOT', 'AUDIO_CACHE_DIR')
+
+    def setUp(self):
+        load_whisper_model.cache_clear()
+        self.addCleanup(load_whisper_model.cache_clear)
+        self.user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+
+    def upload(self, backend=''):
+        video = Video(user=self.user, title='Clip', status='queued', transcription_backend=backend)
+        video.file.save('clip.mp4', ContentFile(loadtest_stubs.synthetic_mp4(12.0)), save=False)
+        video.save()
+        return video
+
+    def test_worker_default_backend(self, *mocks):
+        video = self.upload()
+        with patch('utils.video_helper.decode_audio', loadtest_stubs.decode_audio), \
+                patch('utils.video_helper.encode_audio_derivative'):
+            result = process_video_async.apply(args=[video.id])
+        self.assertTrue(result.successful(), result.traceback)
+        self.assertEqual(Transcript.objects.filter(video=video).count(), 3)  # stub: 5 s segments
+
+    def test_per_job_backend(self, *mocks):
+        video = self.upload('whisper-int8')
+        with patch('utils.video_helper.load_backend', return_value=StubTranscriber('base')) as loader, \
+                patch('utils.video_helper.decode_audio', loadtest_stubs.decode_audio), \
+                patch('utils.video_helper.encode_audio_derivative'):
+            process_video_async.apply(args=[video.id])
+        self.assertIn('whisper-int8', [c.args[0] for c in loader.call_args_list])
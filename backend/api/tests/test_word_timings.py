@@ -0,0 +1,96 @@
+import numpy as np
+from django.core.cache import cache
+from django.test import TestCase, SimpleTestCase, override_settings
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+from api.models import Video, Transcript
+from utils.jwt_helpers import generate_tokens
+from utils.transcription_backends import StubTranscriber
+from utils.video_helper import initial_progress, transcribe_window_audio, edit_transcript
+from utils.word_timings import pack_words, unpack_words, word_count, segment_words
+
+User = get_user_model()
+
+WORDS = [
+    {'word': ' Hello', 'start': 0.0, 'end': 0.4},
+    {'word': ' world,', 'start': 0.5, 'end': 0.9},
+    {'word': ' again.', 'start': 1.2, 'end': 1.6},
+]
+
+
+class PackWordsTest(SimpleTestCase):
+    def test_round_trip(self):
+        packed = pack_words(WORDS, 'Hello world, again.', offset=10.0)
+        self.assertEqual(len(packed), 3 * 12)
+        self.assertEqual(word_count(packed), 3)
+        starts, ends, offsets = unpack_words(packed)
+        self.assertEqual(starts.tolist(), [10000, 10500, 11200])
+        self.assertEqual(ends.tolist(), [10400, 10900, 11600])
+        self.assertEqual(offsets.tolist(), [0, 6, 13])
+        self.assertEqual(segment_words(packed, 'Hello world, again.'),
+                         [(10000, 10400, 'Hello'), (10500, 10900, 'world,'), (11200, 11600, 'again.')])
+
+    def test_range_slices_overlapping_words(self):
+        packed = pack_words(WORDS, 'Hello world, again.')
+        self.assertEqual([w[2] for w in segment_words(packed, 'Hello world, again.', 0.45, 1.3)], ['world,', 'again.'])
+        self.assertEqual([w[2] for w in segment_words(packed, 'Hello world, again.', 0.95, 1.1)], [])
+        self.assertEqual([w[2] for w in segment_words(packed, 'Hello world, again.', 0.3, 0.35)], ['Hello'])
+
+    def test_empty(self):
+        self.assertEqual(pack_words(None, 'text'), b'')
+        self.assertEqual(word_count(b''), 0)
+        self.assertEqual(segment_words(b'', 'text', 0, 10), [])
+
+
+@override_settings(TRANSCRIPTION_WORD_TIMESTAMPS=True, TRANSCRIPTION_STREAM_WINDOW_SECONDS=30)
+class WordTimingsApiTest(TestCase):
+    def setUp(self):
+        cache.clear()
+        user = User.objects.create_user(username='u', email='u@example.com', password='pw')
+        self.video = Video.objects.create(user=user, title='Lecture', file='videos/lecture.mp4', language='en')
+        progress = {**initial_progress(self.video), 'window': 30, 'offset': 0.0}
+        audio = np.zeros(30 * 16000, dtype=np.float32)
+        progress = transcribe_window_audio(self.video, StubTranscriber('base'), audio, progress)
+        # The segment reaching the cut at 30 s is redone by the last window, from 25 s to 40 s
+        transcribe_window_audio(self.video, StubTranscriber('base'), audio[:16000 * 15], progress)
+        self.url = f'/api/video/{self.video.id}/words/'
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {generate_tokens(user)["access_token"]}')
+
+    def test_words_are_stored_per_segment(self):
+        segments = Transcript.objects.filter(video=self.video).order_by('start_time')
+        self.assertEqual(segments.count(), 8)
+        self.assertTrue(all(word_count(s.word_timings) == 12 for s in segments))
+        second_window = segments[5]
+        starts, _, _ = unpack_words(bytes(second_window.word_timings))
+        self.assertEqual(starts[0], 25000)  # window offset applied
+
+    def test_words_in_range(self):
+        response = self.client.get(f'{self.url}?start=31&end=33')
+        self.assertEqual(response.status_code, 200)
+        words = response.json()['words']
+        self.assertEqual(len(words), 6)  # words 2-7 of the 5/12 s words from 30 s overlap [31, 33)
+        self.assertEqual(words[0]['word'], Transcript.objects.get(video=self.video, start_time=30).text.split()[2])
+        self.assertLess(words[0]['start'], 31)
+        self.assertGreater(words[-1]['end'], 32.9)
+        self.assertEqual(len(self.client.get(self.url).json()['words']), 8 * 12)
+
+    def test_invalid_range(self):
+        self.assertEqual(self.client.get(f'{self.url}?start=soon').status_code, 400)
+        self.assertEqual(self.client.get(f'{self.url}?start=10&end=5').status_code, 400)
+        for query in ('start=nan', 'start=0&end=nan', 'start=-inf&end=5', 'start=0&end=inf'):
+            self.assertEqual(self.client.get(f'{self.url}?{query}').status_code, 400, query)
+
+    @override_settings(WORDS_MAX_RANGE_SECONDS=20)
+    def test_range_is_capped(self):
+        self.assertEqual(self.client.get(f'{self.url}?start=0&end=21').status_code, 400)
+        response = self.client.get(f'{self.url}?start=5').json()
+        self.assertEqual(response['end'], 25.0)
+        self.assertEqual(len(response['words']), 4 * 12)
+
+    def test_edit_drops_word_timings(self):
+        segment = Transcript.objects.filter(video=self.video).order_by('start_time').first()
+        edit_transcript(self.video, {segment.id: 'Corrected text.'})
+        segment.refresh_from_db()
+        self.assertEqual(bytes(segment.word_timings), b'')
+        self.assertEqual(len(self.client.get(f'{self.url}?start=0&end=5').json()['words']), 0)
@@ -0,0 +1,87 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import torch
+import whisper
+from whisper.model import ModelDimensions, Whisper
+from django.test import SimpleTestCase, override_settings
+from utils.transcription_backends import load_backend, load_whisper_mmap, MappedWhisper, MMAP_SUFFIX
+from utils.worker_memory import parse_model_specs, preload_models, memory_usage
+
+TINY_DIMS = ModelDimensions(
+    n_mels=80, n_audio_ctx=8, n_audio_state=32, n_audio_head=2, n_audio_layer=2,
+    n_vocab=51865, n_text_ctx=16, n_text_state=32, n_text_head=2, n_text_layer=2,
+)
+
+
+def write_checkpoint(directory):
+    """A tiny random Whisper checkpoint in the official format (fp16 weights)"""
+    torch.manual_seed(0)
+    model = Whisper(TINY_DIMS)
+    for parameter in model.parameters():
+        torch.nn.init.normal_(parameter, std=0.1)
+    model.decoder.positional_embedding.data.normal_()  # allocated with torch.empty
+    path = os.path.join(directory, 'tiny.pt')
+    state = {name: tensor.half() for name, tensor in model.state_dict().items()}
+    torch.save({'dims': TINY_DIMS.__dict__, 'model_state_dict': state}, path)
+    return path
+
+
+class MmapWeightsTest(SimpleTestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.path = write_checkpoint(self.directory)
+
+    def test_mapped_model_matches_regular_load(self):
+        reference = whisper.load_model(self.path, device='cpu')
+        mapped = load_whisper_mmap(self.path)
+
+        self.assertTrue(os.path.exists(os.path.join(self.directory, 'tiny' + MMAP_SUFFIX)))
+        self.assertFalse(any(p.is_meta for p in mapped.parameters()))
+        self.assertFalse(any(b.is_meta for b in mapped.buffers()))
+        self.assertEqual(mapped.decoder.blocks[0].mlp[0].weight.dtype, torch.float32)
+        mel = torch.randn(1, 80, 16)
+        tokens = torch.tensor([[50258, 50259, 50359]])
+        with torch.no_grad():
+            expected = reference.logits(tokens, reference.embed_audio(mel))
+            actual = mapped.logits(tokens, mapped.embed_audio(mel))
+        self.assertTrue(torch.allclose(expected, actual, atol=1e-5))
+
+    def test_backend_uses_mmap_when_enabled(self):
+        with override_settings(WHISPER_MMAP_WEIGHTS=True):
+            self.assertIsInstance(load_backend('whisper', self.path), MappedWhisper)
+        with override_settings(WHISPER_MMAP_WEIGHTS=False):
+            self.assertNotIsInstance(load_backend('whisper', self.path), MappedWhisper)
+
+
+class PreloadTest(SimpleTestCase):
+    def test_parse_model_specs(self):
+        self.assertEqual(parse_model_specs('base, small:whisper-int8,'), [('base', ''), ('small', 'whisper-int8')])
+        self.assertEqual(parse_model_specs(''), [])
+
+    @override_settings(WORKER_PRELOAD_MODELS='base,small:whisper-int8')
+    @patch('utils.worker_memory.gc.freeze')
+    @patch('torch.set_num_threads')
+    @patch('utils.video_helper.load_whisper_model')
+    def test_preload_fills_the_model_cache_before_fork(self, load, set_threads, freeze):
+        preload_models()
+        self.assertEqual([c.args for c in load.call_args_list], [('base', ''), ('small', 'whisper-int8')])
+        set_threads.assert_called_once_with(1)
+        freeze.assert_called_once()
+
+    @override_settings(WORKER_PRELOAD_MODELS='')
+    @patch('utils.video_helper.load_whisper_model')
+    def test_nothing_to_preload(self, load):
+        self.assertEqual(preload_models(), 0.0)
+        load.assert_not_called()
+
+    @unittest.skipUnless(os.path.exists('/proc/self/smaps_rollup'), 'needs /proc/<pid>/smaps_rollup')
+    def test_memory_usage(self):
+        usage = memory_usage()
+        self.assertGreater(usage.uss, 0)
+        self.assertLessEqual(usage.uss, usage.pss)
+        self.assertLessEqual(usage.pss, usage.rss)
+        self.assertIsNone(memory_usage(10 ** 9))
@@ -4,15 +4,28 @@ from .views import (
     SignUpView, 
     AuthenticateView, 
     VideoUploadView,
+    BulkVideoUploadView,
+    BulkVideoDeleteView,
+    BulkVideoReprocessView,
     VideoListView,
     VideoDetailView,
     VideoTranscriptView,
+    VideoTranscriptExportView,
     VideoSummaryView,
+    VideoChaptersView,
+    VideoWordsView,
     RefreshView,
     TaskStatusView,
     PasswordResetRequestView,
     PasswordResetConfirmView
 )
+from .async_views import (
+    AsyncVideoListView,
+    AsyncVideoDetailView,
+    AsyncVideoTranscriptView,
+    AsyncVideoSummaryView,
+    AsyncTaskStatusView,
+)
 
 urlpatterns = [
     # Authentication endpoints
@@ -22,14 +35,28 @@ urlpatterns = [
 
     # Video endpoints
     path('video/upload', VideoUploadView.as_view(), name='video-upload'),
+    path('video/bulk-upload', BulkVideoUploadView.as_view(), name='video-bulk-upload'),
+    path('video/bulk-delete', BulkVideoDeleteView.as_view(), name='video-bulk-delete'),
+    path('video/bulk-reprocess', BulkVideoReprocessView.as_view(), name='video-bulk-reprocess'),
     path('videos/', VideoListView.as_view(), name='video-list'),
     path('video/<int:video_id>/', VideoDetailView.as_view(), name='video-detail'),
     path('video/<int:video_id>/transcript/', VideoTranscriptView.as_view(), name='video-transcript'),
+    path('video/<int:video_id>/transcript/export/<str:fmt>/', VideoTranscriptExportView.as_view(),
+         name='video-transcript-export'),
     path('video/<int:video_id>/summary/', VideoSummaryView.as_view(), name='video-summary'),
+    path('video/<int:video_id>/chapters/', VideoChaptersView.as_view(), name='video-chapters'),
+    path('video/<int:video_id>/words/', VideoWordsView.as_view(), name='video-words'),
     
     # Task status endpoint
     path('task/<str:task_id>/status/', TaskStatusView.as_view(), name='task-status'),
 
+    # Async read endpoints (same responses; for the ASGI deployment)
+    path('async/videos/', AsyncVideoListView.as_view(), name='async-video-list'),
+    path('async/video/<int:video_id>/', AsyncVideoDetailView.as_view(), name='async-video-detail'),
+    path('async/video/<int:video_id>/transcript/', AsyncVideoTranscriptView.as_view(), name='async-video-transcript'),
+    path('async/video/<int:video_id>/summary/', AsyncVideoSummaryView.as_view(), name='async-video-summary'),
+    path('async/task/<str:task_id>/status/', AsyncTaskStatusView.as_view(), name='async-task-status'),
+
     # User info endpoint
     path('user/edit/', EditUserInfoView.as_view(), name='edit-user-info'),
 
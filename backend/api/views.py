@@ -1,4 +1,6 @@
 import jwt
+import math
+import time
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
@@ -9,21 +11,34 @@ from .serializers import (
     VideoDetailSerializer,
     TranscriptSerializer,
     SummarySerializer,
+    ChapterSerializer,
     UserEditSerializer,
     PasswordResetRequestSerializer,
     PasswordResetConfirmSerializer,
 )
-from .models import User, Video, Transcript, Summary
+from .models import User, Video, Transcript, Summary, Chapter, ProcessingCheckpoint
 from utils.jwt_helpers import generate_tokens, verify_token
 from .permissions import IsJwtAuthenticated
-from .tasks import process_video_async
+from utils.scheduler import schedule_video
+from utils.admission import admit_upload, estimated_completion, DEFER, REJECT
+from utils.video_helper import probe_video, store_media_info, edit_transcript
+from utils.summary_helper import stale_chunks
+from utils.http_cache import cached_response, video_etag, etag_matches, with_validators
+from utils.captions import EXPORT_FORMATS, export_transcript
+from utils.word_timings import words_in_range
+from utils.bulk_ops import bulk_upload, bulk_delete, bulk_reprocess
+from django.db import transaction
 from django.shortcuts import get_object_or_404
+from django.http import StreamingHttpResponse, HttpResponseNotModified
+from django.utils.text import slugify
 from django.conf import settings
 from celery.result import AsyncResult
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.core.mail import send_mail
+from django.utils import timezone
+from datetime import timedelta
 
 class SignUpView(APIView):
     serializer_class = SignupSerializer
@@ -100,25 +115,130 @@ class VideoUploadView(APIView):
     permission_classes = [IsJwtAuthenticated]
 
     def post(self, request):
+        # Admission control: refuse before storing anything if the backlog is too deep
+        admission = admit_upload(request.user)
+        if admission.decision == REJECT:
+            response = Response({
+                "error": f"Upload rejected: {admission.reason}. Please retry later.",
+                "retry_after": admission.retry_after,
+                "estimated_wait_seconds": round(admission.estimated_wait),
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(admission.retry_after)
+            return response
+
         serializer = VideoSerializer(data=request.data)
         if serializer.is_valid():
-            video = serializer.save(user=request.user)
-            print("request.user:", request.user)
-            print("is_authenticated:", request.user.is_authenticated)
-
-            # Queue video processing task asynchronously
-            task = process_video_async.delay(video.id)
-            
+            deferred = admission.decision == DEFER
+            not_before = timezone.now() + timedelta(seconds=settings.ADMISSION_DEFER_DELAY) if deferred else None
+            # The video row and its outbox message commit together; the relay publishes the task
+            with transaction.atomic():
+                video = serializer.save(user=request.user)
+
+                # Read the container header now so the scheduler can order jobs by length,
+                # then hand the video to the scheduler (dispatched when a slot frees up)
+                store_media_info(video, probe_video(video.file.path))
+                task_id = schedule_video(video, duration=video.duration, not_before=not_before)
+            eta = estimated_completion(admission.estimated_wait, video.duration, deferred=deferred)
+
+            if deferred:
+                message = f"Video uploaded successfully. Processing has been deferred ({admission.reason})."
+            else:
+                message = "Video uploaded successfully. Processing has been queued."
             return Response({
                 **VideoSerializer(video).data,
-                "message": "Video uploaded successfully. Processing has been queued.",
-                "task_id": task.id,
-                "status": "processing_queued"
+                "message": message,
+                "task_id": task_id,
+                "status": "processing_deferred" if deferred else "processing_queued",
+                "estimated_wait_seconds": round(admission.estimated_wait),
+                "estimated_completion": eta.isoformat(),
             }, status=status.HTTP_201_CREATED)
 
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+def bulk_ids(request):
+    """Parse and bound the `ids` list of a bulk request; returns (ids, error response)"""
+    ids = request.data.get('ids')
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) for i in ids):
+        return None, Response({"error": "Provide 'ids' as a non-empty list of video IDs."},
+                              status=status.HTTP_400_BAD_REQUEST)
+    if len(ids) > settings.BULK_MAX_ITEMS:
+        return None, Response({"error": f"At most {settings.BULK_MAX_ITEMS} videos per request."},
+                              status=status.HTTP_400_BAD_REQUEST)
+    return ids, None
+
+
+def bulk_response(results, started, status_code=status.HTTP_200_OK):
+    elapsed = time.perf_counter() - started
+    return Response({
+        "results": results,
+        "count": len(results),
+        "elapsed_seconds": round(elapsed, 3),
+        "items_per_second": round(len(results) / elapsed, 1) if elapsed else None,
+    }, status=status_code)
+
+
+class BulkVideoUploadView(APIView):
+    """Upload many files in one multipart request (repeated 'files' fields, optional 'titles')"""
+    permission_classes = [IsJwtAuthenticated]
+
+    def post(self, request):
+        started = time.perf_counter()
+        files = request.FILES.getlist('files')
+        if not files:
+            return Response({"error": "No files were submitted."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(files) > settings.BULK_MAX_ITEMS:
+            return Response({"error": f"At most {settings.BULK_MAX_ITEMS} files per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        admission = admit_upload(request.user, count=len(files))
+        if admission.decision == REJECT:
+            response = Response({
+                "error": f"Upload rejected: {admission.reason}. Please retry later.",
+                "retry_after": admission.retry_after,
+                "estimated_wait_seconds": round(admission.estimated_wait),
+            }, status=status.HTTP_429_TOO_MANY_REQUESTS)
+            response['Retry-After'] = str(admission.retry_after)
+            return response
+
+        deferred = admission.decision == DEFER
+        not_before = timezone.now() + timedelta(seconds=settings.ADMISSION_DEFER_DELAY) if deferred else None
+        results = bulk_upload(
+            request.user,
+            files,
+            titles=request.data.getlist('titles'),
+            quality=request.data.get('quality', 'auto'),
+            not_before=not_before,
+            transcription_backend=request.data.get('transcription_backend', ''),
+        )
+        created = any(result['status'] == 'created' for result in results)
+        return bulk_response(results, started, status.HTTP_201_CREATED if created else status.HTTP_400_BAD_REQUEST)
+
+
+class BulkVideoDeleteView(APIView):
+    """Delete many videos by ID"""
+    permission_classes = [IsJwtAuthenticated]
+
+    def post(self, request):
+        started = time.perf_counter()
+        ids, error = bulk_ids(request)
+        if error:
+            return error
+        return bulk_response(bulk_delete(request.user, ids), started)
+
+
+class BulkVideoReprocessView(APIView):
+    """Run the processing pipeline again for many finished or failed videos"""
+    permission_classes = [IsJwtAuthenticated]
+
+    def post(self, request):
+        started = time.perf_counter()
+        ids, error = bulk_ids(request)
+        if error:
+            return error
+        return bulk_response(bulk_reprocess(request.user, ids), started)
+
+
 class VideoListView(APIView):
     """Get list of user's videos"""
     permission_classes = [IsJwtAuthenticated]
@@ -138,8 +258,10 @@ class VideoDetailView(APIView):
 
     def get(self, request, video_id):
         video = get_object_or_404(Video, id=video_id, user=request.user)
-        serializer = VideoDetailSerializer(video)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return cached_response(
+            request, video, 'detail',
+            lambda: (VideoDetailSerializer(video).data, status.HTTP_200_OK),
+        )
     
     def delete(self, request, video_id):
         """Delete a video from database only (keep physical file)"""
@@ -147,36 +269,143 @@ class VideoDetailView(APIView):
         
         # Store video info before deletion
         video_title = video.title
-        video_file_path = video.file.name if video.file else "No file"
         
-        # Delete from database only (this will cascade delete transcripts and summaries)
+        # Cascades to transcripts and summaries; the media blobs lose a reference
+        # and are removed by `manage.py gc_media` once nothing else uses them
         video.delete()
         
         return Response({
             "message": f"Video '{video_title}' has been removed from your account successfully.",
-            "note": f"Physical file '{video_file_path}' has been preserved on the server."
+            "note": "Media files are deleted from the server once no other video references them."
         }, status=status.HTTP_200_OK)
 
 
+def parse_since(value):
+    """
+    Filter for incremental transcript fetches: `?since=42` returns segments
+    written after segment 42, `?since=90s` those starting at or after 90 s.
+    """
+    value = value.strip()
+    try:
+        if value.endswith('s'):
+            return {'start_time__gte': float(value[:-1])}
+        return {'id__gt': int(value)}
+    except ValueError:
+        raise ValueError(f"Invalid 'since' value '{value}'. Use a segment id or a time such as '90s'.")
+
+
+def transcript_resource(since=None):
+    """Cache/ETag resource name for a (possibly incremental) transcript response"""
+    if not since:
+        return 'transcript'
+    (lookup, value), = since.items()
+    return f'transcript-{lookup}-{value}'
+
+
+def transcript_payload(video, transcripts, complete, since=None):
+    """Transcript response body; `next_since` is the id to pass as ?since= on the next poll"""
+    data = TranscriptSerializer(transcripts, many=True).data
+    return {
+        "video_id": video.id,
+        "video_title": video.title,
+        "transcripts": data,
+        "complete": complete,
+        "next_since": max((t["id"] for t in data), default=(since or {}).get('id__gt')),
+    }
+
+
+def transcript_edits(request):
+    """Parse a transcript edit request into {segment id: text}; returns (edits, error response)"""
+    segments = request.data.get('segments')
+    if (not isinstance(segments, list) or not segments
+            or not all(isinstance(s, dict) and isinstance(s.get('id'), int)
+                       and isinstance(s.get('text'), str) and s['text'].strip() for s in segments)):
+        return None, Response({"error": "'segments' must be a non-empty list of {id, text} objects with non-blank text."},
+                              status=status.HTTP_400_BAD_REQUEST)
+    if len(segments) > settings.BULK_MAX_ITEMS:
+        return None, Response({"error": f"At most {settings.BULK_MAX_ITEMS} segments per request."},
+                              status=status.HTTP_400_BAD_REQUEST)
+    return {s['id']: s['text'].strip() for s in segments}, None
+
+
 class VideoTranscriptView(APIView):
-    """Get transcript for a specific video"""
+    """
+    Get transcript for a specific video. Segments are readable while the video
+    is still being transcribed; poll with ?since=<next_since> for new ones.
+    A window transcribed again (retry, reprocess) rewrites its segments in
+    place under the same ids, so an id cursor never returns a segment twice;
+    re-read a time range with ?since=<seconds>s to see rewritten text.
+    """
     permission_classes = [IsJwtAuthenticated]
 
     def get(self, request, video_id):
         video = get_object_or_404(Video, id=video_id, user=request.user)
-        transcripts = Transcript.objects.filter(video=video)
-        
-        if not transcripts.exists():
-            return Response({
+        since = request.query_params.get('since')
+        try:
+            filters = parse_since(since) if since is not None else None
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return cached_response(request, video, transcript_resource(filters), lambda: self.build(video, filters))
+
+    def build(self, video, since=None):
+        transcripts = Transcript.objects.filter(video=video).order_by('start_time', 'id').defer('word_timings')
+        complete = video.processed or ProcessingCheckpoint.objects.filter(video=video, stage='transcript').exists()
+
+        if since is None and not transcripts.exists():
+            return {
                 "message": "No transcript available for this video. Make sure the video has been processed."
-            }, status=status.HTTP_404_NOT_FOUND)
-        
-        serializer = TranscriptSerializer(transcripts, many=True)
-        return Response({
-            "video_id": video_id,
-            "video_title": video.title,
-            "transcripts": serializer.data
-        }, status=status.HTTP_200_OK)
+            }, status.HTTP_404_NOT_FOUND
+
+        if since:
+            transcripts = transcripts.filter(**since)
+        return transcript_payload(video, transcripts, complete, since), status.HTTP_200_OK
+
+    def patch(self, request, video_id):
+        """
+        Correct segment texts: {"segments": [{"id": 12, "text": "..."}, ...]}.
+        Only the summary chunks containing edited segments are re-summarized,
+        in the background.
+        """
+        video = get_object_or_404(Video, id=video_id, user=request.user)
+        if not video.processed:
+            return Response({"error": "The transcript can only be edited after processing has finished."},
+                            status=status.HTTP_409_CONFLICT)
+        edits, error = transcript_edits(request)
+        if error:
+            return error
+        unknown = set(edits) - set(Transcript.objects.filter(video=video, id__in=edits).values_list('id', flat=True))
+        if unknown:
+            return Response({"error": f"Unknown segment ids: {sorted(unknown)}"}, status=status.HTTP_400_BAD_REQUEST)
+
+        updated = edit_transcript(video, edits)
+        changed = stale_chunks(video)
+        response = {"updated": updated, "changed_chunks": changed, "task_id": None}
+        if not changed and Summary.objects.filter(video=video).exists():
+            return Response(response, status=status.HTTP_200_OK)
+
+        from .tasks import resummarize_video
+        response["task_id"] = resummarize_video.delay(video.id).id
+        return Response(response, status=status.HTTP_202_ACCEPTED)
+
+
+class VideoTranscriptExportView(APIView):
+    """Stream a video's transcript as SRT, WebVTT or NDJSON"""
+    permission_classes = [IsJwtAuthenticated]
+
+    def get(self, request, video_id, fmt):
+        video = get_object_or_404(Video, id=video_id, user=request.user)
+        if fmt not in EXPORT_FORMATS:
+            return Response({
+                "error": f"Unsupported export format '{fmt}'. Use one of: {', '.join(EXPORT_FORMATS)}."
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        etag = video_etag(video, f'export-{fmt}')
+        if etag_matches(request, etag):
+            response = HttpResponseNotModified()
+        else:
+            response = StreamingHttpResponse(export_transcript(video, fmt), content_type=EXPORT_FORMATS[fmt])
+            response['Content-Disposition'] = f'attachment; filename="{slugify(video.title) or "transcript"}.{fmt}"'
+        return with_validators(response, etag)
 
 
 class VideoSummaryView(APIView):
@@ -185,19 +414,95 @@ class VideoSummaryView(APIView):
 
     def get(self, request, video_id):
         video = get_object_or_404(Video, id=video_id, user=request.user)
+        return cached_response(request, video, 'summary', lambda: self.build(video))
+
+    def build(self, video):
         summaries = Summary.objects.filter(video=video)
         
         if not summaries.exists():
-            return Response({
+            return {
                 "message": "No summary available for this video. Make sure the video has been processed."
-            }, status=status.HTTP_404_NOT_FOUND)
+            }, status.HTTP_404_NOT_FOUND
         
         serializer = SummarySerializer(summaries, many=True)
-        return Response({
-            "video_id": video_id,
+        return {
+            "video_id": video.id,
             "video_title": video.title,
             "summaries": serializer.data
-        }, status=status.HTTP_200_OK)
+        }, status.HTTP_200_OK
+
+
+class VideoChaptersView(APIView):
+    """Get a video's chapters; ?at=<seconds> returns only the chapter playing at that time"""
+    permission_classes = [IsJwtAuthenticated]
+
+    def get(self, request, video_id):
+        video = get_object_or_404(Video, id=video_id, user=request.user)
+        at = request.query_params.get('at')
+        try:
+            at = float(at) if at is not None else None
+        except ValueError:
+            return Response({"error": "'at' must be a time in seconds."}, status=status.HTTP_400_BAD_REQUEST)
+        resource = 'chapters' if at is None else f'chapters-at-{at}'
+        return cached_response(request, video, resource, lambda: self.build(video, at))
+
+    def build(self, video, at=None):
+        chapters = Chapter.objects.filter(video=video)
+        if at is not None:
+            # The chapter playing at `at`, also in the gap between two chapters
+            chapters = chapters.filter(start_time__lte=at).order_by('-start_time')[:1]
+        chapters = list(chapters)
+
+        if not chapters:
+            return {
+                "message": "No chapters available for this video. Make sure the video has been processed."
+            }, status.HTTP_404_NOT_FOUND
+
+        return {
+            "video_id": video.id,
+            "video_title": video.title,
+            "chapters": ChapterSerializer(chapters, many=True).data
+        }, status.HTTP_200_OK
+
+
+class VideoWordsView(APIView):
+    """
+    Word-level timestamps for click-to-seek and highlighting:
+    ?start=<seconds>&end=<seconds> returns the words overlapping that range,
+    at most WORDS_MAX_RANGE_SECONDS wide (also the range when end is omitted).
+    """
+    permission_classes = [IsJwtAuthenticated]
+
+    def get(self, request, video_id):
+        video = get_object_or_404(Video, id=video_id, user=request.user)
+        try:
+            start = float(request.query_params.get('start', 0))
+            end = request.query_params.get('end')
+            end = float(end) if end is not None else None
+            if not math.isfinite(start) or (end is not None and not math.isfinite(end)):
+                raise ValueError("non-finite time")  # nan/inf would slip past the range checks
+        except ValueError:
+            return Response({"error": "'start' and 'end' must be times in seconds."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if end is None:
+            end = start + settings.WORDS_MAX_RANGE_SECONDS
+        if end <= start:
+            return Response({"error": "'end' must be after 'start'."}, status=status.HTTP_400_BAD_REQUEST)
+        if end - start > settings.WORDS_MAX_RANGE_SECONDS:
+            return Response({"error": f"At most {settings.WORDS_MAX_RANGE_SECONDS} seconds of words per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return cached_response(request, video, f'words-{start}-{end}', lambda: self.build(video, start, end))
+
+    def build(self, video, start, end):
+        # Only the segments overlapping the range are read; their packed words are sliced in place
+        rows = Transcript.objects.filter(video=video, end_time__gt=start, start_time__lt=end).exclude(word_timings=b'')
+        rows = rows.order_by('start_time', 'id').values_list('id', 'text', 'word_timings')
+        return {
+            "video_id": video.id,
+            "start": start,
+            "end": end,
+            "words": words_in_range(rows, start, end),
+        }, status.HTTP_200_OK
 
 
 class TaskStatusView(APIView):
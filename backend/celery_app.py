@@ -3,6 +3,7 @@ Celery configuration for video processing
 """
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_init
 
 # Set the default Django settings module for the 'celery' program.
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings.settings')
@@ -16,6 +17,37 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 # Load task modules from all registered Django apps.
 app.autodiscover_tasks()
 
+
+@worker_init.connect
+def record_concurrency(sender=None, **kwargs):
+    """Children inherit the environment, so they can size their thread pools"""
+    from utils.cpu_topology import CONCURRENCY_ENV
+
+    os.environ[CONCURRENCY_ENV] = str(sender.concurrency)
+
+
+@worker_init.connect
+def preload_worker_models(**kwargs):
+    """Load WORKER_PRELOAD_MODELS before forking so children share the weights (see utils/worker_memory.py)"""
+    from django.conf import settings
+    from utils.worker_memory import preload_models
+
+    if settings.WORKER_PRELOAD_MODELS:
+        seconds = preload_models()
+        print(f"Worker parent: preloaded {settings.WORKER_PRELOAD_MODELS} in {seconds:.1f}s")
+
+
+@worker_process_init.connect
+def configure_child_threads(**kwargs):
+    """Keep N prefork children from each using every core (see utils/cpu_topology.py)"""
+    from django.conf import settings
+    from utils.cpu_topology import configure_worker_threads
+
+    plan = configure_worker_threads()
+    pinned = f", pinned to {plan.cores}" if settings.WORKER_PIN_CORES else ""
+    print(f"Worker child: {plan.intra_op} torch threads of {plan.cpus} cores{pinned}")
+
+
 @app.task(bind=True)
 def debug_task(self):
     print(f'Request: {self.request!r}')
@@ -0,0 +1,55 @@
+"""
+Offline settings for load testing the API on a laptop.
+
+No Redis, Whisper weights, ffmpeg or Groq access needed: Celery runs tasks
+eagerly with in-memory broker/result store, caches are in-process and the
+ML/media backends are replaced by fast stubs (utils/loadtest_stubs.py).
+
+    python manage.py loadtest --settings=settings.loadtest --serve
+"""
+import os
+import tempfile
+from pathlib import Path
+
+for name in ('SECRET_KEY', 'JWT_SECRET_KEY', 'GROQ_API_KEY'):
+    os.environ.setdefault(name, f'loadtest-{name.lower()}-not-a-secret-0123456789abcdef')
+
+from .settings import *  # noqa: E402,F401,F403
+from .settings import BASE_DIR  # noqa: E402
+
+DEBUG = False  # DEBUG keeps every SQL query in memory
+ALLOWED_HOSTS = ['localhost', '127.0.0.1', 'testserver']
+
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'loadtest.sqlite3',
+        # Threaded server + SQLite: wait for the write lock instead of failing fast
+        'OPTIONS': {'timeout': 30, 'transaction_mode': 'IMMEDIATE'},
+    }
+}
+
+CACHE_URL = ''
+CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+CELERY_BROKER_URL = 'memory://'
+CELERY_RESULT_BACKEND = 'cache+memory://'
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = False
+CELERY_TASK_STORE_EAGER_RESULT = True  # so the status endpoint sees eager results
+CELERY_BEAT_SCHEDULE = {}
+
+LOADTEST_DIR = Path(tempfile.gettempdir()) / 'video-summary-loadtest'
+MEDIA_ROOT = LOADTEST_DIR / 'media'
+AUDIO_CACHE_DIR = str(LOADTEST_DIR / 'audio_cache')
+
+EMAIL_BACKEND = 'django.core.mail.backends.locmem.EmailBackend'
+
+# Keep the generator's users from tripping admission control; the point is web capacity
+ADMISSION_DEFER_WAIT = 10 ** 9
+ADMISSION_REJECT_WAIT = 10 ** 9
+ADMISSION_USER_DEFER_PENDING = 10 ** 6
+ADMISSION_USER_REJECT_PENDING = 10 ** 6
+
+LOADTEST_STUB_BACKENDS = True
+LOADTEST_TRANSCRIBE_DELAY = 0.0  # seconds of simulated model time per second of audio
@@ -56,6 +56,7 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # CORS must be high, before CommonMiddleware
+    'utils.http_cache.CompressionMiddleware',  # gzip/brotli for large API bodies
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -151,7 +152,10 @@ CORS_ALLOW_HEADERS = [
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
+    'if-none-match',
 ]
+# Let the frontend read validators and backoff hints on cross-origin responses
+CORS_EXPOSE_HEADERS = ['etag', 'retry-after']
 
 # When using only JWT (no session login) we can safely allow all methods
 CORS_ALLOW_METHODS = [
@@ -164,6 +168,26 @@ CSRF_TRUSTED_ORIGINS = [
     'http://127.0.0.1:4200',
 ]
 
+# Bulk upload/delete/reprocess endpoints
+BULK_MAX_ITEMS = config('BULK_MAX_ITEMS', default=200, cast=int)
+DATA_UPLOAD_MAX_NUMBER_FILES = BULK_MAX_ITEMS + 1  # Django's own cap (default 100) would reject first
+
+# Response caching for transcript/summary/detail endpoints. Entries are keyed by
+# the row's ETag, so a transcript or summary change makes old entries unreachable
+CACHE_URL = config('CACHE_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': CACHE_URL,
+    } if CACHE_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+API_RESPONSE_CACHE_TIMEOUT = config('API_RESPONSE_CACHE_TIMEOUT', default=300, cast=int)  # seconds
+API_COMPRESSION_MIN_BYTES = config('API_COMPRESSION_MIN_BYTES', default=1024, cast=int)
+API_GZIP_LEVEL = 6
+API_BROTLI_QUALITY = 5  # brotli is used when the optional `brotli` package is installed
+
 # Celery Configuration with Redis (from .env for flexibility)
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -173,6 +197,138 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = config('CELERY_TIMEZONE', default='UTC')
 CELERY_TASK_TRACK_STARTED = config('CELERY_TASK_TRACK_STARTED', default=True, cast=bool)
 CELERY_TASK_TIME_LIMIT = config('CELERY_TASK_TIME_LIMIT', default=30 * 60, cast=int)  # 30 minutes max per task
+# Raised inside the task before the hard limit so long transcriptions can checkpoint cleanly
+CELERY_TASK_SOFT_TIME_LIMIT = config('CELERY_TASK_SOFT_TIME_LIMIT', default=CELERY_TASK_TIME_LIMIT - 60, cast=int)
+CELERY_BEAT_SCHEDULE = {
+    # Safety net: pick up waiting videos even if no task finished recently
+    'dispatch-pending-videos': {
+        'task': 'api.tasks.dispatch_pending_videos',
+        'schedule': 30.0,
+    },
+}
+
+# Thread budget per prefork child (see utils/cpu_topology.py): cores, capped by the
+# cgroup quota, divided by the worker concurrency unless WORKER_TORCH_THREADS is set
+WORKER_TORCH_THREADS = config('WORKER_TORCH_THREADS', default=0, cast=int)  # 0 = cores / concurrency
+WORKER_INTEROP_THREADS = config('WORKER_INTEROP_THREADS', default=1, cast=int)
+WORKER_PIN_CORES = config('WORKER_PIN_CORES', default=False, cast=bool)  # pin each child to its own cores
+
+# Model memory across prefork children (see utils/worker_memory.py): models loaded in the
+# parent before forking are shared copy-on-write, e.g. WORKER_PRELOAD_MODELS=base,small:whisper-int8
+WORKER_PRELOAD_MODELS = config('WORKER_PRELOAD_MODELS', default='')
+# Map CPU Whisper weights from an fp32 copy of the checkpoint (shared page cache, even across workers)
+WHISPER_MMAP_WEIGHTS = config('WHISPER_MMAP_WEIGHTS', default=False, cast=bool)
+
+# Stage checkpointing and automatic retries
+AUDIO_CACHE_DIR = config('AUDIO_CACHE_DIR', default=str(BASE_DIR / 'audio_cache'))
+# Decode through an ffmpeg pipe while transcribing instead of writing the PCM cache
+# first (no disk copy, memory bounded by one window; retries decode again)
+AUDIO_STREAM_DECODE = config('AUDIO_STREAM_DECODE', default=False, cast=bool)
+PROCESSING_MAX_RETRIES = config('PROCESSING_MAX_RETRIES', default=3, cast=int)
+PROCESSING_RETRY_BACKOFF = config('PROCESSING_RETRY_BACKOFF', default=60, cast=int)  # seconds, doubled per retry
+
+# Media storage: uploads are content-addressed (identical files stored once);
+# after processing an Opus audio derivative is kept and the original may be dropped
+MEDIA_AUDIO_BITRATE = config('MEDIA_AUDIO_BITRATE', default='24k')
+MEDIA_DROP_ORIGINAL_AFTER_PROCESSING = config('MEDIA_DROP_ORIGINAL_AFTER_PROCESSING', default=False, cast=bool)
+MEDIA_GC_MIN_AGE = config('MEDIA_GC_MIN_AGE', default=3600, cast=int)  # seconds before an unreferenced blob or orphan file may be removed
+
+# Continuation mode: long videos are transcribed one bounded window per task
+TRANSCRIPTION_WINDOW_SECONDS = config('TRANSCRIPTION_WINDOW_SECONDS', default=10 * 60, cast=int)  # audio per task
+TRANSCRIPTION_MIN_WINDOW_SECONDS = 60  # windows are halved after a soft time limit, down to this
+TRANSCRIPTION_TASK_BUDGET_FRACTION = 0.5  # share of the soft limit a single-task transcription may use
+TRANSCRIPTION_PROMPT_CHARS = 200  # previous-window text carried over as context
+# A window's last segment ending this close to the cut was likely cut mid-word: it is not
+# committed, and the next window starts at its start instead (at most half a window back)
+TRANSCRIPTION_BOUNDARY_SECONDS = 2.0
+# Single-task transcription commits segments every this many seconds of audio,
+# so the transcript endpoint can serve the beginning while the rest is running
+TRANSCRIPTION_STREAM_WINDOW_SECONDS = config('TRANSCRIPTION_STREAM_WINDOW_SECONDS', default=120, cast=int)
+# Word-level timestamps (click-to-seek), stored packed per segment (see utils/word_timings.py).
+# Off by default: every window then gets an extra cross-attention alignment pass
+TRANSCRIPTION_WORD_TIMESTAMPS = config('TRANSCRIPTION_WORD_TIMESTAMPS', default=False, cast=bool)
+WORDS_MAX_RANGE_SECONDS = 600  # widest ?start/?end range of the words endpoint (the default without end)
+
+# Summarization (map/reduce over transcript chunks)
+SUMMARY_LLM_MODEL = config('SUMMARY_LLM_MODEL', default='llama-3.3-70b-versatile')
+SUMMARY_CHUNK_CHARS = config('SUMMARY_CHUNK_CHARS', default=12000, cast=int)
+SUMMARY_LLM_TIMEOUT = config('SUMMARY_LLM_TIMEOUT', default=60, cast=float)  # seconds per Groq request
+# 'llm' (Groq map/reduce) or 'extractive' (local sentence extraction, no LLM calls)
+SUMMARY_BACKEND = config('SUMMARY_BACKEND', default='llm')
+SUMMARY_EXTRACTIVE_PREVIEW = config('SUMMARY_EXTRACTIVE_PREVIEW', default=True, cast=bool)  # shown until the LLM summary lands
+SUMMARY_EXTRACTIVE_FALLBACK = config('SUMMARY_EXTRACTIVE_FALLBACK', default=True, cast=bool)  # when the LLM fails on the last attempt
+SUMMARY_EXTRACTIVE_SENTENCES = 5
+SUMMARY_EXTRACTIVE_CHAPTER_SENTENCES = 2
+SUMMARY_EXTRACTIVE_MAX_CHARS = 1500  # cap on the extractive summary, whatever the sentence split
+SUMMARY_EXTRACTIVE_CHAPTER_MAX_CHARS = 600
+SUMMARY_EXTRACTIVE_TEXTRANK_LIMIT = 1500  # above this many sentences, rank by centroid similarity
+# Summarize chunks whose boundaries are settled while the rest is still being transcribed
+SUMMARY_STREAMING = config('SUMMARY_STREAMING', default=True, cast=bool)
+SUMMARY_STREAM_WORKERS = config('SUMMARY_STREAM_WORKERS', default=2, cast=int)  # concurrent LLM requests per video
+# Chunks end at topic boundaries and double as chapters (see utils/chapters.py)
+CHAPTER_MIN_CHARS = config('CHAPTER_MIN_CHARS', default=3000, cast=int)
+CHAPTER_LEXICAL_WINDOW = 8  # segments compared on each side of a gap
+CHAPTER_PAUSE_SECONDS = 2.0  # a pause this long counts as a full pause signal
+CHAPTER_BOUNDARY_SCORE = config('CHAPTER_BOUNDARY_SCORE', default=0.6, cast=float)
+
+# Scheduler in front of Celery (see utils/scheduler.py)
+SCHEDULER_MAX_IN_FLIGHT = config('SCHEDULER_MAX_IN_FLIGHT', default=2, cast=int)  # videos sent to workers at once
+SCHEDULER_AGING_RATE = config('SCHEDULER_AGING_RATE', default=0.5, cast=float)  # priority seconds gained per second waited
+# A queued video whose task hasn't checked in for this long was lost (SIGKILL, hard time limit,
+# dropped message) and is marked failed by the beat task, freeing its slot
+SCHEDULER_STALL_SECONDS = config('SCHEDULER_STALL_SECONDS', default=CELERY_TASK_TIME_LIMIT + 600, cast=int)
+
+# Transactional outbox (see utils/outbox.py): tasks are written with the rows they read and
+# published by `python manage.py relay_outbox` (and by dispatch_pending_videos on workers)
+OUTBOX_RELAY_BATCH = config('OUTBOX_RELAY_BATCH', default=100, cast=int)  # messages per publish
+OUTBOX_RELAY_INTERVAL = config('OUTBOX_RELAY_INTERVAL', default=0.5, cast=float)  # seconds between polls when idle
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=5, cast=int)  # rejected publishes before a message is parked
+OUTBOX_CLAIM_TIMEOUT = config('OUTBOX_CLAIM_TIMEOUT', default=300, cast=int)  # seconds before a dead relay's claim is taken over
+OUTBOX_RETENTION = config('OUTBOX_RETENTION', default=24 * 3600, cast=int)  # seconds to keep published messages
+
+# Admission control on uploads (see utils/admission.py); waits are in seconds
+ADMISSION_DEFER_WAIT = config('ADMISSION_DEFER_WAIT', default=30 * 60, cast=int)
+ADMISSION_REJECT_WAIT = config('ADMISSION_REJECT_WAIT', default=2 * 60 * 60, cast=int)
+ADMISSION_USER_DEFER_PENDING = config('ADMISSION_USER_DEFER_PENDING', default=10, cast=int)
+ADMISSION_USER_REJECT_PENDING = config('ADMISSION_USER_REJECT_PENDING', default=50, cast=int)
+ADMISSION_DEFER_DELAY = config('ADMISSION_DEFER_DELAY', default=15 * 60, cast=int)
+ADMISSION_MIN_RETRY_AFTER = 60
+ADMISSION_THROUGHPUT_WINDOW = 50  # recent stage runs used for throughput estimates
+
+# Whisper model selection policy (see utils/model_policy.py)
+WHISPER_MODEL_LADDER = ['tiny', 'base', 'small', 'medium']
+# Estimated processing seconds per second of audio on a CPU worker
+WHISPER_REALTIME_FACTORS = {
+    'tiny': 0.08,
+    'base': 0.15,
+    'small': 0.45,
+    'medium': 1.2,
+    'large': 2.5,
+}
+WHISPER_DEFAULT_MODEL = config('WHISPER_DEFAULT_MODEL', default='base')
+WHISPER_MAX_AUTO_MODEL = config('WHISPER_MAX_AUTO_MODEL', default='small')
+WHISPER_QUALITY_MODEL = config('WHISPER_QUALITY_MODEL', default='medium')
+WHISPER_TARGET_TURNAROUND = config('WHISPER_TARGET_TURNAROUND', default=10 * 60, cast=int)  # seconds
+WHISPER_WORKER_CONCURRENCY = config('WHISPER_WORKER_CONCURRENCY', default=1, cast=int)
+WHISPER_UNKNOWN_DURATION_ESTIMATE = 5 * 60  # seconds assumed for videos not probed yet
+# Engine for this worker (see utils/transcription_backends.py): whisper, whisper-int8 or stub;
+# a video's transcription_backend overrides it per job
+TRANSCRIPTION_BACKEND = config('TRANSCRIPTION_BACKEND', default='whisper')
+# Language detection runs on a short sample with a small multilingual model
+WHISPER_LANGUAGE_DETECTION_MODEL = config('WHISPER_LANGUAGE_DETECTION_MODEL', default='tiny')
+WHISPER_LANGUAGE_SAMPLE_SECONDS = 30
+WHISPER_LANGUAGE_MIN_PROBABILITY = config('WHISPER_LANGUAGE_MIN_PROBABILITY', default=0.5, cast=float)
+# Cross-video batching worker mode for short clips
+WHISPER_BATCH_SHORT_CLIPS = config('WHISPER_BATCH_SHORT_CLIPS', default=False, cast=bool)
+WHISPER_BATCH_MAX_DURATION = config('WHISPER_BATCH_MAX_DURATION', default=60, cast=int)  # seconds
+WHISPER_BATCH_DEADLINE = config('WHISPER_BATCH_DEADLINE', default=3, cast=int)  # seconds to collect a batch
+WHISPER_BATCH_MAX_CLIPS = config('WHISPER_BATCH_MAX_CLIPS', default=16, cast=int)
+# A claim older than the hard time limit belongs to a dead batch task and goes back to pending,
+# so a task waiting on another batch gives up after roughly that long
+WHISPER_BATCH_MAX_WAITS = config(
+    'WHISPER_BATCH_MAX_WAITS', default=CELERY_TASK_TIME_LIMIT // max(1, WHISPER_BATCH_DEADLINE) + 10, cast=int
+)
+WHISPER_BATCH_SIZE = config('WHISPER_BATCH_SIZE', default=8, cast=int)  # mel windows per forward pass
 
 # Email backend configuration (Gmail example)
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
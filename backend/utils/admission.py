@@ -0,0 +1,93 @@
+# utils/admission.py - Admission control and wait-time estimates for uploads
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Sum
+from django.utils import timezone
+
+from utils.model_policy import realtime_factor
+
+ACCEPT = 'accept'
+DEFER = 'defer'
+REJECT = 'reject'
+
+PENDING_STATUSES = ['waiting', 'deferred', 'queued', 'processing']
+
+Admission = namedtuple('Admission', ['decision', 'estimated_wait', 'retry_after', 'reason'])
+
+
+def record_stage_timing(stage, audio_seconds, elapsed_seconds):
+    """Store how long a pipeline stage took for a given amount of audio"""
+    from api.models import StageMetric
+
+    if audio_seconds and elapsed_seconds > 0:
+        StageMetric.objects.create(stage=stage, audio_seconds=audio_seconds, elapsed_seconds=elapsed_seconds)
+
+
+def processing_cost():
+    """
+    Seconds of worker time per second of audio, summed over pipeline stages,
+    from the most recent ADMISSION_THROUGHPUT_WINDOW runs of each stage.
+    Falls back to the model realtime factor when a stage has no history yet.
+    """
+    from api.models import StageMetric
+
+    cost = 0.0
+    for stage in StageMetric.STAGES:
+        recent = list(
+            StageMetric.objects.filter(stage=stage)
+            .order_by('-created_at')
+            .values_list('audio_seconds', 'elapsed_seconds')[:settings.ADMISSION_THROUGHPUT_WINDOW]
+        )
+        audio = sum(row[0] for row in recent)
+        if audio:
+            cost += sum(row[1] for row in recent) / audio
+        elif stage == 'transcribe':
+            cost += realtime_factor(settings.WHISPER_DEFAULT_MODEL)
+    return cost
+
+
+def estimate_wait(cost=None):
+    """Estimated seconds before a new upload reaches a worker"""
+    from api.models import Video
+
+    cost = processing_cost() if cost is None else cost
+    pending = Video.objects.filter(status__in=PENDING_STATUSES)
+    known = pending.aggregate(seconds=Sum('duration'))['seconds'] or 0.0
+    unknown = pending.filter(duration__isnull=True).count()
+    seconds = known + unknown * settings.WHISPER_UNKNOWN_DURATION_ESTIMATE
+    return seconds * cost / max(1, settings.SCHEDULER_MAX_IN_FLIGHT)
+
+
+def decide(estimated_wait, user_pending):
+    """Apply the configured global and per-user limits"""
+    if user_pending >= settings.ADMISSION_USER_REJECT_PENDING:
+        return Admission(REJECT, estimated_wait, max(settings.ADMISSION_MIN_RETRY_AFTER, int(estimated_wait)),
+                         f"user has {user_pending} videos pending")
+    if estimated_wait >= settings.ADMISSION_REJECT_WAIT:
+        retry_after = int(estimated_wait - settings.ADMISSION_DEFER_WAIT)
+        return Admission(REJECT, estimated_wait, max(settings.ADMISSION_MIN_RETRY_AFTER, retry_after),
+                         "processing queue is full")
+    if user_pending >= settings.ADMISSION_USER_DEFER_PENDING:
+        return Admission(DEFER, estimated_wait, 0, f"user has {user_pending} videos pending")
+    if estimated_wait >= settings.ADMISSION_DEFER_WAIT:
+        return Admission(DEFER, estimated_wait, 0, "processing queue is busy")
+    return Admission(ACCEPT, estimated_wait, 0, "")
+
+
+def admit_upload(user, count=1):
+    """Decide whether `user` may upload `count` files now, before anything is stored"""
+    from api.models import Video
+
+    user_pending = Video.objects.filter(user=user, status__in=PENDING_STATUSES).count()
+    # A batch is judged by where its last file would land in the user's queue
+    return decide(estimate_wait(), user_pending + count - 1)
+
+
+def estimated_completion(estimated_wait, duration, deferred=False):
+    """Wall-clock estimate of when a video will be processed"""
+    delay = estimated_wait + (duration or settings.WHISPER_UNKNOWN_DURATION_ESTIMATE) * processing_cost()
+    if deferred:
+        delay += settings.ADMISSION_DEFER_DELAY
+    return timezone.now() + timedelta(seconds=delay)
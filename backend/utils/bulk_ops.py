@@ -0,0 +1,98 @@
+# utils/bulk_ops.py - Bulk upload / delete / reprocess with batched DB writes
+from django.db import transaction
+from django.utils import timezone
+
+from api.models import Video, ProcessingCheckpoint
+from api.serializers import VideoSerializer
+from utils.admission import PENDING_STATUSES
+from utils.scheduler import prepare_video, dispatch_pending
+from utils.storage import acquire_blobs
+from utils.video_helper import probe_video, apply_media_info
+
+# Stages cleared on reprocess; summary chunks are kept so unchanged text isn't re-summarized
+REPROCESS_STAGES = ['audio', 'transcript', 'transcript_progress', 'summary']
+
+
+def bulk_upload(user, files, titles=None, quality='auto', not_before=None, transcription_backend=''):
+    """
+    Validate and store every file, insert the rows with one bulk_create and
+    queue them all before a single dispatch. Returns per-file results in order.
+    """
+    titles = titles or []
+    results = []
+    videos = []
+    for index, upload in enumerate(files):
+        title = titles[index] if index < len(titles) and titles[index] else upload.name.rsplit('.', 1)[0]
+        serializer = VideoSerializer(data={
+            'title': title, 'file': upload, 'quality': quality, 'transcription_backend': transcription_backend,
+        })
+        if not serializer.is_valid():
+            results.append({'index': index, 'file': upload.name, 'status': 'error', 'errors': serializer.errors})
+            continue
+        video = Video(user=user, title=serializer.validated_data['title'],
+                      quality=serializer.validated_data.get('quality', 'auto'),
+                      transcription_backend=serializer.validated_data.get('transcription_backend', ''))
+        video.file.save(upload.name, upload, save=False)
+        apply_media_info(video, probe_video(video.file.path))
+        prepare_video(video, video.duration, not_before)
+        videos.append(video)
+        results.append({'index': index, 'file': upload.name, 'status': 'created', 'video': video})
+
+    with transaction.atomic():
+        Video.objects.bulk_create(videos)
+        # bulk_create skips the post_save signal that counts blob references
+        acquire_blobs([video.file.name for video in videos])
+        if videos:
+            dispatch_pending()
+
+    for result in results:
+        video = result.pop('video', None)
+        if video is not None:
+            result.update(id=video.id, task_id=video.task_id, duration=video.duration,
+                          processing_status=video.status)
+    return results
+
+
+def bulk_delete(user, ids):
+    """Delete the user's videos among `ids` (one DELETE per table); others are reported not_found"""
+    videos = Video.objects.filter(user=user, id__in=ids)
+    found = set(videos.values_list('id', flat=True))
+    # QuerySet.delete() still sends post_delete per row, which releases the media blobs
+    videos.delete()
+    return [{'id': video_id, 'status': 'deleted' if video_id in found else 'not_found'} for video_id in ids]
+
+
+def bulk_reprocess(user, ids):
+    """
+    Re-run the pipeline for finished or failed videos: clear their stage
+    checkpoints, requeue them with one bulk_update and dispatch once.
+    """
+    videos = {video.id: video for video in Video.objects.filter(user=user, id__in=ids)}
+    results = []
+    requeued = []
+    now = timezone.now()
+    for video_id in ids:
+        video = videos.get(video_id)
+        if video is None:
+            results.append({'id': video_id, 'status': 'not_found'})
+        elif video.status in PENDING_STATUSES:
+            results.append({'id': video_id, 'status': 'skipped', 'reason': f'already {video.status}'})
+        elif not video.file and not video.audio_file:
+            results.append({'id': video_id, 'status': 'skipped', 'reason': 'no media left to process'})
+        else:
+            prepare_video(video, video.duration)
+            video.processed = False
+            video.batch_state = ''
+            video.queued_at = now
+            requeued.append(video)
+            results.append({'id': video_id, 'status': 'queued', 'task_id': video.task_id})
+
+    with transaction.atomic():
+        ProcessingCheckpoint.objects.filter(video__in=requeued, stage__in=REPROCESS_STAGES).delete()
+        Video.objects.bulk_update(
+            requeued, ['status', 'queued_at', 'not_before', 'task_id', 'processed', 'batch_state'],
+            batch_size=500,
+        )
+        if requeued:
+            dispatch_pending()
+    return results
@@ -0,0 +1,71 @@
+# utils/captions.py - Streaming caption/transcript formatters (SRT, WebVTT, NDJSON)
+import json
+import re
+
+LINE_BREAKS_RE = re.compile(r"\s*(?:\r?\n|\r)\s*")
+
+EXPORT_FORMATS = {
+    'srt': 'application/x-subrip; charset=utf-8',
+    'vtt': 'text/vtt; charset=utf-8',
+    'ndjson': 'application/x-ndjson; charset=utf-8',
+}
+
+
+def format_timestamp(seconds, decimal_marker):
+    milliseconds = int(round(max(0.0, seconds) * 1000))
+    hours, milliseconds = divmod(milliseconds, 3600000)
+    minutes, milliseconds = divmod(milliseconds, 60000)
+    seconds, milliseconds = divmod(milliseconds, 1000)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d}{decimal_marker}{milliseconds:03d}"
+
+
+def cue_text(text):
+    """
+    Segment text made safe for one SRT/WebVTT cue: edited segments may hold
+    blank lines, which end a cue, so line breaks collapse to single newlines;
+    "-->" would be read as a cue timing line.
+    """
+    return LINE_BREAKS_RE.sub('\n', text.strip()).replace('-->', '->')
+
+
+def iter_srt(rows):
+    for index, (start, end, text) in enumerate(rows, start=1):
+        yield (
+            f"{index}\n"
+            f"{format_timestamp(start, ',')} --> {format_timestamp(end, ',')}\n"
+            f"{cue_text(text)}\n\n"
+        )
+
+
+def iter_vtt(rows):
+    yield "WEBVTT\n\n"
+    for start, end, text in rows:
+        yield f"{format_timestamp(start, '.')} --> {format_timestamp(end, '.')}\n{cue_text(text)}\n\n"
+
+
+def iter_ndjson(rows):
+    for start, end, text in rows:
+        yield json.dumps({'start': start, 'end': end, 'text': text.strip()}, ensure_ascii=False) + "\n"
+
+
+FORMATTERS = {
+    'srt': iter_srt,
+    'vtt': iter_vtt,
+    'ndjson': iter_ndjson,
+}
+
+
+def export_transcript(video_obj, fmt, chunk_size=2000):
+    """
+    Yield the video's transcript in `fmt`, reading segments through a
+    server-side cursor so memory stays flat however long the transcript is.
+    """
+    from api.models import Transcript
+
+    rows = (
+        Transcript.objects.filter(video=video_obj)
+        .order_by('start_time', 'id')
+        .values_list('start_time', 'end_time', 'text')
+        .iterator(chunk_size=chunk_size)
+    )
+    return FORMATTERS[fmt](rows)
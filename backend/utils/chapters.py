@@ -0,0 +1,117 @@
+# utils/chapters.py - Topic boundaries from segment timing and lexical shift
+import math
+import re
+from collections import Counter
+
+from django.conf import settings
+
+WORD_RE = re.compile(r"\w{3,}")  # words shorter than 3 chars are mostly function words
+
+
+def segment_words(text):
+    return Counter(WORD_RE.findall(text.lower()))
+
+
+def cosine(a, b):
+    dot = sum(count * b[word] for word, count in a.items() if word in b)
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm
+
+
+def boundary_scores(segments, window=None, pause_seconds=None):
+    """
+    Score each gap between consecutive segments as a topic boundary (0..1).
+    Half the score is lexical shift (1 - cosine similarity of the words in the
+    `window` segments before and after the gap), half the pause length
+    relative to CHAPTER_PAUSE_SECONDS. Returns len(segments) - 1 scores.
+    """
+    window = window or settings.CHAPTER_LEXICAL_WINDOW
+    pause_seconds = pause_seconds or settings.CHAPTER_PAUSE_SECONDS
+    words = [segment_words(segment.text) for segment in segments]
+
+    before = Counter()
+    after = Counter()
+    for bag in words[1:1 + window]:
+        after.update(bag)
+
+    scores = []
+    for gap in range(len(segments) - 1):
+        # Slide both windows by one segment: `before` covers [gap-window+1, gap], `after` [gap+1, gap+window]
+        before.update(words[gap])
+        if gap >= window:
+            before.subtract(words[gap - window])
+        if gap > 0:
+            after.subtract(words[gap])
+            if gap + window < len(words):
+                after.update(words[gap + window])
+        shift = 1.0 - cosine(+before, +after)
+        pause = max(0.0, segments[gap + 1].start_time - segments[gap].end_time)
+        scores.append(0.5 * shift + 0.5 * min(1.0, pause / pause_seconds))
+    return scores
+
+
+def topic_chunks(segments, max_chars, min_chars, threshold=None, final=True):
+    """
+    Split segments into chunks of at most `max_chars` characters that end at
+    topic boundaries: a chunk closes at the first gap scoring at least
+    `threshold` once it holds `min_chars`, and an oversized chunk is cut at
+    its highest-scoring gap. Returns a list of segment lists.
+
+    With final=False the segments are the prefix of a transcript still being
+    written, and only the chunks that later segments can no longer change are
+    returned: those closed at least CHAPTER_LEXICAL_WINDOW segments before the
+    end (a gap's score looks that far ahead).
+    """
+    threshold = settings.CHAPTER_BOUNDARY_SCORE if threshold is None else threshold
+    segments = [segment for segment in segments if segment.text.strip()]
+    scores = boundary_scores(segments)
+
+    chunks = []
+    decided = []  # segment index at which each chunk was closed
+    start = 0
+    size = 0
+    for i, segment in enumerate(segments):
+        length = len(segment.text.strip()) + 1
+        while i > start and size + length > max_chars:
+            # Too long: close at the best boundary that keeps the chunk at min_chars,
+            # and again while the carried-over remainder plus this segment doesn't fit
+            lengths = [len(seg.text.strip()) + 1 for seg in segments[start:i]]
+            filled = 0
+            cut = i - 1
+            best = -1.0
+            for j, seg_length in zip(range(start, i - 1), lengths):
+                filled += seg_length
+                if filled >= min_chars and scores[j] > best:
+                    cut, best = j, scores[j]
+            chunks.append(segments[start:cut + 1])
+            decided.append(i)
+            size = sum(lengths[cut + 1 - start:])
+            start = cut + 1
+        size += length
+        if i < len(scores) and size >= min_chars and scores[i] >= threshold:
+            chunks.append(segments[start:i + 1])
+            decided.append(i)
+            start = i + 1
+            size = 0
+    if not final:
+        stable = len(segments) - 1 - settings.CHAPTER_LEXICAL_WINDOW
+        return [chunk for chunk, index in zip(chunks, decided) if index <= stable]
+    if start < len(segments):
+        chunks.append(segments[start:])
+    return chunks
+
+
+def fallback_title(summary, limit=60):
+    """Chapter title when the LLM reply had none: the summary's first sentence, shortened"""
+    sentence = re.split(r"(?<=[.!?])\s", summary.strip(), maxsplit=1)[0].rstrip('.')
+    return sentence if len(sentence) <= limit else sentence[:limit - 1].rsplit(' ', 1)[0] + '…'
+
+
+def split_title(reply):
+    """Split a map-step reply into (title, summary); the prompt asks for a 'Title:' first line"""
+    first, _, rest = reply.strip().partition('\n')
+    if first.lower().startswith('title:') and rest.strip():
+        return first[len('title:'):].strip().strip('"*# ')[:200], rest.strip()
+    return '', reply.strip()
@@ -0,0 +1,23 @@
+# utils/checkpoints.py - Per-stage checkpoints for resumable processing
+from api.models import ProcessingCheckpoint
+
+
+def get_checkpoint(video_obj, stage):
+    """Return the stored data of a completed stage, or None"""
+    checkpoint = ProcessingCheckpoint.objects.filter(video=video_obj, stage=stage).first()
+    return checkpoint.data if checkpoint else None
+
+
+def save_checkpoint(video_obj, stage, data=None):
+    """Mark a stage as completed (idempotent)"""
+    ProcessingCheckpoint.objects.update_or_create(
+        video=video_obj, stage=stage, defaults={'data': data or {}}
+    )
+
+
+def clear_checkpoints(video_obj, *stages):
+    """Forget completed stages (all of them when no stage is given)"""
+    checkpoints = ProcessingCheckpoint.objects.filter(video=video_obj)
+    if stages:
+        checkpoints = checkpoints.filter(stage__in=stages)
+    checkpoints.delete()
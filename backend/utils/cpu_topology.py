@@ -0,0 +1,105 @@
+# utils/cpu_topology.py - Per-child thread budgets for prefork Whisper workers
+import math
+import os
+from collections import namedtuple
+
+from django.conf import settings
+
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:  # optional: limits numpy's BLAS pool at runtime
+    threadpool_limits = None
+
+ThreadPlan = namedtuple('ThreadPlan', ['cpus', 'concurrency', 'intra_op', 'inter_op', 'cores'])
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+THREAD_ENV_VARS = ['OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'NUMEXPR_NUM_THREADS']
+CONCURRENCY_ENV = 'WORKER_CHILD_CONCURRENCY'  # set by the worker parent, inherited by its children
+
+
+def read_first_line(path):
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+
+def cgroup_cpu_limit(root=CGROUP_ROOT):
+    """CPU quota of this container in cores (cgroup v2 cpu.max or v1 CFS quota), None if unlimited"""
+    line = read_first_line(os.path.join(root, 'cpu.max'))
+    if line:
+        quota, _, period = line.partition(' ')
+        if quota != 'max' and period:
+            return int(quota) / int(period)
+        return None
+    quota = read_first_line(os.path.join(root, 'cpu', 'cpu.cfs_quota_us'))
+    period = read_first_line(os.path.join(root, 'cpu', 'cpu.cfs_period_us'))
+    if quota and period and int(quota) > 0:
+        return int(quota) / int(period)
+    return None
+
+
+def allowed_cores():
+    """CPUs this process may run on (the affinity mask, e.g. from taskset or cpuset)"""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def available_cpus(root=CGROUP_ROOT):
+    """Usable cores: the affinity mask, capped by the cgroup quota"""
+    cpus = len(allowed_cores())
+    limit = cgroup_cpu_limit(root)
+    if limit:
+        cpus = min(cpus, max(1, math.floor(limit)))
+    return cpus
+
+
+def plan_threads(cpus, concurrency, child_index, cores=None, threads=None):
+    """
+    Split `cpus` between `concurrency` prefork children so they don't
+    oversubscribe the node: each child gets cpus // concurrency intra-op
+    threads (or `threads` when configured) and, for pinning, its own slice
+    of `cores`.
+    """
+    concurrency = max(1, concurrency)
+    intra_op = threads or max(1, cpus // concurrency)
+    cores = cores or list(range(cpus))
+    start = (child_index * intra_op) % len(cores)
+    pinned = [cores[(start + i) % len(cores)] for i in range(min(intra_op, len(cores)))]
+    return ThreadPlan(cpus, concurrency, intra_op, settings.WORKER_INTEROP_THREADS, pinned)
+
+
+def child_index():
+    """Stable index of this prefork child (billiard numbers its pool processes)"""
+    from billiard.process import current_process
+
+    index = getattr(current_process(), 'index', None)
+    return index if index is not None else os.getpid()
+
+
+def apply_thread_plan(plan, pin=False):
+    """Set torch, OpenMP and BLAS thread counts (and optionally the CPU affinity) in this process"""
+    import torch
+
+    for name in THREAD_ENV_VARS:
+        os.environ[name] = str(plan.intra_op)  # read by pools created from now on
+    torch.set_num_threads(plan.intra_op)
+    try:
+        torch.set_num_interop_threads(plan.inter_op)
+    except RuntimeError:
+        pass  # can only be set before the first inter-op parallel work
+    if threadpool_limits is not None:
+        threadpool_limits(plan.intra_op)
+    if pin and hasattr(os, 'sched_setaffinity'):
+        os.sched_setaffinity(0, plan.cores)
+
+
+def configure_worker_threads():
+    """worker_process_init hook: give this child its share of the node's cores"""
+    cpus = available_cpus()
+    concurrency = int(os.environ.get(CONCURRENCY_ENV) or cpus)
+    plan = plan_threads(cpus, concurrency, child_index(), allowed_cores(), settings.WORKER_TORCH_THREADS or None)
+    apply_thread_plan(plan, pin=settings.WORKER_PIN_CORES)
+    return plan
@@ -0,0 +1,141 @@
+# utils/extractive.py - CPU-only extractive summarizer (TextRank / centroid over hashed TF-IDF)
+import re
+import zlib
+
+import numpy as np
+from django.conf import settings
+
+SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*")  # CJK terminators need no space after
+WORD_RE = re.compile(r"\w{3,}")
+CJK_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff\uac00-\ud7af]")
+HASH_DIMENSIONS = 2048  # hashed vocabulary keeps the matrix size independent of the transcript
+MIN_SENTENCE_WORDS = 4
+MAX_UNIT_CHARS = 400  # longer "sentences" (unpunctuated transcripts) are cut into windows
+WINDOW_WORDS = 40
+DAMPING = 0.85
+
+
+def split_sentences(text):
+    return [sentence.strip() for sentence in SENTENCE_RE.split(text) if sentence.strip()]
+
+
+def split_long(sentence):
+    """Cut an over-long sentence into fixed word windows (character windows for unspaced scripts)"""
+    if len(sentence) <= MAX_UNIT_CHARS:
+        return [sentence]
+    words = sentence.split()
+    if len(words) > 1:
+        return [' '.join(words[i:i + WINDOW_WORDS]) for i in range(0, len(words), WINDOW_WORDS)]
+    return [sentence[i:i + MAX_UNIT_CHARS] for i in range(0, len(sentence), MAX_UNIT_CHARS)]
+
+
+def text_units(text, segments=None):
+    """
+    The pieces a summary is picked from: sentences, or the transcript's own
+    segments when the text has too little punctuation to split on, with
+    anything still over MAX_UNIT_CHARS cut into windows.
+    """
+    units = split_sentences(text)
+    if segments and any(len(unit) > MAX_UNIT_CHARS for unit in units):
+        units = [segment.strip() for segment in segments if segment.strip()]
+    return [piece for unit in units for piece in split_long(unit)]
+
+
+def tokens(sentence):
+    """Words of three or more letters; runs of CJK characters become character bigrams"""
+    for word in WORD_RE.findall(sentence.lower()):
+        if CJK_RE.search(word):
+            yield from (word[i:i + 2] for i in range(len(word) - 1))
+        else:
+            yield word
+
+
+def sparse_rows(sentences):
+    """L2-normalized TF-IDF rows as (bucket indices, weights) pairs, over hashed word buckets"""
+    counts = []
+    df = np.zeros(HASH_DIMENSIONS, dtype=np.int64)
+    for sentence in sentences:
+        buckets = [zlib.crc32(token.encode('utf-8')) % HASH_DIMENSIONS for token in tokens(sentence)]
+        cols, tf = np.unique(np.array(buckets, dtype=np.int64), return_counts=True)
+        df[cols] += 1
+        counts.append((cols, tf))
+
+    idf = (np.log((len(sentences) + 1) / (df + 1)) + 1.0).astype(np.float32)
+    rows = []
+    for cols, tf in counts:
+        weights = tf * idf[cols]
+        rows.append((cols, weights / max(float(np.linalg.norm(weights)), 1e-9)))
+    return rows
+
+
+def sentence_matrix(sentences):
+    """Dense form of sparse_rows, one row per sentence (only used below the TextRank limit)"""
+    matrix = np.zeros((len(sentences), HASH_DIMENSIONS), dtype=np.float32)
+    for row, (cols, weights) in enumerate(sparse_rows(sentences)):
+        matrix[row, cols] = weights
+    return matrix
+
+
+def textrank_scores(matrix, iterations=50, tolerance=1e-6):
+    """PageRank over the sentence cosine-similarity graph"""
+    n = len(matrix)
+    similarity = matrix @ matrix.T
+    np.fill_diagonal(similarity, 0.0)
+    totals = similarity.sum(axis=1, keepdims=True)
+    transition = np.where(totals > 0, similarity / np.maximum(totals, 1e-9), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - DAMPING) / n + DAMPING * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def centroid_scores(rows):
+    """Similarity of each sparse row to the document centroid (linear in the sentence count)"""
+    centroid = np.zeros(HASH_DIMENSIONS, dtype=np.float32)
+    for cols, weights in rows:
+        centroid[cols] += weights
+    centroid /= max(len(rows), 1)
+    return np.array([float(weights @ centroid[cols]) for cols, weights in rows], dtype=np.float32)
+
+
+def within_budget(units, order, max_chars):
+    """Take units in `order` (best first) while they fit in `max_chars`, then restore text order"""
+    picked, used = [], 0
+    for i in order:
+        if used + len(units[i]) > max_chars:
+            if not picked:  # the best unit alone is over budget: cut it at a word boundary
+                head = units[i][:max_chars]
+                return head.rsplit(' ', 1)[0] if ' ' in head else head
+            continue
+        picked.append(i)
+        used += len(units[i]) + 1
+    return ' '.join(units[i] for i in sorted(picked))
+
+
+def extractive_summary(text, max_sentences=None, segments=None, max_chars=None):
+    """
+    Pick the `max_sentences` most central sentences of `text`, in their
+    original order, within `max_chars`. Text without usable punctuation is
+    split on `segments` (the transcript segment texts) or word windows.
+    TextRank is quadratic in the sentence count, so long transcripts (over
+    SUMMARY_EXTRACTIVE_TEXTRANK_LIMIT sentences) are ranked by centroid
+    similarity instead.
+    """
+    max_sentences = max_sentences or settings.SUMMARY_EXTRACTIVE_SENTENCES
+    max_chars = max_chars or settings.SUMMARY_EXTRACTIVE_MAX_CHARS
+    sentences = text_units(text, segments)
+    candidates = [i for i, s in enumerate(sentences) if len(s.split()) >= MIN_SENTENCE_WORDS] or list(range(len(sentences)))
+    if len(candidates) <= max_sentences:
+        return within_budget(sentences, candidates, max_chars)
+
+    picked = [sentences[i] for i in candidates]
+    if len(candidates) > settings.SUMMARY_EXTRACTIVE_TEXTRANK_LIMIT:
+        scores = centroid_scores(sparse_rows(picked))
+    else:
+        scores = textrank_scores(sentence_matrix(picked))
+    best = np.argsort(-scores, kind='stable')[:max_sentences]
+    return within_budget(sentences, [candidates[i] for i in best], max_chars)
@@ -0,0 +1,149 @@
+# utils/http_cache.py - ETags, conditional GET and a version-keyed response cache
+import gzip
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from django.http import JsonResponse, HttpResponseNotModified
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.deprecation import MiddlewareMixin
+from rest_framework import status
+from rest_framework.response import Response
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+ENCODING_SUFFIXES = {'br': '-br', 'gzip': '-gzip'}
+COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def bump_content_version(video_obj):
+    """Mark a video's transcript/summary as changed (new ETags, cached responses orphaned)"""
+    from api.models import Video
+
+    Video.objects.filter(id=video_obj.id).update(content_version=F('content_version') + 1)
+    video_obj.content_version = Video.objects.values_list('content_version', flat=True).get(id=video_obj.id)
+
+
+def video_etag(video_obj, resource):
+    """
+    Strong ETag for one representation of a video: derived from every column
+    of its row, including content_version (bumped when child rows change).
+    """
+    values = [str(getattr(video_obj, field.attname)) for field in video_obj._meta.concrete_fields]
+    digest = hashlib.sha1('\x1f'.join([resource, *values]).encode('utf-8')).hexdigest()
+    return f'"{digest}"'
+
+
+def strip_encoding(etag):
+    """The representation ETag without the content-coding suffix added on compression"""
+    etag = etag.strip()
+    if etag.startswith('W/'):
+        etag = etag[2:]
+    for suffix in ENCODING_SUFFIXES.values():
+        if etag.endswith(f'{suffix}"'):
+            return etag[:-len(suffix) - 1] + '"'
+    return etag
+
+
+def etag_matches(request, etag):
+    header = request.headers.get('If-None-Match', '')
+    if not header:
+        return False
+    if header.strip() == '*':
+        return True
+    return any(strip_encoding(candidate) == etag for candidate in header.split(','))
+
+
+def response_cache_key(video_obj, resource, etag):
+    return f"video:{video_obj.id}:{resource}:{etag.strip(chr(34))}"
+
+
+def with_validators(response, etag):
+    response['ETag'] = etag
+    # Clients may keep the body but must revalidate; a 304 costs one indexed row read
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def cached_response(request, video_obj, resource, build):
+    """
+    Conditional GET for a video resource. `build` returns (data, status code)
+    and only runs when the client's copy is stale and the server-side cache
+    has no entry for the current row version.
+    """
+    etag = video_etag(video_obj, resource)
+    if etag_matches(request, etag):
+        return with_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    key = response_cache_key(video_obj, resource, etag)
+    payload = cache.get(key)
+    if payload is None:
+        payload = build()
+        cache.set(key, payload, settings.API_RESPONSE_CACHE_TIMEOUT)
+    data, code = payload
+    return with_validators(Response(data, status=code), etag)
+
+
+async def acached_response(request, video_obj, resource, build):
+    """cached_response for async views; `build` is a coroutine function"""
+    etag = video_etag(video_obj, resource)
+    if etag_matches(request, etag):
+        return with_validators(HttpResponseNotModified(), etag)
+    key = response_cache_key(video_obj, resource, etag)
+    payload = await cache.aget(key)
+    if payload is None:
+        payload = await build()
+        await cache.aset(key, payload, settings.API_RESPONSE_CACHE_TIMEOUT)
+    data, code = payload
+    return with_validators(JsonResponse(data, status=code), etag)
+
+
+def accepted_encoding(request):
+    accepted = {
+        part.split(';')[0].strip().lower()
+        for part in request.headers.get('Accept-Encoding', '').split(',')
+    }
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_response(request, response):
+    """gzip/brotli for large JSON and text bodies, keeping ETags strong per encoding"""
+    if response.streaming or response.has_header('Content-Encoding') or response.status_code != 200:
+        return response
+    if not response.get('Content-Type', '').startswith(COMPRESSIBLE_TYPES):
+        return response
+    if len(response.content) < settings.API_COMPRESSION_MIN_BYTES:
+        return response
+
+    patch_vary_headers(response, ('Accept-Encoding',))
+    encoding = accepted_encoding(request)
+    if encoding is None:
+        return response
+    if encoding == 'br':
+        compressed = brotli.compress(response.content, quality=settings.API_BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(response.content, compresslevel=settings.API_GZIP_LEVEL, mtime=0)
+    if len(compressed) >= len(response.content):
+        return response
+
+    response.content = compressed
+    response['Content-Length'] = str(len(compressed))
+    response['Content-Encoding'] = encoding
+    etag = response.get('ETag')
+    if etag and etag.endswith('"'):
+        response['ETag'] = etag[:-1] + ENCODING_SUFFIXES[encoding] + '"'
+    return response
+
+
+class CompressionMiddleware(MiddlewareMixin):
+    """Compress API responses; see compress_response. Sync and async capable."""
+
+    def process_response(self, request, response):
+        return compress_response(request, response)
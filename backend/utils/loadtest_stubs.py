@@ -0,0 +1,77 @@
+# utils/loadtest_stubs.py - Fast offline stand-ins for Whisper, ffmpeg and Groq (load testing only)
+import struct
+
+import numpy as np
+from django.conf import settings
+from whisper.audio import SAMPLE_RATE
+
+from utils.transcription_backends import StubTranscriber
+
+_originals = {}
+
+
+def load_model(name, *args, **kwargs):
+    return StubTranscriber(name, delay=settings.LOADTEST_TRANSCRIBE_DELAY)
+
+
+def decode_audio(file_path, output_path):
+    """Silence of the probed duration instead of an ffmpeg decode"""
+    import os
+    from utils.video_helper import probe_video
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    seconds = probe_video(file_path).duration or 30.0
+    partial_path = f"{output_path}.part"
+    np.zeros(int(seconds * SAMPLE_RATE), dtype=np.int16).tofile(partial_path)
+    os.replace(partial_path, output_path)
+
+
+def encode_audio_derivative(video_obj):
+    return None
+
+
+def ask_llm(language, content):
+    text = content.split('\n\n', 1)[-1]
+    return f"Summary: {text[:300]}"
+
+
+def synthetic_mp4(duration):
+    """A minimal MP4 header (ftyp + moov with one AAC track) the in-process probe understands"""
+    def box(box_type, *children):
+        body = b''.join(children)
+        return struct.pack('>I4s', 8 + len(body), box_type) + body
+
+    mvhd = box(b'mvhd', struct.pack('>IIIII', 0, 0, 0, 1000, int(duration * 1000)), b'\0' * 80)
+    mdhd = box(b'mdhd', struct.pack('>IIIII', 0, 0, 0, 44100, int(duration * 44100)), b'\0' * 4)
+    hdlr = box(b'hdlr', struct.pack('>II4s', 0, 0, b'soun'), b'\0' * 13)
+    entry = box(b'mp4a', b'\0' * 6, struct.pack('>H', 1), b'\0' * 8, struct.pack('>HHHHI', 2, 16, 0, 0, 44100 << 16))
+    stsd = box(b'stsd', struct.pack('>II', 0, 1), entry)
+    trak = box(b'trak', box(b'mdia', mdhd, hdlr, box(b'minf', box(b'stbl', stsd))))
+    # Random payload so uploads don't all dedupe into one blob
+    return box(b'ftyp', b'isom', b'\0\0\2\0') + box(b'moov', mvhd, trak) + box(b'mdat', np.random.bytes(4096))
+
+
+def install():
+    """Swap the heavy backends for stubs in this process (idempotent)"""
+    import whisper
+    from utils import summary_helper, video_helper
+
+    targets = [
+        (whisper, 'load_model', load_model),
+        (video_helper, 'decode_audio', decode_audio),
+        (video_helper, 'encode_audio_derivative', encode_audio_derivative),
+        (summary_helper, 'ask_llm', ask_llm),
+    ]
+    for module, name, stub in targets:
+        _originals.setdefault((module, name), getattr(module, name))
+        setattr(module, name, stub)
+    video_helper.load_whisper_model.cache_clear()
+
+
+def uninstall():
+    from utils import video_helper
+
+    for (module, name), original in _originals.items():
+        setattr(module, name, original)
+    _originals.clear()
+    video_helper.load_whisper_model.cache_clear()
@@ -0,0 +1,85 @@
+"""
+Compare transcription backends on a fixed local sample set: real-time factor and WER.
+
+    python manage.py bench_backends samples/ --model base
+    python manage.py bench_backends samples/ --model small --backends whisper whisper-int8 --language en
+
+The sample directory holds audio/video files, each with a reference transcript
+next to it (lecture.mp3 + lecture.txt). RTF is processing seconds per second of
+audio (lower is faster); WER is computed over the whole set.
+"""
+import os
+import time
+
+import whisper
+from django.core.management.base import BaseCommand, CommandError
+from whisper.audio import SAMPLE_RATE
+
+from utils.transcription_backends import BACKENDS, load_backend, normalize_words, word_error_rate
+
+REFERENCE_EXTENSION = '.txt'
+
+
+def load_samples(directory):
+    """(name, audio, reference text) for every file that has a reference transcript"""
+    samples = []
+    for filename in sorted(os.listdir(directory)):
+        stem, extension = os.path.splitext(filename)
+        reference_path = os.path.join(directory, stem + REFERENCE_EXTENSION)
+        if extension == REFERENCE_EXTENSION or not os.path.exists(reference_path):
+            continue
+        with open(reference_path, encoding='utf-8') as f:
+            reference = f.read()
+        samples.append((filename, whisper.load_audio(os.path.join(directory, filename)), reference))
+    return samples
+
+
+class Command(BaseCommand):
+    help = "Benchmark real-time factor and word error rate of the transcription backends"
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', help='Sample set: media files with same-named .txt references')
+        parser.add_argument('--model', default='base')
+        parser.add_argument('--backends', nargs='*', default=['whisper', 'whisper-int8'], choices=list(BACKENDS))
+        parser.add_argument('--language', default=None, help='Pin the language instead of detecting it')
+
+    def handle(self, *args, **options):
+        if not os.path.isdir(options['directory']):
+            raise CommandError(f"{options['directory']} is not a directory")
+        samples = load_samples(options['directory'])
+        if not samples:
+            raise CommandError(f"No media files with {REFERENCE_EXTENSION} references in {options['directory']}")
+        audio_seconds = sum(len(audio) for _, audio, _ in samples) / SAMPLE_RATE
+        reference_words = sum(len(normalize_words(reference)) for _, _, reference in samples)
+        self.stdout.write(f"{len(samples)} samples, {audio_seconds:.0f}s audio, {reference_words} reference words, "
+                          f"model={options['model']}")
+
+        rows = []
+        for backend in options['backends']:
+            started = time.perf_counter()
+            engine = load_backend(backend, options['model'])
+            load_seconds = time.perf_counter() - started
+            engine.transcribe(samples[0][1][:SAMPLE_RATE * 5], language=options['language'])  # warm up
+
+            elapsed = 0.0
+            errors = 0.0
+            for name, audio, reference in samples:
+                started = time.perf_counter()
+                result = engine.transcribe(audio, language=options['language'])
+                seconds = time.perf_counter() - started
+                elapsed += seconds
+                wer = word_error_rate(reference, result['text'])
+                errors += wer * len(normalize_words(reference))
+                if options['verbosity'] > 1:
+                    self.stdout.write(f"  {backend:<14} {name:<30} RTF {seconds / (len(audio) / SAMPLE_RATE):.3f}  WER {wer:.1%}")
+
+            rtf = elapsed / audio_seconds
+            wer = errors / max(1, reference_words)
+            rows.append((backend, rtf, wer))
+            self.stdout.write(f"{backend:<14} load {load_seconds:6.1f}s  RTF {rtf:.3f}  WER {wer:6.1%}")
+
+        fastest = min(rows, key=lambda row: row[1])
+        most_accurate = min(rows, key=lambda row: row[2])
+        self.stdout.write(self.style.SUCCESS(
+            f"Fastest: {fastest[0]} (RTF {fastest[1]:.3f}); most accurate: {most_accurate[0]} (WER {most_accurate[2]:.1%})"
+        ))
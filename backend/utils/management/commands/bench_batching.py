@@ -0,0 +1,50 @@
+"""
+Compare clips/second for one-at-a-time vs cross-video batched transcription.
+
+    python manage.py bench_batching --model tiny --clips 16
+    python manage.py bench_batching --model base clip1.mp4 clip2.mp4 ...
+"""
+import time
+
+import numpy as np
+import torch
+import whisper
+from django.core.management.base import BaseCommand
+from whisper.audio import SAMPLE_RATE
+
+from utils.video_helper import load_whisper_model, transcribe_audio_batch
+
+
+class Command(BaseCommand):
+    help = "Benchmark batched short-clip transcription against batch size 1"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='*', help='Short audio/video files (synthetic audio if omitted)')
+        parser.add_argument('--model', default='tiny')
+        parser.add_argument('--clips', type=int, default=16, help='Number of synthetic clips')
+        parser.add_argument('--seconds', type=float, default=20.0, help='Length of each synthetic clip')
+        parser.add_argument('--batch-size', type=int, default=8)
+
+    def handle(self, *args, **options):
+        model = load_whisper_model(options['model'])
+        if options['files']:
+            audios = [whisper.load_audio(path) for path in options['files']]
+        else:
+            rng = np.random.default_rng(0)
+            samples = int(options['seconds'] * SAMPLE_RATE)
+            audios = [(rng.standard_normal(samples) * 0.05).astype(np.float32) for _ in range(options['clips'])]
+
+        threads = torch.get_num_threads()
+        self.stdout.write(f"{len(audios)} clips, model={options['model']}, torch threads={threads}")
+
+        # Warm up so the first measurement doesn't include lazy initialisation
+        transcribe_audio_batch(model, audios[:1], batch_size=1)
+
+        for label, batch_size in (('sequential', 1), ('batched', options['batch_size'])):
+            start = time.perf_counter()
+            transcribe_audio_batch(model, audios, batch_size=batch_size)
+            elapsed = time.perf_counter() - start
+            rate = len(audios) / elapsed
+            self.stdout.write(
+                f"{label:>10}: {elapsed:7.2f}s  {rate:6.2f} clips/s  {rate / threads:6.3f} clips/s/core"
+            )
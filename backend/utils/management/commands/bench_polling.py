@@ -0,0 +1,80 @@
+"""
+Compare p99 latency of status/list polling between the WSGI and ASGI deployments.
+
+Start both servers against the same database, e.g.
+
+    gunicorn settings.wsgi --workers 2 --threads 8 --bind 127.0.0.1:8000
+    uvicorn settings.asgi:application --workers 2 --port 8001
+
+then run
+
+    python manage.py bench_polling --token <access token> --video 1 --concurrency 10 50 200 500
+"""
+import asyncio
+import time
+
+import httpx
+import numpy as np
+from django.core.management.base import BaseCommand
+
+
+async def run_level(base_url, paths, token, concurrency, duration):
+    """Hold `concurrency` connections polling `paths` for `duration` seconds"""
+    latencies = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0,
+                                 headers={'Authorization': f'Bearer {token}'}) as client:
+        async def poller(index):
+            nonlocal errors
+            request_number = index
+            while time.perf_counter() < deadline:
+                path = paths[request_number % len(paths)]
+                request_number += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.get(path)
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(poller(i) for i in range(concurrency)))
+    return latencies, errors
+
+
+class Command(BaseCommand):
+    help = "Load-test the sync (WSGI) and async (ASGI) read endpoints at increasing concurrency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--wsgi-url', default='http://127.0.0.1:8000')
+        parser.add_argument('--asgi-url', default='http://127.0.0.1:8001')
+        parser.add_argument('--token', required=True, help='JWT access token of an existing user')
+        parser.add_argument('--video', type=int, required=True, help='Video id owned by that user')
+        parser.add_argument('--task', default='missing-task', help='Task id to poll for status')
+        parser.add_argument('--concurrency', type=int, nargs='+', default=[10, 50, 100, 200])
+        parser.add_argument('--duration', type=float, default=10.0, help='Seconds per concurrency level')
+
+    def handle(self, *args, **options):
+        video, task = options['video'], options['task']
+        endpoints = ['videos/', f'video/{video}/', f'video/{video}/summary/', f'task/{task}/status/']
+        deployments = [
+            ('wsgi', options['wsgi_url'], [f'/api/{path}' for path in endpoints]),
+            ('asgi', options['asgi_url'], [f'/api/async/{path}' for path in endpoints]),
+        ]
+
+        self.stdout.write(f"{'server':>6} {'conns':>6} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for concurrency in options['concurrency']:
+            for name, base_url, paths in deployments:
+                latencies, errors = asyncio.run(
+                    run_level(base_url, paths, options['token'], concurrency, options['duration'])
+                )
+                if not latencies:
+                    self.stdout.write(f"{name:>6} {concurrency:>6} {'no successful requests':>26}")
+                    continue
+                p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+                rate = len(latencies) / options['duration']
+                self.stdout.write(f"{name:>6} {concurrency:>6} {rate:>8.0f} {p50:>8.1f} {p99:>8.1f} {errors:>7}")
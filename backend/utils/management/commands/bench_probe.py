@@ -0,0 +1,58 @@
+"""
+Compare per-file metadata probe latency: in-process header parser vs ffprobe.
+
+    python manage.py bench_probe uploads/*.mp4 uploads/*.webm --repeat 20
+"""
+import shutil
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.media_probe import probe, ProbeError
+from utils.video_helper import ffprobe_media
+
+
+def timed(func, path, repeat):
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func(path)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+class Command(BaseCommand):
+    help = "Benchmark container header parsing against the ffprobe subprocess"
+
+    def add_arguments(self, parser):
+        parser.add_argument('files', nargs='+', help='MP4/MOV/WebM/MKV files to probe')
+        parser.add_argument('--repeat', type=int, default=10)
+
+    def handle(self, *args, **options):
+        has_ffprobe = shutil.which('ffprobe') is not None
+        if not has_ffprobe:
+            self.stdout.write("ffprobe not found on PATH; timing the header parser only")
+
+        parser_times, ffprobe_times = [], []
+        self.stdout.write(f"{'file':<40} {'parser ms':>10} {'ffprobe ms':>11} {'duration':>10}")
+        for path in options['files']:
+            try:
+                info = probe(path)
+            except (ProbeError, OSError) as e:
+                self.stdout.write(f"{path:<40} unsupported by the header parser ({e})")
+                continue
+            parsed = timed(probe, path, options['repeat'])
+            parser_times.extend(parsed)
+            forked = timed(ffprobe_media, path, options['repeat']) if has_ffprobe else []
+            ffprobe_times.extend(forked)
+            ffprobe_ms = f"{np.median(forked) * 1000:>11.2f}" if forked else f"{'-':>11}"
+            self.stdout.write(f"{path[-40:]:<40} {np.median(parsed) * 1000:>10.3f} {ffprobe_ms} {info.duration:>9.1f}s")
+
+        if not parser_times:
+            raise CommandError("No file could be parsed")
+        summary = f"median per file: parser {np.median(parser_times) * 1000:.3f} ms"
+        if ffprobe_times:
+            speedup = np.median(ffprobe_times) / np.median(parser_times)
+            summary += f", ffprobe {np.median(ffprobe_times) * 1000:.2f} ms ({speedup:.0f}x)"
+        self.stdout.write(summary)
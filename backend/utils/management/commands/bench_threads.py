@@ -0,0 +1,110 @@
+"""
+Find the best worker split (processes x torch threads) for a transcription workload.
+
+    python manage.py bench_threads --model base --seconds 60
+    python manage.py bench_threads --model small --splits 1x8 2x4 4x2 8x1 lecture.mp4
+
+Each split runs its processes in parallel on the same audio; throughput is
+seconds of audio transcribed per wall-clock second (higher is better).
+Use the winning split as `celery worker --concurrency P` with WORKER_TORCH_THREADS=T.
+"""
+import multiprocessing
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand, CommandError
+
+from utils.cpu_topology import available_cpus, cgroup_cpu_limit
+
+SAMPLE_RATE = 16000
+
+
+def default_splits(cpus):
+    """Every (processes, threads) pair that uses all cores exactly"""
+    return [(p, cpus // p) for p in range(1, cpus + 1) if cpus % p == 0]
+
+
+def parse_split(value):
+    try:
+        processes, threads = (int(part) for part in value.lower().split('x'))
+    except ValueError:
+        raise CommandError(f"Invalid split '{value}'; use PxT, e.g. 2x4")
+    return processes, threads
+
+
+def run_child(model_name, audio_path, seconds, threads, repeats, barrier, results):
+    """One benchmark process: load the model, wait for the others, then time the transcriptions"""
+    import torch
+    import whisper
+
+    torch.set_num_threads(threads)
+    torch.set_num_interop_threads(1)
+    model = whisper.load_model(model_name)
+    if audio_path:
+        audio = whisper.load_audio(audio_path)[:int(seconds * SAMPLE_RATE)]
+    else:
+        rng = np.random.default_rng(0)
+        audio = (rng.standard_normal(int(seconds * SAMPLE_RATE)) * 0.05).astype(np.float32)
+    model.transcribe(audio[:SAMPLE_RATE * 5], language='en')  # warm up
+
+    barrier.wait()
+    started = time.perf_counter()
+    for _ in range(repeats):
+        model.transcribe(audio, language='en')
+    results.put((time.perf_counter() - started, len(audio) / SAMPLE_RATE * repeats))
+
+
+class Command(BaseCommand):
+    help = "Benchmark processes x torch-threads splits for Whisper workers"
+
+    def add_arguments(self, parser):
+        parser.add_argument('file', nargs='?', help='Audio/video file (synthetic audio if omitted)')
+        parser.add_argument('--model', default='tiny')
+        parser.add_argument('--seconds', type=float, default=60.0, help='Audio per transcription')
+        parser.add_argument('--repeats', type=int, default=2, help='Transcriptions per process')
+        parser.add_argument('--splits', nargs='*', default=None, help='PxT pairs (default: all exact splits)')
+
+    def handle(self, *args, **options):
+        cpus = available_cpus()
+        limit = cgroup_cpu_limit()
+        self.stdout.write(
+            f"{cpus} usable cores" + (f" (cgroup quota {limit:.2f})" if limit else "")
+            + f", model={options['model']}, {options['seconds']:.0f}s audio x {options['repeats']}"
+        )
+        splits = [parse_split(s) for s in options['splits']] if options['splits'] else default_splits(cpus)
+
+        # spawn: forking after torch has started its thread pools can deadlock
+        context = multiprocessing.get_context('spawn')
+        best = None
+        for processes, threads in splits:
+            barrier = context.Barrier(processes)
+            results = context.Queue()
+            children = [
+                context.Process(target=run_child, args=(
+                    options['model'], options['file'], options['seconds'], threads,
+                    options['repeats'], barrier, results,
+                ))
+                for _ in range(processes)
+            ]
+            for child in children:
+                child.start()
+            measured = [results.get() for _ in children]
+            for child in children:
+                child.join()
+
+            wall = max(elapsed for elapsed, _ in measured)
+            audio = sum(seconds for _, seconds in measured)
+            throughput = audio / wall
+            oversubscribed = ' (oversubscribed)' if processes * threads > cpus else ''
+            self.stdout.write(
+                f"{processes:>3} x {threads:<3} {wall:8.2f}s wall  {throughput:7.2f} audio s/s"
+                f"  {throughput / (processes * threads):6.3f} per thread{oversubscribed}"
+            )
+            if best is None or throughput > best[2]:
+                best = (processes, threads, throughput)
+
+        processes, threads, throughput = best
+        self.stdout.write(self.style.SUCCESS(
+            f"Best: {processes} processes x {threads} threads ({throughput:.2f} audio s/s): "
+            f"celery worker --concurrency {processes} with WORKER_TORCH_THREADS={threads}"
+        ))
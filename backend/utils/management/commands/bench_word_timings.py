@@ -0,0 +1,103 @@
+"""
+Compare packed word timings with a JSON encoding: stored size, encode time and range-query time.
+
+    python manage.py bench_word_timings
+    python manage.py bench_word_timings --segments 20000 --words 30 --queries 500
+
+Synthetic transcript: `--segments` segments of `--words` words each (about
+0.4 s per word). A query asks for the words in a random 10 s window, the
+click-to-seek / highlight workload.
+"""
+import json
+import random
+import time
+from bisect import bisect_right
+
+from django.core.management.base import BaseCommand
+
+from utils.word_timings import pack_words, segment_words
+
+WORD_SECONDS = 0.4
+QUERY_SECONDS = 10.0
+
+
+def synthetic_segments(count, words_per_segment, rng):
+    segments = []
+    t = 0.0
+    for _ in range(count):
+        words = []
+        for _ in range(words_per_segment):
+            length = WORD_SECONDS * rng.uniform(0.5, 1.5)
+            words.append({'word': ' ' + ''.join(rng.choices('abcdefghijklmnopqrstuvwxyz', k=rng.randint(2, 9))),
+                          'start': t, 'end': t + length})
+            t += length
+        text = ''.join(word['word'] for word in words).strip()
+        segments.append((words[0]['start'], words[-1]['end'], text, words))
+    return segments
+
+
+def json_words(words):
+    return json.dumps([[round(w['start'] * 1000), round(w['end'] * 1000), w['word'].strip()] for w in words])
+
+
+def json_range(encoded, start_ms, end_ms):
+    return [(s, e, word) for s, e, word in json.loads(encoded) if e > start_ms and s < end_ms]
+
+
+class Command(BaseCommand):
+    help = "Benchmark packed uint32 word timings against JSON"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--segments', type=int, default=5000)
+        parser.add_argument('--words', type=int, default=25, help='Words per segment')
+        parser.add_argument('--queries', type=int, default=200)
+        parser.add_argument('--seed', type=int, default=0)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        segments = synthetic_segments(options['segments'], options['words'], rng)
+        total_words = options['segments'] * options['words']
+        duration = segments[-1][1]
+        self.stdout.write(f"{options['segments']} segments, {total_words} words, {duration / 3600:.1f} h of speech")
+
+        started = time.perf_counter()
+        packed = [(start, end, text, pack_words(words, text)) for start, end, text, words in segments]
+        packed_encode = time.perf_counter() - started
+        started = time.perf_counter()
+        encoded = [(start, end, text, json_words(words)) for start, end, text, words in segments]
+        json_encode = time.perf_counter() - started
+
+        segment_ends = [end for _, end, _, _ in segments]
+        queries = [rng.uniform(0, duration - QUERY_SECONDS) for _ in range(options['queries'])]
+        timings = {}
+        results = {}
+        for name, rows, lookup in (
+            ('packed', packed, lambda value, text, a, b: segment_words(value, text, a, b)),
+            ('json', encoded, lambda value, text, a, b: json_range(value, round(a * 1000), round(b * 1000))),
+        ):
+            started = time.perf_counter()
+            found = 0
+            for query in queries:
+                # Bisecting on segment ends stands in for the indexed start_time/end_time filter
+                index = bisect_right(segment_ends, query)
+                while index < len(rows) and rows[index][0] < query + QUERY_SECONDS:
+                    _, _, text, value = rows[index]
+                    found += len(lookup(value, text, query, query + QUERY_SECONDS))
+                    index += 1
+            timings[name] = time.perf_counter() - started
+            results[name] = found
+
+        packed_bytes = sum(len(value) for *_, value in packed)
+        json_bytes = sum(len(value.encode('utf-8')) for *_, value in encoded)
+        per_query = 1000 / len(queries)
+        self.stdout.write(f"{'':8} {'bytes':>12} {'bytes/word':>11} {'encode s':>9} {'ms/query':>9}")
+        self.stdout.write(f"{'packed':8} {packed_bytes:12,d} {packed_bytes / total_words:11.1f} "
+                          f"{packed_encode:9.2f} {timings['packed'] * per_query:9.3f}")
+        self.stdout.write(f"{'json':8} {json_bytes:12,d} {json_bytes / total_words:11.1f} "
+                          f"{json_encode:9.2f} {timings['json'] * per_query:9.3f}")
+        if results['packed'] != results['json']:
+            self.stdout.write(self.style.WARNING(f"Result mismatch: {results['packed']} vs {results['json']} words"))
+        self.stdout.write(self.style.SUCCESS(
+            f"Packed is {json_bytes / packed_bytes:.1f}x smaller (timings only, text stored once) "
+            f"and {timings['json'] / max(timings['packed'], 1e-9):.1f}x faster per range query"
+        ))
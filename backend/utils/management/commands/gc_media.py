@@ -0,0 +1,29 @@
+"""
+Delete media blobs no video references any more, plus orphaned upload files.
+
+    python manage.py gc_media --dry-run
+"""
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.storage import collect_garbage
+
+
+class Command(BaseCommand):
+    help = "Garbage-collect unreferenced media files and report the space freed"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Report what would be deleted')
+        parser.add_argument('--min-age', type=int, default=settings.MEDIA_GC_MIN_AGE,
+                            help='Never delete blobs or orphan files written less than this many seconds ago')
+        parser.add_argument('--include-legacy', action='store_true',
+                            help='Also sweep unreferenced files under videos/ (pre content-addressing)')
+
+    def handle(self, *args, **options):
+        files, freed = collect_garbage(
+            dry_run=options['dry_run'],
+            min_age=options['min_age'],
+            include_legacy=options['include_legacy'],
+        )
+        verb = 'Would free' if options['dry_run'] else 'Freed'
+        self.stdout.write(f"{verb} {freed / 1024 / 1024:.1f} MiB in {files} files")
@@ -0,0 +1,216 @@
+"""
+HTTP load generator: synthetic users driving a realistic traffic mix against
+a running server, reporting p50/p95/p99 latency and errors per endpoint.
+
+Fully offline with the stubbed settings module (eager Celery, in-memory
+broker and cache, stub Whisper/ffmpeg/Groq):
+
+    python manage.py loadtest --settings=settings.loadtest --serve --users 50 --duration 60
+
+or against a separately started server (any settings):
+
+    python manage.py migrate --settings=settings.loadtest
+    uvicorn settings.asgi:application --env-file ... (DJANGO_SETTINGS_MODULE=settings.loadtest)
+    python manage.py loadtest --url http://127.0.0.1:8000 --users 50
+"""
+import asyncio
+import random
+from collections import Counter
+import threading
+import time
+import uuid
+
+import httpx
+import numpy as np
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from utils.loadtest_stubs import synthetic_mp4
+
+# Relative weights of what a signed-in user does next
+DEFAULT_MIX = {
+    'upload': 1,
+    'list': 4,
+    'status': 8,
+    'detail': 2,
+    'transcript': 3,
+}
+
+
+class Stats:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+
+    def record(self, endpoint, seconds, ok):
+        self.latencies.setdefault(endpoint, []).append(seconds)
+        if not ok:
+            self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def rows(self, duration):
+        for endpoint in sorted(self.latencies):
+            samples = self.latencies[endpoint]
+            p50, p95, p99 = np.percentile(samples, [50, 95, 99]) * 1000
+            yield endpoint, len(samples), len(samples) / duration, p50, p95, p99, self.errors.get(endpoint, 0)
+
+
+class VirtualUser:
+    def __init__(self, client, stats, rng, mix, video_seconds, think_time):
+        self.client = client
+        self.stats = stats
+        self.rng = rng
+        self.mix = mix
+        self.video_seconds = video_seconds
+        self.think_time = think_time
+        self.headers = {}
+        self.videos = []  # (video id, task id)
+
+    async def call(self, endpoint, method, url, ok_statuses=(200, 201), **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await self.client.request(method, url, headers=self.headers, **kwargs)
+        except httpx.HTTPError:
+            self.stats.record(endpoint, time.perf_counter() - started, False)
+            return None
+        self.stats.record(endpoint, time.perf_counter() - started, response.status_code in ok_statuses)
+        return response
+
+    async def sign_in(self):
+        username = f"load-{uuid.uuid4().hex[:12]}"
+        password = 'Load-test-pw-1'
+        await self.call('signup', 'POST', '/api/signup/', json={
+            'username': username, 'email': f'{username}@example.com',
+            'first_name': 'Load', 'last_name': 'Test', 'password': password,
+        })
+        response = await self.call('authenticate', 'POST', '/api/authenticate/',
+                                   json={'username': username, 'password': password})
+        if response is None or response.status_code != 200:
+            return False
+        self.headers = {'Authorization': f"Bearer {response.json()['id_token']}"}
+        return True
+
+    async def upload(self):
+        seconds = self.rng.uniform(*self.video_seconds)
+        response = await self.call('upload', 'POST', '/api/video/upload', data={'title': 'Load test clip'},
+                                   files={'file': ('clip.mp4', synthetic_mp4(seconds), 'video/mp4')})
+        if response is not None and response.status_code == 201:
+            body = response.json()
+            self.videos.append((body['id'], body['task_id']))
+
+    async def run(self, deadline):
+        if not await self.sign_in():
+            return
+        while time.perf_counter() < deadline:
+            action = self.rng.choices(list(self.mix), weights=list(self.mix.values()))[0]
+            if action != 'upload' and action != 'list' and not self.videos:
+                action = 'upload'
+            if action == 'upload':
+                await self.upload()
+            elif action == 'list':
+                await self.call('list', 'GET', '/api/videos/')
+            else:
+                video_id, task_id = self.rng.choice(self.videos)
+                if action == 'status':
+                    await self.call('status', 'GET', f'/api/task/{task_id}/status/')
+                elif action == 'detail':
+                    await self.call('detail', 'GET', f'/api/video/{video_id}/')
+                else:
+                    # 404 just means "not transcribed yet"
+                    await self.call('transcript', 'GET', f'/api/video/{video_id}/transcript/',
+                                    ok_statuses=(200, 404))
+            if self.think_time:
+                await asyncio.sleep(self.rng.expovariate(1 / self.think_time))
+
+
+async def drive(url, users, duration, ramp_up, mix, video_seconds, think_time, seed):
+    stats = Stats()
+    limits = httpx.Limits(max_connections=users, max_keepalive_connections=users)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        deadline = time.perf_counter() + duration
+
+        async def start(index):
+            await asyncio.sleep(ramp_up * index / max(1, users))
+            rng = random.Random(seed + index)
+            await VirtualUser(client, stats, rng, mix, video_seconds, think_time).run(deadline)
+
+        await asyncio.gather(*(start(i) for i in range(users)))
+    return stats
+
+
+def serve(port):
+    """Threaded Django dev server in a daemon thread (dies with the command)"""
+    from django.core.servers.basehttp import run
+    from django.core.wsgi import get_wsgi_application
+
+    thread = threading.Thread(
+        target=run, args=('127.0.0.1', port, get_wsgi_application()),
+        kwargs={'threading': True}, daemon=True,
+    )
+    thread.start()
+    for _ in range(50):
+        try:
+            httpx.get(f'http://127.0.0.1:{port}/api/videos/', timeout=1.0)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise CommandError("Embedded server did not start")
+
+
+class Command(BaseCommand):
+    help = "Load-test the API with synthetic users and report latency percentiles per endpoint"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--url', default='http://127.0.0.1:8000')
+        parser.add_argument('--serve', action='store_true',
+                            help='Start an embedded threaded server on --port (offline settings only)')
+        parser.add_argument('--port', type=int, default=8765)
+        parser.add_argument('--users', type=int, default=20, help='Concurrent virtual users')
+        parser.add_argument('--duration', type=float, default=30.0, help='Seconds of load')
+        parser.add_argument('--ramp-up', type=float, default=5.0, help='Seconds to start all users')
+        parser.add_argument('--think-time', type=float, default=0.5, help='Mean pause between requests')
+        parser.add_argument('--video-seconds', type=float, nargs=2, default=[20.0, 120.0],
+                            metavar=('MIN', 'MAX'), help='Duration range of synthetic uploads')
+        parser.add_argument('--mix', nargs='+', default=[],
+                            help='Override action weights, e.g. --mix upload=2 status=10')
+        parser.add_argument('--seed', type=int, default=1)
+
+    def handle(self, *args, **options):
+        mix = dict(DEFAULT_MIX)
+        for item in options['mix']:
+            name, _, weight = item.partition('=')
+            if name not in mix or not weight.replace('.', '', 1).isdigit():
+                raise CommandError(f"Invalid --mix entry '{item}' (actions: {', '.join(mix)})")
+            mix[name] = float(weight)
+
+        url = options['url']
+        if options['serve']:
+            if not getattr(settings, 'LOADTEST_STUB_BACKENDS', False):
+                raise CommandError("--serve only runs with the offline settings: --settings=settings.loadtest")
+            call_command('migrate', verbosity=0)
+            serve(options['port'])
+            url = f"http://127.0.0.1:{options['port']}"
+
+        self.stdout.write(f"{options['users']} users for {options['duration']:.0f}s against {url}")
+        started = timezone.now()
+        stats = asyncio.run(drive(
+            url, options['users'], options['duration'], options['ramp_up'], mix,
+            tuple(options['video_seconds']), options['think_time'], options['seed'],
+        ))
+
+        self.stdout.write(f"{'endpoint':<13} {'count':>7} {'req/s':>7} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}")
+        for endpoint, count, rate, p50, p95, p99, errors in stats.rows(options['duration']):
+            self.stdout.write(f"{endpoint:<13} {count:>7} {rate:>7.1f} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {errors:>7}")
+        if options['serve']:
+            self.report_processing(started)
+
+    def report_processing(self, since):
+        """Where this run's uploads ended up; the embedded server processes them in-process"""
+        from api.models import Video
+
+        statuses = Counter(Video.objects.filter(uploaded_at__gte=since).values_list('status', flat=True))
+        done = statuses.pop('completed', 0)
+        total = done + sum(statuses.values())
+        line = f"Videos processed: {done}/{total}" + ''.join(f", {status}={n}" for status, n in sorted(statuses.items()))
+        self.stdout.write(line if done == total else self.style.WARNING(line))
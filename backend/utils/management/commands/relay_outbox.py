@@ -0,0 +1,46 @@
+"""
+Publish outbox messages to the Celery broker.
+
+    python manage.py relay_outbox            # run forever next to the web servers
+    python manage.py relay_outbox --once     # drain what is pending and exit
+
+Uploads only write outbox rows; this relay sends them in batches of
+OUTBOX_RELAY_BATCH, so upload latency never depends on the broker and a
+broker outage only delays processing until it is back.
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.outbox import relay_outbox, prune_outbox
+
+PRUNE_EVERY = 600  # seconds
+
+
+class Command(BaseCommand):
+    help = "Relay pending outbox messages to the Celery broker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='Drain the outbox once and exit')
+        parser.add_argument('--batch', type=int, default=None, help='Messages per relay run (default OUTBOX_RELAY_BATCH)')
+        parser.add_argument('--interval', type=float, default=None,
+                            help='Idle poll interval in seconds (default OUTBOX_RELAY_INTERVAL)')
+
+    def handle(self, *args, **options):
+        interval = options['interval'] or settings.OUTBOX_RELAY_INTERVAL
+        total = 0
+        pruned_at = 0.0
+        while True:
+            published = relay_outbox(options['batch'])
+            total += published
+            if published and options['verbosity'] > 1:
+                self.stdout.write(f"Published {published} messages")
+            if time.monotonic() - pruned_at > PRUNE_EVERY:
+                prune_outbox()
+                pruned_at = time.monotonic()
+            if not published:
+                if options['once']:
+                    break
+                time.sleep(interval)  # full batches are followed by another one at once
+        self.stdout.write(self.style.SUCCESS(f"Published {total} messages"))
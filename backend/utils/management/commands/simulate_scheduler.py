@@ -0,0 +1,72 @@
+"""
+Simulate FIFO vs fair-share/SJF dispatch on synthetic arrival mixes.
+
+    python manage.py simulate_scheduler --workers 2 --scenario bulk
+"""
+import random
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from utils.scheduler import Job, simulate
+
+
+def bulk_scenario(rng):
+    """One user uploads fifty 1-hour videos at once while others trickle in short clips"""
+    jobs = [Job(i, 'bulk', 3600.0, 0.0) for i in range(50)]
+    t = 0.0
+    for i in range(200):
+        t += rng.expovariate(1 / 120.0)
+        jobs.append(Job(1000 + i, f'user{rng.randint(1, 20)}', rng.uniform(30, 300), t))
+    return jobs
+
+
+def mixed_scenario(rng):
+    """Poisson arrivals from many users with log-normal durations"""
+    jobs = []
+    t = 0.0
+    for i in range(400):
+        t += rng.expovariate(1 / 90.0)
+        duration = min(4 * 3600.0, rng.lognormvariate(5.5, 1.2))
+        jobs.append(Job(i, f'user{rng.randint(1, 30)}', duration, t))
+    return jobs
+
+
+SCENARIOS = {
+    'bulk': bulk_scenario,
+    'mixed': mixed_scenario,
+}
+
+
+class Command(BaseCommand):
+    help = "Report p50/p95 turnaround for FIFO and fair-share/SJF scheduling"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scenario', choices=sorted(SCENARIOS), action='append')
+        parser.add_argument('--workers', type=int, default=settings.SCHEDULER_MAX_IN_FLIGHT)
+        parser.add_argument('--rtf', type=float, default=settings.WHISPER_REALTIME_FACTORS['base'],
+                            help='Processing seconds per second of audio')
+        parser.add_argument('--aging-rate', type=float, default=settings.SCHEDULER_AGING_RATE)
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        for name in options['scenario'] or sorted(SCENARIOS):
+            jobs = SCENARIOS[name](random.Random(options['seed']))
+            by_id = {job.id: job for job in jobs}
+            self.stdout.write(f"\n{name}: {len(jobs)} jobs, {options['workers']} workers, rtf={options['rtf']}")
+            self.stdout.write(f"{'policy':>8} {'group':>6} {'p50':>10} {'p95':>10} {'max':>10}")
+            for policy in ('fifo', 'fair'):
+                turnaround = simulate(jobs, policy, options['workers'], options['rtf'], options['aging_rate'])
+                groups = {
+                    'all': list(turnaround.values()),
+                    'short': [t for i, t in turnaround.items() if by_id[i].duration <= 300],
+                    'long': [t for i, t in turnaround.items() if by_id[i].duration > 300],
+                }
+                for group, values in groups.items():
+                    if not values:
+                        continue
+                    p50, p95 = np.percentile(values, [50, 95])
+                    self.stdout.write(
+                        f"{policy:>8} {group:>6} {p50:>9.0f}s {p95:>9.0f}s {max(values):>9.0f}s"
+                    )
@@ -0,0 +1,113 @@
+"""
+Per-child memory and cold-start time of prefork workers, with and without shared model weights.
+
+    python manage.py worker_memory_report --model base --children 4
+    python manage.py worker_memory_report --model small --backend whisper-int8 --modes private preload
+
+Modes: `private` (each child loads its own copy, the default worker setup),
+`preload` (WORKER_PRELOAD_MODELS: loaded in the parent, shared copy-on-write)
+and `mmap` (WHISPER_MMAP_WEIGHTS: weights mapped from the checkpoint file).
+USS is memory only that child holds; PSS splits shared pages between their
+users, so the PSS total is what the worker really costs the host.
+"""
+import multiprocessing
+import os
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+MODES = ['private', 'preload', 'mmap']
+SAMPLE_RATE = 16000
+MB = 1024 * 1024
+
+
+def warm_up(engine):
+    """One short decode so every layer's weights are actually touched"""
+    import whisper
+    from utils.transcription_backends import supports_batching
+
+    audio = np.zeros(SAMPLE_RATE, dtype=np.float32)
+    if supports_batching(engine):
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), engine.dims.n_mels).to(engine.device)
+        options = whisper.DecodingOptions(language='en', without_timestamps=True, fp16=False, sample_len=8)
+        whisper.decode(engine, mel, options)
+    else:
+        engine.transcribe(audio, language='en')
+
+
+def run_child(model_name, backend, ready, release):
+    """A forked pool child: get the model (a cache hit when preloaded), use it, report, then wait"""
+    import torch
+    from utils.video_helper import load_whisper_model
+
+    started = time.monotonic()
+    torch.set_num_threads(1)
+    warm_up(load_whisper_model(model_name, backend))
+    ready.put((os.getpid(), time.monotonic() - started))
+    release.wait()  # stay alive until the parent has read our memory
+
+
+def run_mode(mode, model_name, backend, children, results):
+    """A fresh worker parent (spawned, so modes don't share state) that forks `children` children"""
+    import django
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings.settings')
+    django.setup()
+    from django.conf import settings
+    from utils.worker_memory import preload_models, memory_usage
+    import api.tasks  # noqa: F401 - a Celery parent imports the task modules (and torch) before forking
+
+    settings.WHISPER_MMAP_WEIGHTS = mode == 'mmap'
+    parent_load = preload_models([(model_name, backend)]) if mode == 'preload' else 0.0
+
+    context = multiprocessing.get_context('fork')
+    ready = context.Queue()
+    release = context.Event()
+    processes = [context.Process(target=run_child, args=(model_name, backend, ready, release)) for _ in range(children)]
+    for process in processes:
+        process.start()
+    cold_starts = dict(ready.get() for _ in processes)
+    usage = [(cold_starts[pid], memory_usage(pid)) for pid in cold_starts]
+    parent = memory_usage()
+    release.set()
+    for process in processes:
+        process.join()
+    results.put((mode, parent_load, parent, usage))
+
+
+class Command(BaseCommand):
+    help = "Report per-child USS/PSS and cold-start time for private, preloaded and mmap'd model weights"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default='base', help='Whisper model name or checkpoint path')
+        parser.add_argument('--backend', default='whisper')
+        parser.add_argument('--children', type=int, default=4)
+        parser.add_argument('--modes', nargs='*', default=MODES, choices=MODES)
+
+    def handle(self, *args, **options):
+        self.stdout.write(f"model={options['model']} backend={options['backend']} children={options['children']}")
+        self.stdout.write(f"{'mode':<8} {'parent load':>11} {'cold start':>10} {'child USS':>10} "
+                          f"{'child PSS':>10} {'child RSS':>10} {'total PSS':>10}")
+        # spawn: the report process itself must not carry torch state into the modes it compares
+        context = multiprocessing.get_context('spawn')
+        for mode in options['modes']:
+            results = context.Queue()
+            process = context.Process(target=run_mode, args=(
+                mode, options['model'], options['backend'], options['children'], results,
+            ))
+            process.start()
+            _, parent_load, parent, usage = results.get()
+            process.join()
+            if parent is None or any(memory is None for _, memory in usage):
+                self.stdout.write(self.style.WARNING(f"{mode}: /proc/<pid>/smaps_rollup is not available here"))
+                continue
+
+            count = len(usage)
+            cold = sum(seconds for seconds, _ in usage) / count
+            uss = sum(memory.uss for _, memory in usage) / count
+            pss = sum(memory.pss for _, memory in usage) / count
+            rss = sum(memory.rss for _, memory in usage) / count
+            total = parent.pss + pss * count
+            self.stdout.write(f"{mode:<8} {parent_load:10.2f}s {cold:9.2f}s {uss / MB:8.0f}MB "
+                              f"{pss / MB:8.0f}MB {rss / MB:8.0f}MB {total / MB:8.0f}MB")
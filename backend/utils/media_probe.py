@@ -0,0 +1,258 @@
+# utils/media_probe.py - In-process container header parser (MP4/MOV and Matroska/WebM)
+import os
+import struct
+from collections import namedtuple
+
+MediaInfo = namedtuple('MediaInfo', ['duration', 'audio_codec', 'sample_rate', 'bitrate', 'stream_count'])
+
+# Only box/element headers are read; bodies we don't need are skipped with seek()
+MATROSKA_HEAD_BYTES = 256 * 1024
+
+MP4_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+MP4_AUDIO_CODECS = {
+    b'mp4a': 'aac',
+    b'Opus': 'opus',
+    b'ac-3': 'ac3',
+    b'ec-3': 'eac3',
+    b'alac': 'alac',
+    b'fLaC': 'flac',
+    b'.mp3': 'mp3',
+    b'samr': 'amr_nb',
+    b'lpcm': 'pcm',
+    b'sowt': 'pcm_s16le',
+    b'twos': 'pcm_s16be',
+}
+
+EBML_HEADER = 0x1A45DFA3
+MKV_SEGMENT = 0x18538067
+MKV_INFO = 0x1549A966
+MKV_TIMECODE_SCALE = 0x2AD7B1
+MKV_DURATION = 0x4489
+MKV_TRACKS = 0x1654AE6B
+MKV_TRACK_ENTRY = 0xAE
+MKV_TRACK_TYPE = 0x83
+MKV_CODEC_ID = 0x86
+MKV_AUDIO = 0xE1
+MKV_SAMPLING_FREQUENCY = 0xB5
+MKV_CLUSTER = 0x1F43B675
+MKV_AUDIO_CODECS = {
+    'A_OPUS': 'opus',
+    'A_VORBIS': 'vorbis',
+    'A_AAC': 'aac',
+    'A_MPEG/L3': 'mp3',
+    'A_AC3': 'ac3',
+    'A_EAC3': 'eac3',
+    'A_FLAC': 'flac',
+    'A_PCM/INT/LIT': 'pcm_s16le',
+}
+
+
+class ProbeError(Exception):
+    """The file is not a container this module understands"""
+
+
+def probe(file_path):
+    """
+    Read duration and audio stream details from the container header.
+    Raises ProbeError when the format is unknown or the header is incomplete.
+    """
+    size = os.path.getsize(file_path)
+    with open(file_path, 'rb') as f:
+        head = f.read(12)
+        f.seek(0)
+        try:
+            if head[:4] == struct.pack('>I', EBML_HEADER):
+                info = probe_matroska(f)
+            elif head[4:8] in (b'ftyp', b'moov', b'mdat', b'free', b'wide', b'skip'):
+                info = probe_mp4(f, size)
+            else:
+                raise ProbeError("unrecognized container")
+        except (IndexError, ValueError, struct.error) as e:
+            # Whatever a damaged header trips over, callers only need to know it can't be parsed
+            raise ProbeError(f"corrupt container header ({e})") from e
+    if not info.duration:
+        raise ProbeError("container header has no duration")
+    bitrate = info.bitrate or int(size * 8 / info.duration)
+    return info._replace(bitrate=bitrate)
+
+
+# --- MP4 / MOV (ISO base media file format) ---
+
+def mp4_boxes(f, start, end):
+    """Yield (type, body offset, body size) for each box between `start` and `end`"""
+    offset = start
+    while offset + 8 <= end:
+        f.seek(offset)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, box_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - offset  # box runs to the end of its parent
+        if size < header_size:
+            raise ProbeError(f"corrupt box '{box_type!r}'")
+        yield box_type, offset + header_size, size - header_size
+        offset += size
+
+
+def read_box(f, offset, size, limit=256):
+    f.seek(offset)
+    return f.read(min(size, limit))
+
+
+def mp4_timing(data):
+    """(timescale, duration) from an mvhd/mdhd body"""
+    if len(data) < (32 if data[:1] == b'\x01' else 20):
+        raise ProbeError("truncated mvhd/mdhd box")
+    if data[0] == 1:
+        timescale, duration = struct.unpack('>IQ', data[20:32])
+    else:
+        timescale, duration = struct.unpack('>II', data[12:20])
+    return timescale, duration
+
+
+def probe_mp4(f, file_size):
+    moov = next((box for box in mp4_boxes(f, 0, file_size) if box[0] == b'moov'), None)
+    if moov is None:
+        raise ProbeError("no moov box")
+
+    duration = None
+    tracks = []
+
+    def walk(start, end, track):
+        nonlocal duration
+        for box_type, offset, size in mp4_boxes(f, start, end):
+            if box_type == b'mvhd':
+                timescale, units = mp4_timing(read_box(f, offset, size))
+                duration = units / timescale if timescale else None
+            elif box_type == b'trak':
+                track = {}
+                tracks.append(track)
+                walk(offset, offset + size, track)
+            elif box_type == b'mdhd' and track is not None:
+                track['timescale'], _ = mp4_timing(read_box(f, offset, size))
+            elif box_type == b'hdlr' and track is not None:
+                track['handler'] = read_box(f, offset, size)[8:12]
+            elif box_type == b'stsd' and track is not None:
+                entry = read_box(f, offset, size, limit=48)
+                if len(entry) >= 16:
+                    track['format'] = entry[12:16]
+                if len(entry) >= 44:
+                    # AudioSampleEntry: 16.16 fixed-point rate, 32 bytes into the entry
+                    track['sample_rate'] = struct.unpack('>I', entry[40:44])[0] >> 16
+            elif box_type in MP4_CONTAINERS:
+                walk(offset, offset + size, track)
+
+    walk(moov[1], moov[1] + moov[2], None)
+
+    audio = next((t for t in tracks if t.get('handler') == b'soun'), None)
+    codec = ''
+    sample_rate = None
+    if audio:
+        fourcc = audio.get('format', b'')
+        codec = MP4_AUDIO_CODECS.get(fourcc, fourcc.decode('latin-1').strip())
+        sample_rate = audio.get('sample_rate') or audio.get('timescale')
+    return MediaInfo(duration, codec, sample_rate, None, len(tracks))
+
+
+# --- Matroska / WebM (EBML) ---
+
+def ebml_vint(data, pos, keep_marker=False):
+    """Decode a variable-length integer; returns (value, next position, all-ones flag)"""
+    if pos >= len(data):
+        raise ProbeError("truncated EBML header")
+    first = data[pos]
+    length = 1
+    mask = 0x80
+    while length <= 8 and not first & mask:
+        mask >>= 1
+        length += 1
+    if length > 8 or pos + length > len(data):
+        raise ProbeError("invalid EBML integer")
+    value = first if keep_marker else first & (mask - 1)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    unknown = not keep_marker and value == (1 << (7 * length)) - 1
+    return value, pos + length, unknown
+
+
+def ebml_elements(data, start, end):
+    """Yield (id, body start, body end) for the elements between `start` and `end`"""
+    pos = start
+    while pos < end:
+        try:
+            element_id, pos, _ = ebml_vint(data, pos, keep_marker=True)
+            size, pos, unknown = ebml_vint(data, pos)
+        except ProbeError:
+            return  # header cut off at the end of what we read
+        body_end = end if unknown else min(pos + size, end)
+        yield element_id, pos, body_end
+        if element_id == MKV_CLUSTER:
+            return  # media data follows; everything we need comes before it
+        pos = body_end
+
+
+def ebml_uint(data, start, end):
+    return int.from_bytes(data[start:end], 'big')
+
+
+def ebml_float(data, start, end):
+    if end - start == 4:
+        return struct.unpack('>f', data[start:end])[0]
+    if end - start == 8:
+        return struct.unpack('>d', data[start:end])[0]
+    return 0.0
+
+
+def probe_matroska(f):
+    data = f.read(MATROSKA_HEAD_BYTES)
+    segment = None
+    for element_id, start, end in ebml_elements(data, 0, len(data)):
+        if element_id == MKV_SEGMENT:
+            segment = (start, end)
+            break
+    if segment is None:
+        raise ProbeError("no Matroska segment")
+
+    timecode_scale = 1000000
+    duration_units = None
+    tracks = []
+    for element_id, start, end in ebml_elements(data, *segment):
+        if element_id == MKV_INFO:
+            for child, child_start, child_end in ebml_elements(data, start, end):
+                if child == MKV_TIMECODE_SCALE:
+                    timecode_scale = ebml_uint(data, child_start, child_end)
+                elif child == MKV_DURATION:
+                    duration_units = ebml_float(data, child_start, child_end)
+        elif element_id == MKV_TRACKS:
+            for child, child_start, child_end in ebml_elements(data, start, end):
+                if child == MKV_TRACK_ENTRY:
+                    tracks.append(matroska_track(data, child_start, child_end))
+
+    duration = duration_units * timecode_scale / 1e9 if duration_units else None
+    audio = next((t for t in tracks if t.get('type') == 2), None)
+    codec = ''
+    sample_rate = None
+    if audio:
+        codec_id = audio.get('codec', '')
+        codec = MKV_AUDIO_CODECS.get(codec_id, codec_id.lower().removeprefix('a_'))
+        sample_rate = int(audio['sample_rate']) if audio.get('sample_rate') else 8000
+    return MediaInfo(duration, codec, sample_rate, None, len(tracks))
+
+
+def matroska_track(data, start, end):
+    track = {}
+    for element_id, child_start, child_end in ebml_elements(data, start, end):
+        if element_id == MKV_TRACK_TYPE:
+            track['type'] = ebml_uint(data, child_start, child_end)
+        elif element_id == MKV_CODEC_ID:
+            track['codec'] = data[child_start:child_end].decode('ascii', 'replace').rstrip('\x00')
+        elif element_id == MKV_AUDIO:
+            for audio_id, audio_start, audio_end in ebml_elements(data, child_start, child_end):
+                if audio_id == MKV_SAMPLING_FREQUENCY:
+                    track['sample_rate'] = ebml_float(data, audio_start, audio_end)
+    return track
@@ -0,0 +1,73 @@
+# utils/model_policy.py - Whisper model selection policy
+from django.conf import settings
+from django.db.models import Sum, Count
+
+QUALITY_AUTO = 'auto'
+QUALITY_FAST = 'fast'
+QUALITY_HIGH = 'quality'
+
+
+def realtime_factor(model_name):
+    """Estimated processing seconds per second of audio for a model size"""
+    base_name = model_name.split('.')[0]
+    return settings.WHISPER_REALTIME_FACTORS.get(base_name, 1.0)
+
+
+def get_backlog(exclude_video_id=None):
+    """Return (queue depth, seconds of audio) for videos still waiting to be processed"""
+    from api.models import Video
+
+    # Failed videos stay unprocessed but will never be worked on
+    pending = Video.objects.filter(processed=False).exclude(status='failed')
+    if exclude_video_id is not None:
+        pending = pending.exclude(id=exclude_video_id)
+
+    stats = pending.aggregate(depth=Count('id'), known_seconds=Sum('duration'))
+    depth = stats['depth'] or 0
+    known_seconds = stats['known_seconds'] or 0.0
+    unknown = pending.filter(duration__isnull=True).count()
+    return depth, known_seconds + unknown * settings.WHISPER_UNKNOWN_DURATION_ESTIMATE
+
+
+def select_model(duration, quality=QUALITY_AUTO, queue_depth=None, backlog_seconds=None):
+    """
+    Pick a Whisper model size for a job.
+
+    Returns a tuple (model_name, reason). Explicit tiers bypass the load check;
+    in auto mode the largest model on the ladder whose estimated turnaround
+    (backlog wait + own transcription time) fits the target is chosen, so the
+    policy downshifts as the queue grows and upshifts when workers are idle.
+    """
+    ladder = settings.WHISPER_MODEL_LADDER
+
+    if quality == QUALITY_HIGH:
+        model = settings.WHISPER_QUALITY_MODEL
+        return model, f"quality tier requested: using {model}"
+    if quality == QUALITY_FAST:
+        model = ladder[0]
+        return model, f"fast tier requested: using {model}"
+
+    if queue_depth is None or backlog_seconds is None:
+        queue_depth, backlog_seconds = get_backlog()
+
+    duration = duration or settings.WHISPER_UNKNOWN_DURATION_ESTIMATE
+    workers = max(1, settings.WHISPER_WORKER_CONCURRENCY)
+    target = settings.WHISPER_TARGET_TURNAROUND
+    # Jobs ahead of us are costed at the default model's speed
+    wait = backlog_seconds * realtime_factor(settings.WHISPER_DEFAULT_MODEL) / workers
+
+    max_index = ladder.index(settings.WHISPER_MAX_AUTO_MODEL)
+    for model in reversed(ladder[:max_index + 1]):
+        turnaround = wait + duration * realtime_factor(model)
+        if turnaround <= target:
+            return model, (
+                f"auto: duration={duration:.0f}s, queue_depth={queue_depth}, "
+                f"est_wait={wait:.0f}s, est_turnaround={turnaround:.0f}s <= target={target}s"
+            )
+
+    model = ladder[0]
+    turnaround = wait + duration * realtime_factor(model)
+    return model, (
+        f"auto: target={target}s not reachable (duration={duration:.0f}s, "
+        f"queue_depth={queue_depth}, est_turnaround={turnaround:.0f}s); using fastest model"
+    )
@@ -0,0 +1,101 @@
+# utils/outbox.py - Transactional outbox between request handlers and the Celery broker
+import logging
+from datetime import timedelta
+
+from celery import current_app
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from kombu.exceptions import OperationalError
+
+from api.models import OutboxMessage
+
+logger = logging.getLogger(__name__)
+
+BROKER_ERRORS = (OSError, OperationalError)  # the broker itself is down, not the message
+
+
+def enqueue_tasks(task, calls):
+    """
+    Record `calls` ([(args, task_id), ...]) of the task named `task` for the
+    relay. Call it inside the transaction that writes the rows the tasks read,
+    so a task is published if and only if that transaction commits.
+    """
+    messages = OutboxMessage.objects.bulk_create([
+        OutboxMessage(task=task, args=list(args), task_id=task_id or '')
+        for args, task_id in calls
+    ])
+    if current_app.conf.task_always_eager:
+        # Eager (in-process) Celery has no relay running beside it: publish on commit
+        transaction.on_commit(relay_outbox)
+    return messages
+
+
+def publish(message):
+    """Send one message to the broker"""
+    current_app.tasks[message.task].apply_async(args=message.args, task_id=message.task_id or None)
+
+
+def claim_messages(limit):
+    """
+    Claim up to `limit` pending messages, oldest first, and commit the claim,
+    so no row lock is held while talking to the broker. Parked messages (at
+    OUTBOX_MAX_ATTEMPTS) are skipped; claims older than OUTBOX_CLAIM_TIMEOUT
+    belong to a relay that died and are taken over.
+    """
+    now = timezone.now()
+    stale = now - timedelta(seconds=settings.OUTBOX_CLAIM_TIMEOUT)
+    with transaction.atomic():
+        ids = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True)
+            .filter(published_at__isnull=True, attempts__lt=settings.OUTBOX_MAX_ATTEMPTS)
+            .filter(Q(claimed_at__isnull=True) | Q(claimed_at__lt=stale))
+            .order_by('id').values_list('id', flat=True)[:limit]
+        )
+        OutboxMessage.objects.filter(id__in=ids).update(claimed_at=now)
+    return list(OutboxMessage.objects.filter(id__in=ids).order_by('id'))
+
+
+def relay_outbox(limit=None):
+    """
+    Publish up to `limit` pending messages, oldest first, each on its own, and
+    mark the ones sent. A message the broker rejects (unknown task, bad
+    payload) has its attempt and error recorded and is parked after
+    OUTBOX_MAX_ATTEMPTS, so it never blocks the messages behind it. If the
+    broker is unreachable the rest of the batch is released for the next run.
+    Delivery is at least once: a crash between publish and marking resends
+    the message with the same task id. Returns the number of messages published.
+    """
+    limit = limit or settings.OUTBOX_RELAY_BATCH
+    messages = claim_messages(limit)
+    published = []
+    try:
+        for message in messages:
+            try:
+                publish(message)
+            except BROKER_ERRORS as exc:
+                logger.warning("Outbox relay could not reach the broker: %s", exc)
+                OutboxMessage.objects.filter(id=message.id).update(last_error=str(exc)[:1000])
+                break
+            except Exception as exc:
+                logger.exception("Outbox message %s (%s) could not be published", message.id, message.task)
+                if message.attempts + 1 >= settings.OUTBOX_MAX_ATTEMPTS:
+                    logger.error("Outbox message %s parked after %s attempts", message.id, message.attempts + 1)
+                OutboxMessage.objects.filter(id=message.id).update(
+                    attempts=F('attempts') + 1, last_error=str(exc)[:1000], claimed_at=None,
+                )
+            else:
+                published.append(message.id)
+    finally:
+        OutboxMessage.objects.filter(id__in=published).update(published_at=timezone.now(), last_error='')
+        # Whatever was not reached goes back to the pending pool
+        OutboxMessage.objects.filter(id__in=[m.id for m in messages], published_at__isnull=True).update(claimed_at=None)
+    return len(published)
+
+
+def prune_outbox():
+    """Delete messages published more than OUTBOX_RETENTION seconds ago"""
+    cutoff = timezone.now() - timedelta(seconds=settings.OUTBOX_RETENTION)
+    deleted, _ = OutboxMessage.objects.filter(published_at__lt=cutoff).delete()
+    return deleted
@@ -0,0 +1,202 @@
+# utils/scheduler.py - Fair-share, shortest-job-first dispatch in front of Celery
+import heapq
+import uuid
+from collections import namedtuple
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Sum
+from django.utils import timezone
+
+Job = namedtuple('Job', ['id', 'user_id', 'duration', 'queued_at'])
+
+IN_FLIGHT_STATUSES = ['queued', 'processing']  # holding a worker slot
+
+
+def job_priority(job, user_usage, now, aging_rate):
+    """
+    Lower runs first. The job's virtual finish time on its owner's clock
+    (seconds of audio the user already has in flight + this job's duration)
+    gives per-user fair queuing and shortest-job-first ordering in one key;
+    the aging term lets a long-waiting job overtake any fresh arrival.
+    """
+    waited = max(0.0, now - job.queued_at)
+    return user_usage.get(job.user_id, 0.0) + job.duration - aging_rate * waited
+
+
+def pick_jobs(waiting, user_usage, now, slots, aging_rate):
+    """
+    Choose up to `slots` jobs from `waiting` in dispatch order.
+    `user_usage` (user id -> in-flight seconds) is updated as jobs are picked.
+    """
+    remaining = list(waiting)
+    picked = []
+    while remaining and len(picked) < slots:
+        best = min(remaining, key=lambda job: (job_priority(job, user_usage, now, aging_rate), job.queued_at))
+        remaining.remove(best)
+        user_usage[best.user_id] = user_usage.get(best.user_id, 0.0) + best.duration
+        picked.append(best)
+    return picked
+
+
+QUEUE_FIELDS = ['duration', 'status', 'queued_at', 'not_before', 'task_id']
+
+
+def prepare_video(video, duration=None, not_before=None):
+    """Set the scheduler queue fields (QUEUE_FIELDS) on an unsaved or bulk-written video"""
+    video.duration = duration or None
+    video.status = 'deferred' if not_before else 'waiting'
+    video.queued_at = not_before or timezone.now()
+    video.not_before = not_before
+    video.task_id = str(uuid.uuid4())
+    return video.task_id
+
+
+def schedule_video(video, duration=None, not_before=None):
+    """
+    Put a freshly uploaded video in the scheduler queue and try to dispatch it.
+    With `not_before` the video is deferred and only becomes eligible then.
+    """
+    prepare_video(video, duration, not_before)
+    video.save(update_fields=QUEUE_FIELDS)
+    dispatch_pending()
+    return video.task_id
+
+
+def begin_processing(video, task_id):
+    """
+    Claim a dispatched video for the task run `task_id`. False for a message
+    of an older dispatch (the video was requeued under a new task id) and for
+    a redelivered or resent message when the video is already processing or
+    finished: the outbox delivers at least once and Celery doesn't dedupe.
+    """
+    from api.models import Video
+
+    if video.task_id and task_id and video.task_id != task_id:
+        return False
+    return Video.objects.filter(id=video.id, status='queued').update(status='processing') == 1
+
+
+def heartbeat(video_id):
+    """Called as each processing task starts, so a long multi-task video isn't taken for lost"""
+    from api.models import Video
+
+    Video.objects.filter(id=video_id, status__in=IN_FLIGHT_STATUSES).update(dispatched_at=timezone.now())
+
+
+def reap_stalled():
+    """
+    Mark queued videos failed when their task hasn't checked in for
+    SCHEDULER_STALL_SECONDS: the task was killed or its message lost, and the
+    video would otherwise hold a worker slot forever. Returns their ids.
+    """
+    from api.models import Video
+
+    cutoff = timezone.now() - timedelta(seconds=settings.SCHEDULER_STALL_SECONDS)
+    lost = Video.objects.filter(status__in=IN_FLIGHT_STATUSES, dispatched_at__lt=cutoff)
+    stalled = list(lost.values_list('id', flat=True))
+    if stalled:
+        # Same condition again, so a task that checked in meanwhile keeps its video
+        lost.filter(id__in=stalled).update(status='failed')
+        print(f"Marked stalled videos failed: {stalled}")
+    return stalled
+
+
+def lock_dispatch(now):
+    """
+    Take the dispatch lock for the rest of the current transaction. An UPDATE
+    rather than SELECT FOR UPDATE, so it also serializes dispatchers on SQLite.
+    """
+    from api.models import SchedulerLock
+
+    if not SchedulerLock.objects.filter(name='dispatch').update(acquired_at=now):
+        SchedulerLock.objects.get_or_create(name='dispatch', defaults={'acquired_at': now})
+
+
+def dispatch_pending():
+    """
+    Queue as many waiting videos as there are free worker slots. The free
+    slots are counted and claimed under one lock, so concurrent callers
+    (uploads, finishing tasks, beat) never exceed SCHEDULER_MAX_IN_FLIGHT.
+    The tasks go through the outbox (see utils/outbox.py), so callers never
+    wait on the broker.
+    """
+    from api.models import Video
+    from api.tasks import process_video_async
+    from utils.outbox import enqueue_tasks
+
+    now = timezone.now()
+    with transaction.atomic():
+        lock_dispatch(now)
+        Video.objects.filter(status='deferred', not_before__lte=now).update(status='waiting')
+
+        in_flight = Video.objects.filter(status__in=IN_FLIGHT_STATUSES)
+        slots = settings.SCHEDULER_MAX_IN_FLIGHT - in_flight.count()
+        if slots <= 0:
+            return []
+
+        user_usage = {
+            row['user_id']: row['seconds'] or 0.0
+            for row in in_flight.values('user_id').annotate(seconds=Sum('duration'))
+        }
+        waiting = [
+            Job(v.id, v.user_id, v.duration or settings.WHISPER_UNKNOWN_DURATION_ESTIMATE, v.queued_at.timestamp())
+            for v in Video.objects.filter(status='waiting').only('id', 'user_id', 'duration', 'queued_at')
+        ]
+        picked = pick_jobs(waiting, user_usage, now.timestamp(), slots, settings.SCHEDULER_AGING_RATE)
+
+        dispatched = []
+        for job in picked:
+            # Conditional update: a video requeued or cancelled meanwhile is skipped
+            claimed = Video.objects.filter(id=job.id, status='waiting').update(status='queued', dispatched_at=now)
+            if claimed:
+                dispatched.append(job.id)
+        task_ids = dict(Video.objects.filter(id__in=dispatched).values_list('id', 'task_id'))
+        # Published by the outbox relay once this commits, never before the rows are visible
+        enqueue_tasks(process_video_async.name, [([video_id], task_ids[video_id]) for video_id in dispatched])
+    return dispatched
+
+
+def simulate(jobs, policy, workers, realtime_factor, aging_rate=0.0):
+    """
+    Discrete-event simulation of the dispatcher.
+
+    `jobs` is a list of Job tuples (queued_at = arrival time in seconds);
+    `policy` is 'fifo' or 'fair'. Returns {job id: turnaround seconds}.
+    """
+    arrivals = sorted(jobs, key=lambda job: job.queued_at)
+    running = []  # heap of (finish time, job)
+    waiting = []
+    user_usage = {}
+    turnaround = {}
+    now = 0.0
+    index = 0
+
+    while index < len(arrivals) or waiting or running:
+        next_arrival = arrivals[index].queued_at if index < len(arrivals) else float('inf')
+        next_finish = running[0][0] if running else float('inf')
+        now = min(next_arrival, next_finish)
+
+        while running and running[0][0] <= now:
+            _, job = heapq.heappop(running)
+            user_usage[job.user_id] -= job.duration
+            turnaround[job.id] = now - job.queued_at
+        while index < len(arrivals) and arrivals[index].queued_at <= now:
+            waiting.append(arrivals[index])
+            index += 1
+
+        slots = workers - len(running)
+        if slots <= 0 or not waiting:
+            continue
+        if policy == 'fifo':
+            picked = waiting[:slots]
+            for job in picked:
+                user_usage[job.user_id] = user_usage.get(job.user_id, 0.0) + job.duration
+        else:
+            picked = pick_jobs(waiting, user_usage, now, slots, aging_rate)
+        for job in picked:
+            waiting.remove(job)
+            heapq.heappush(running, (now + job.duration * realtime_factor, job))
+
+    return turnaround
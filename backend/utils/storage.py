@@ -0,0 +1,164 @@
+# utils/storage.py - Content-addressed media storage with reference-counted blobs
+import hashlib
+import os
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import transaction
+from django.db.models import F
+
+BLOB_PREFIX = 'blobs'
+
+
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Stores every file under blobs/<aa>/<bb>/<sha256><ext>, so identical
+    uploads share one file on disk. Reference counts live in MediaBlob.
+    """
+
+    def get_available_name(self, name, max_length=None):
+        # The final name is derived from the content in _save
+        return name
+
+    def _save(self, name, content):
+        digest = hashlib.sha256()
+        for chunk in content.chunks():
+            digest.update(chunk)
+        content.seek(0)
+
+        sha256 = digest.hexdigest()
+        extension = os.path.splitext(name)[1].lower()
+        blob_name = f"{BLOB_PREFIX}/{sha256[:2]}/{sha256[2:4]}/{sha256}{extension}"
+        if self.exists(blob_name):
+            # Refresh the mtime so gc_media treats the blob as freshly written
+            # until this upload's row has taken its reference
+            os.utime(self.path(blob_name))
+            return blob_name
+        try:
+            return super()._save(blob_name, content)
+        except FileExistsError:
+            # Same content written concurrently by another request
+            return blob_name
+
+
+_storage = ContentAddressedStorage()
+
+
+def media_storage():
+    """Callable used as FileField storage (keeps the storage out of migrations)"""
+    return _storage
+
+
+def acquire_blobs(names):
+    """
+    Add one reference per occurrence in `names` (bulk writes skip the Video
+    signals, so bulk endpoints call this directly). One UPDATE per distinct count.
+    """
+    from api.models import MediaBlob
+
+    counts = Counter(name for name in names if name)
+    if not counts:
+        return
+    existing = set(MediaBlob.objects.filter(name__in=counts).values_list('name', flat=True))
+    MediaBlob.objects.bulk_create([
+        MediaBlob(name=name, size=_storage.size(name) if _storage.exists(name) else 0, ref_count=0)
+        for name in counts if name not in existing
+    ], ignore_conflicts=True)
+    by_count = {}
+    for name, count in counts.items():
+        by_count.setdefault(count, []).append(name)
+    for count, group in by_count.items():
+        MediaBlob.objects.filter(name__in=group).update(ref_count=F('ref_count') + count)
+
+
+def acquire_blob(name):
+    """Add a reference to the blob stored under `name`"""
+    acquire_blobs([name])
+
+
+def release_blob(name):
+    """Drop a reference; unreferenced blobs are deleted by the gc_media command"""
+    from api.models import MediaBlob
+
+    if name:
+        MediaBlob.objects.filter(name=name).update(ref_count=F('ref_count') - 1)
+
+
+def referenced_names():
+    """Storage names currently referenced by any video"""
+    from api.models import Video
+
+    names = set()
+    for file_name, audio_name in Video.objects.values_list('file', 'audio_file'):
+        names.update(name for name in (file_name, audio_name) if name)
+    return names
+
+
+def file_age(name):
+    """Seconds since the file under `name` was last written (0 if it is gone)"""
+    try:
+        return time.time() - os.path.getmtime(_storage.path(name))
+    except OSError:
+        return 0
+
+
+def collect_garbage(dry_run=False, min_age=None, include_legacy=False):
+    """
+    Delete blobs nobody references any more, plus orphaned files left in the
+    storage directory (e.g. uploads whose row was never committed). Files
+    younger than `min_age` seconds are left alone, so an upload that reused a
+    blob has time to take its reference. Returns (files, bytes freed).
+    """
+    from api.models import MediaBlob
+
+    min_age = settings.MEDIA_GC_MIN_AGE if min_age is None else min_age
+
+    referenced = referenced_names()
+    freed_files = 0
+    freed_bytes = 0
+
+    def remove(name):
+        nonlocal freed_files, freed_bytes
+        if not _storage.exists(name):
+            return
+        freed_bytes += _storage.size(name)
+        freed_files += 1
+        if not dry_run:
+            _storage.delete(name)
+
+    candidates = list(MediaBlob.objects.filter(ref_count__lte=0).values_list('id', 'name'))
+    for blob_id, name in candidates:
+        if name in referenced:
+            continue  # counter drifted; the file is still in use
+        if _storage.exists(name) and file_age(name) < min_age:
+            continue
+        if dry_run:
+            remove(name)
+            continue
+        with transaction.atomic():
+            # Re-check under the row lock: a reference taken since the candidates
+            # were listed keeps the blob
+            blob = MediaBlob.objects.select_for_update().filter(id=blob_id, ref_count__lte=0).first()
+            if blob is None:
+                continue
+            remove(name)
+            blob.delete()
+
+    known = set(MediaBlob.objects.values_list('name', flat=True))
+    prefixes = [BLOB_PREFIX] + (['videos'] if include_legacy else [])
+    now = time.time()
+    for prefix in prefixes:
+        root = _storage.path(prefix)
+        for directory, _, files in os.walk(root):
+            for filename in files:
+                full_path = os.path.join(directory, filename)
+                name = os.path.relpath(full_path, _storage.location).replace(os.sep, '/')
+                if name in referenced or name in known:
+                    continue
+                if now - os.path.getmtime(full_path) < min_age:
+                    continue
+                remove(name)
+
+    return freed_files, freed_bytes
@@ -0,0 +1,283 @@
+# utils/summary_helper.py - Chunked (map/reduce) transcript summarization
+import hashlib
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import transaction
+from groq import Groq
+from whisper.tokenizer import LANGUAGES
+
+from api.models import Transcript, Summary, SummaryChunk, Chapter
+from utils.chapters import topic_chunks, split_title, fallback_title
+from utils.extractive import extractive_summary
+from utils.checkpoints import save_checkpoint
+from utils.http_cache import bump_content_version
+
+client = Groq(api_key=settings.GROQ_API_KEY, timeout=settings.SUMMARY_LLM_TIMEOUT)
+
+
+def system_prompt(language):
+    prompt = "You are an assistant that summarizes transcripts clearly and concisely."
+    language_name = LANGUAGES.get(language)
+    if language_name:
+        prompt += f" The transcript is in {language_name.title()}; write the summary in {language_name.title()}."
+    return prompt
+
+
+def ask_llm(language, content):
+    """Send one summarization request to Groq and return the text"""
+    response = client.chat.completions.create(
+        model=settings.SUMMARY_LLM_MODEL,
+        messages=[
+            {"role": "system", "content": system_prompt(language)},
+            {"role": "user", "content": content}
+        ]
+    )
+    return response.choices[0].message.content
+
+
+def chunk_segments(segments, max_chars=None, final=True):
+    """
+    Group consecutive transcript segments into chunks of at most `max_chars`
+    characters, cut at topic boundaries so each chunk is also a chapter.
+    Returns a list of {start, end, text} dicts; with final=False only the
+    chunks of a growing transcript that can no longer change.
+    """
+    max_chars = max_chars or settings.SUMMARY_CHUNK_CHARS
+    chunks = topic_chunks(segments, max_chars, min(settings.CHAPTER_MIN_CHARS, max_chars // 2), final=final)
+    return [
+        {
+            'start': chunk[0].start_time,
+            'end': chunk[-1].end_time,
+            'text': ' '.join(segment.text.strip() for segment in chunk),
+        }
+        for chunk in chunks
+    ]
+
+
+def stored_chunks(video_obj, segments):
+    """
+    Regroup segments into the chunk time ranges of the last summarization, so
+    an edited transcript keeps its chunk boundaries and only the chunks whose
+    text changed get a new hash. None when the video was never summarized by
+    the LLM (extractive summaries keep no chunk rows, streamed ones may be partial).
+    """
+    summary = Summary.objects.filter(video=video_obj).order_by('-id').first()
+    if summary is None or summary.source == 'extractive':
+        return None
+    starts = list(SummaryChunk.objects.filter(video=video_obj).order_by('index').values_list('start_time', flat=True))
+    if not starts:
+        return None
+    groups = [[] for _ in starts]
+    for segment in segments:
+        if segment.text.strip():
+            groups[max(0, bisect_right(starts, segment.start_time) - 1)].append(segment)
+    return [
+        {
+            'start': group[0].start_time,
+            'end': group[-1].end_time,
+            'text': ' '.join(segment.text.strip() for segment in group),
+        }
+        for group in groups if group
+    ]
+
+
+def stale_chunks(video_obj):
+    """
+    Indexes of the stored chunks whose transcript text no longer matches their
+    summary. Without stored chunks every chunk counts as changed.
+    """
+    segments = Transcript.objects.filter(video=video_obj).order_by('start_time', 'id').defer('word_timings')
+    chunks = stored_chunks(video_obj, segments)
+    if chunks is None:
+        return list(range(len(chunk_segments(segments))))
+    hashes = dict(SummaryChunk.objects.filter(video=video_obj).values_list('index', 'text_hash'))
+    return [index for index, chunk in enumerate(chunks) if hashes.get(index) != text_hash(chunk['text'])]
+
+
+def text_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def chunk_prompt(index, chunk, total=None):
+    """Map-step request for one chunk; `total` is unknown while the transcript is still growing"""
+    instructions = (
+        "Start your answer with a line 'Title: <a short chapter title>', "
+        "then the summary on the following lines."
+    )
+    if total == 1:
+        return f"Summarize this transcript. {instructions}\n\n{chunk['text']}"
+    part = f"part {index + 1} of {total}" if total else f"part {index + 1}"
+    return f"Summarize {part} of a transcript. {instructions}\n\n{chunk['text']}"
+
+
+def store_chunk_summary(video_obj, index, chunk, digest, reply):
+    """Persist one map-step reply as the SummaryChunk for `digest`; returns (title, summary)"""
+    title, summary_text = split_title(reply)
+    SummaryChunk.objects.update_or_create(
+        video=video_obj,
+        index=index,
+        defaults={
+            'start_time': chunk['start'],
+            'end_time': chunk['end'],
+            'text_hash': digest,
+            'title': title,
+            'summary': summary_text,
+        },
+    )
+    return title or fallback_title(summary_text), summary_text
+
+
+def summarize_chunk(video_obj, index, chunk, total, language):
+    """
+    Map step for one chunk: one LLM call returns the chapter title and the
+    chunk summary. The result is stored as a SummaryChunk keyed by the chunk's
+    text hash, so a retry (or an unchanged chunk) never calls the LLM again.
+    Returns (title, summary).
+    """
+    digest = text_hash(chunk['text'])
+    existing = SummaryChunk.objects.filter(video=video_obj, index=index).first()
+    if existing and existing.text_hash == digest:
+        return existing.title or fallback_title(existing.summary), existing.summary
+    reply = ask_llm(language, chunk_prompt(index, chunk, total))
+    return store_chunk_summary(video_obj, index, chunk, digest, reply)
+
+
+class StreamingSummarizer:
+    """
+    Map step running alongside transcription: after each committed window,
+    submit() sends the chunks that can no longer change to the LLM from a
+    small thread pool, so only the last chunks and the reduce step are left
+    once the transcript is complete. Threads only wait on the LLM; replies
+    are stored from the calling thread. Stored chunks are reused by
+    generate_summary through their text hash.
+    """
+
+    def __init__(self, video_obj, workers=None):
+        self.video = video_obj
+        self.executor = ThreadPoolExecutor(max_workers=workers or settings.SUMMARY_STREAM_WORKERS)
+        self.pending = {}  # chunk index -> (chunk, digest, future)
+
+    def submit(self):
+        """Queue newly sealed chunks and store replies that have arrived; returns the number queued"""
+        self.collect()
+        segments = Transcript.objects.filter(video=self.video).order_by('start_time', 'id').defer('word_timings')
+        stored = dict(SummaryChunk.objects.filter(video=self.video).values_list('index', 'text_hash'))
+        queued = 0
+        for index, chunk in enumerate(chunk_segments(segments, final=False)):
+            digest = text_hash(chunk['text'])
+            if stored.get(index) == digest or index in self.pending:
+                continue
+            future = self.executor.submit(ask_llm, self.video.language, chunk_prompt(index, chunk))
+            self.pending[index] = (chunk, digest, future)
+            queued += 1
+        return queued
+
+    def collect(self, wait=False):
+        """Store the replies that are ready (all of them with wait=True)"""
+        for index, (chunk, digest, future) in list(self.pending.items()):
+            if not (wait or future.done()):
+                continue
+            del self.pending[index]
+            try:
+                store_chunk_summary(self.video, index, chunk, digest, future.result())
+            except Exception as e:
+                # Left to generate_summary, which retries the chunk with the rest
+                print(f"Streaming summary of chunk {index} failed for video {self.video.id}: {e}")
+
+    def finish(self):
+        self.collect(wait=True)
+        self.executor.shutdown()
+
+    def close(self):
+        """Abandon outstanding requests (the task failed)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def reduce_summaries(chunk_summaries, language):
+    """Reduce step: merge per-chunk summaries into the final summary"""
+    if len(chunk_summaries) == 1:
+        return chunk_summaries[0]
+    parts = "\n\n".join(f"Part {i + 1}:\n{text}" for i, text in enumerate(chunk_summaries))
+    return ask_llm(
+        language,
+        f"These are summaries of consecutive parts of one transcript. "
+        f"Combine them into a single clear, concise summary:\n\n{parts}"
+    )
+
+
+def extractive_chunk(chunk):
+    """No-LLM counterpart of summarize_chunk: (title, summary) from the chunk's own sentences"""
+    summary_text = extractive_summary(chunk['text'], settings.SUMMARY_EXTRACTIVE_CHAPTER_SENTENCES,
+                                      max_chars=settings.SUMMARY_EXTRACTIVE_CHAPTER_MAX_CHARS)
+    return fallback_title(summary_text), summary_text
+
+
+def save_summary(video_obj, summary_text, chapters=None, source='llm', final=True):
+    """
+    Replace the video's summary (a video never ends up with duplicates) and,
+    when given, its chapters as (start, end, title, summary) tuples. A
+    non-final summary (the extractive preview) is not checkpointed.
+    """
+    with transaction.atomic():
+        Summary.objects.filter(video=video_obj).delete()
+        summary = Summary.objects.create(video=video_obj, text=summary_text, source=source)
+        if chapters is not None:
+            Chapter.objects.filter(video=video_obj).delete()
+            Chapter.objects.bulk_create([
+                Chapter(video=video_obj, start_time=start, end_time=end, title=title, summary=text)
+                for start, end, title, text in chapters
+            ])
+        if final:
+            save_checkpoint(video_obj, 'summary', {'summary_id': summary.id})
+        bump_content_version(video_obj)
+    return summary
+
+
+def segment_texts(video_obj):
+    return list(Transcript.objects.filter(video=video_obj).order_by('start_time', 'id').values_list('text', flat=True))
+
+
+def save_preview_summary(video_obj):
+    """Instant extractive summary shown while the LLM summary is being generated"""
+    texts = segment_texts(video_obj)
+    text = ' '.join(texts)
+    if not text.strip():
+        return None
+    return save_summary(video_obj, extractive_summary(text, segments=texts), source='extractive', final=False)
+
+
+def generate_summary(video_obj, source=None, keep_chunks=False):
+    """
+    Generate summary for a video's transcript using Groq LLM.
+    Long transcripts are summarized chunk by chunk, then reduced; the chunk
+    results become the video's chapters without further LLM calls.
+    With source='extractive' (or SUMMARY_BACKEND='extractive') no LLM is used.
+    With keep_chunks (after transcript edits) the previous chunk boundaries
+    are kept, so only edited chunks are sent to the LLM again.
+    """
+    source = source or settings.SUMMARY_BACKEND
+    segments = Transcript.objects.filter(video=video_obj).order_by('start_time', 'id').defer('word_timings')
+    chunks = (keep_chunks and stored_chunks(video_obj, segments)) or chunk_segments(segments)
+    if not chunks:
+        raise ValueError("Transcript is empty, cannot generate summary.")
+
+    if source == 'extractive':
+        results = [extractive_chunk(chunk) for chunk in chunks]
+        summary_text = extractive_summary(' '.join(chunk['text'] for chunk in chunks),
+                                          segments=[segment.text for segment in segments])
+    else:
+        language = video_obj.language
+        results = [
+            summarize_chunk(video_obj, index, chunk, len(chunks), language)
+            for index, chunk in enumerate(chunks)
+        ]
+        SummaryChunk.objects.filter(video=video_obj, index__gte=len(chunks)).delete()
+        summary_text = reduce_summaries([text for _, text in results], language)
+
+    chapters = [
+        (chunk['start'], chunk['end'], title, text)
+        for chunk, (title, text) in zip(chunks, results)
+    ]
+    return save_summary(video_obj, summary_text, chapters, source=source)
@@ -0,0 +1,205 @@
+# utils/transcription_backends.py - Interchangeable speech-to-text engines
+"""
+An engine is anything with Whisper's transcribe() call:
+
+    engine.transcribe(audio, language=None, initial_prompt=None, word_timestamps=False)
+        -> {'text': str, 'segments': [{'start', 'end', 'text', 'words'?}, ...], 'language': str}
+
+where `audio` is 16 kHz mono float32. Engines built on a whisper.Whisper
+module also get language detection and cross-video batching.
+"""
+import os
+import re
+import time
+from types import SimpleNamespace
+
+import whisper
+from django.conf import settings
+from torch import nn
+from whisper.audio import SAMPLE_RATE
+
+STUB_WORDS = ("the speaker explains how the system handles uploads queues transcripts "
+              "and summaries while users keep polling for progress").split()
+STUB_SEGMENT_SECONDS = 5.0
+MMAP_SUFFIX = '.fp32.pt'
+
+
+class StubTranscriber:
+    """Deterministic engine for tests and load tests: fixed 5 s segments of canned text"""
+
+    def __init__(self, name, delay=0.0):
+        self.name = name
+        self.delay = delay  # simulated model seconds per second of audio
+        self.dims = SimpleNamespace(n_mels=128 if name.startswith('large') else 80)
+        self.device = 'cpu'
+
+    def detect_language(self, mel):
+        return None, {'en': 0.99, 'de': 0.01}
+
+    def transcribe(self, audio, language=None, initial_prompt=None, word_timestamps=False, **kwargs):
+        seconds = len(audio) / SAMPLE_RATE
+        if self.delay:
+            time.sleep(seconds * self.delay)
+        segments = []
+        start = 0.0
+        while start < seconds:
+            end = min(seconds, start + STUB_SEGMENT_SECONDS)
+            offset = len(segments) * 3
+            words = [STUB_WORDS[(offset + i) % len(STUB_WORDS)] for i in range(12)]
+            segment = {'start': start, 'end': end, 'text': ' ' + ' '.join(words).capitalize() + '.'}
+            if word_timestamps:
+                step = (end - start) / len(words)
+                segment['words'] = [
+                    {'word': ' ' + word, 'start': start + i * step, 'end': start + (i + 1) * step, 'probability': 1.0}
+                    for i, word in enumerate(segment['text'].split())
+                ]
+            segments.append(segment)
+            start = end
+        return {'segments': segments, 'text': ''.join(s['text'] for s in segments), 'language': language or 'en'}
+
+
+def quantize_whisper(model):
+    """
+    Dynamic int8 quantization of every Linear layer (attention projections and
+    MLPs, most of Whisper's CPU time). Whisper's Linear subclass only adds a
+    dtype cast, so it is swapped for nn.Linear, which torch knows how to quantize.
+    """
+    import torch
+
+    for module in list(model.modules()):
+        for name, child in list(module.named_children()):
+            if isinstance(child, nn.Linear) and type(child) is not nn.Linear:
+                plain = nn.Linear(child.in_features, child.out_features, bias=child.bias is not None)
+                plain.weight = child.weight
+                plain.bias = child.bias
+                setattr(module, name, plain)
+    return torch.ao.quantization.quantize_dynamic(model.eval(), {nn.Linear}, dtype=torch.qint8)
+
+
+def whisper_checkpoint(model_name):
+    """(checkpoint path, alignment heads) for an official model (downloaded on first use) or a local file"""
+    if model_name in whisper._MODELS:
+        root = os.path.join(os.getenv('XDG_CACHE_HOME', os.path.join(os.path.expanduser('~'), '.cache')), 'whisper')
+        return whisper._download(whisper._MODELS[model_name], root, False), whisper._ALIGNMENT_HEADS[model_name]
+    if os.path.isfile(model_name):
+        return model_name, None
+    raise RuntimeError(f"Model {model_name} not found; available models = {whisper.available_models()}")
+
+
+def mmap_checkpoint(path):
+    """
+    fp32 copy of a checkpoint, written once next to it. Official checkpoints
+    are fp16, which would be cast on every forward pass on CPU; the copy can
+    be mapped and used as it is.
+    """
+    import torch
+
+    target = os.path.splitext(path)[0] + MMAP_SUFFIX
+    if not os.path.exists(target):
+        checkpoint = torch.load(path, map_location='cpu', weights_only=True)
+        checkpoint['model_state_dict'] = {
+            name: tensor.float() if tensor.is_floating_point() else tensor
+            for name, tensor in checkpoint['model_state_dict'].items()
+        }
+        partial = f'{target}.{os.getpid()}.tmp'
+        torch.save(checkpoint, partial)
+        os.replace(partial, target)  # concurrent workers never map a half-written file
+    return target
+
+
+class MappedWhisper(whisper.model.Whisper):
+    """Whisper built without allocating weights: they are assigned from a memory-mapped checkpoint"""
+
+    def __init__(self, dims):
+        import torch
+
+        nn.Module.__init__(self)
+        self.dims = dims
+        with torch.device('meta'):
+            self.encoder = whisper.model.AudioEncoder(
+                dims.n_mels, dims.n_audio_ctx, dims.n_audio_state, dims.n_audio_head, dims.n_audio_layer,
+            )
+            self.decoder = whisper.model.TextDecoder(
+                dims.n_vocab, dims.n_text_ctx, dims.n_text_state, dims.n_text_head, dims.n_text_layer,
+            )
+        # Buffers that are not in the checkpoint, as Whisper.__init__ and TextDecoder build them
+        self.decoder.mask = torch.empty(dims.n_text_ctx, dims.n_text_ctx).fill_(-float('inf')).triu_(1)
+        heads = torch.zeros(dims.n_text_layer, dims.n_text_head, dtype=torch.bool)
+        heads[dims.n_text_layer // 2:] = True
+        self.register_buffer('alignment_heads', heads.to_sparse(), persistent=False)
+
+
+def load_whisper_mmap(model_name):
+    """
+    CPU Whisper whose weights are memory-mapped from the checkpoint file
+    instead of copied into private memory, so every worker process on the
+    host shares one page-cache copy of them.
+    """
+    import torch
+
+    path, alignment_heads = whisper_checkpoint(model_name)
+    checkpoint = torch.load(mmap_checkpoint(path), map_location='cpu', mmap=True, weights_only=True)
+    model = MappedWhisper(whisper.model.ModelDimensions(**checkpoint['dims']))
+    model.load_state_dict(checkpoint['model_state_dict'], assign=True)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model
+
+
+def load_whisper(model_name):
+    if settings.WHISPER_MMAP_WEIGHTS:
+        return load_whisper_mmap(model_name)
+    return whisper.load_model(model_name)
+
+
+def load_whisper_int8(model_name):
+    # Quantized kernels are CPU-only
+    return quantize_whisper(whisper.load_model(model_name, device='cpu'))
+
+
+def load_stub(model_name):
+    return StubTranscriber(model_name)
+
+
+BACKENDS = {
+    'whisper': load_whisper,
+    'whisper-int8': load_whisper_int8,
+    'stub': load_stub,
+}
+
+
+def load_backend(backend, model_name):
+    """Build the engine `backend` for a Whisper model size"""
+    try:
+        loader = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown transcription backend '{backend}'. Use one of: {', '.join(BACKENDS)}.")
+    return loader(model_name)
+
+
+def supports_batching(engine):
+    """Cross-video batching drives whisper.decode directly, so it needs a Whisper module"""
+    return isinstance(engine, whisper.model.Whisper)
+
+
+def normalize_words(text):
+    return re.sub(r"[^\w\s']", ' ', text.lower()).split()
+
+
+def word_error_rate(reference, hypothesis):
+    """(substitutions + deletions + insertions) / reference words, on lowercased words without punctuation"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i]
+        for j, hyp_word in enumerate(hyp, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word),
+            ))
+        previous = current
+    return previous[-1] / len(ref)
@@ -1,98 +1,646 @@
 # utils/video_helper.py - Video processing utilities
 import whisper
+import json
 import os
+import struct
 import subprocess
-from groq import Groq
-from api.models import Video, Transcript, Summary
+import numpy as np
+import torch
+from functools import lru_cache
+from django.core.files import File
+from whisper.audio import SAMPLE_RATE, N_SAMPLES
+from api.models import Video, Transcript
 from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from utils.model_policy import select_model, get_backlog, realtime_factor
+from utils.checkpoints import get_checkpoint, save_checkpoint, clear_checkpoints
+from utils.summary_helper import generate_summary
+from utils.storage import acquire_blob, release_blob
+from utils import media_probe
+from utils.media_probe import MediaInfo
+from utils.http_cache import bump_content_version
+from utils.transcription_backends import load_backend, supports_batching
+from utils.word_timings import pack_words
 
-client = Groq(api_key=settings.GROQ_API_KEY)
 
+def ffprobe_media(file_path):
+    """Fallback probe for containers the in-process parser doesn't handle"""
+    cmd = [
+        'ffprobe',
+        '-v', 'quiet',
+        '-show_entries', 'format=duration,bit_rate:stream=codec_type,codec_name,sample_rate',
+        '-of', 'json',
+        file_path
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffprobe error: {result.stderr}")
+    data = json.loads(result.stdout)
+    streams = data.get('streams', [])
+    audio = next((stream for stream in streams if stream.get('codec_type') == 'audio'), {})
+    fmt = data.get('format', {})
+    return MediaInfo(
+        duration=float(fmt.get('duration') or 0.0),
+        audio_codec=audio.get('codec_name', ''),
+        sample_rate=int(audio['sample_rate']) if audio.get('sample_rate') else None,
+        bitrate=int(fmt['bit_rate']) if fmt.get('bit_rate') else None,
+        stream_count=len(streams),
+    )
 
-def get_video_duration(file_path):
-    """Get video duration using ffprobe"""
+
+def probe_video(file_path):
+    """
+    Container metadata (duration, audio codec, sample rate, bitrate, streams).
+    Parsed in-process from the MP4/Matroska header; ffprobe only as a fallback.
+    """
     try:
-        cmd = [
-            'ffprobe', 
-            '-v', 'quiet', 
-            '-show_entries', 'format=duration', 
-            '-of', 'csv=p=0', 
-            file_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-        else:
-            print(f"ffprobe error: {result.stderr}")
-            return 0.0
+        return media_probe.probe(file_path)
+    except (media_probe.ProbeError, OSError, struct.error) as e:
+        print(f"Header probe failed for {file_path} ({e}), falling back to ffprobe")
+    try:
+        return ffprobe_media(file_path)
     except Exception as e:
         print(f"Error getting video duration: {e}")
-        return 0.0
+        return MediaInfo(0.0, '', None, None, None)
 
 
-def process_video(video_obj):
+def get_video_duration(file_path):
+    """Get video duration in seconds (0.0 if it can't be determined)"""
+    return probe_video(file_path).duration
+
+
+MEDIA_INFO_FIELDS = ['duration', 'audio_codec', 'sample_rate', 'bitrate', 'stream_count']
+
+
+def apply_media_info(video_obj, info):
+    """Copy probed container metadata onto the video (MEDIA_INFO_FIELDS), without saving"""
+    video_obj.duration = info.duration or None
+    video_obj.audio_codec = info.audio_codec
+    video_obj.sample_rate = info.sample_rate
+    video_obj.bitrate = info.bitrate
+    video_obj.stream_count = info.stream_count
+
+
+def store_media_info(video_obj, info):
+    """Persist probed container metadata on the video"""
+    apply_media_info(video_obj, info)
+    video_obj.save(update_fields=MEDIA_INFO_FIELDS)
+
+
+@lru_cache(maxsize=None)
+def load_whisper_model(model_name, backend=''):
     """
-    Transcribe the full audio into a single transcript and summarize it.
-    Alternative function that takes video object directly.
+    Load a transcription engine once per worker process: the video's backend,
+    or TRANSCRIPTION_BACKEND for this worker (see utils/transcription_backends.py)
     """
-    file_path = video_obj.file.path
+    return load_backend(backend or settings.TRANSCRIPTION_BACKEND, model_name)
 
-    # Load Whisper model
-    model = whisper.load_model("base")  # or "small", "medium", etc.
 
-    # Transcribe the full audio
-    result = model.transcribe(file_path)
-    full_text = result["text"]  # full transcription as a single string
-    
-    # Get actual video duration
-    video_duration = get_video_duration(file_path)
+def audio_cache_path(video_obj):
+    return os.path.join(settings.AUDIO_CACHE_DIR, f"{video_obj.id}.pcm")
+
+
+def decode_audio(file_path, output_path):
+    """Decode a media file to raw 16 kHz mono s16le PCM"""
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    partial_path = f"{output_path}.part"
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-y',
+        '-i', file_path,
+        '-f', 's16le',
+        '-ac', '1',
+        '-acodec', 'pcm_s16le',
+        '-ar', str(SAMPLE_RATE),
+        partial_path
+    ]
+    subprocess.run(cmd, capture_output=True, check=True)
+    os.replace(partial_path, output_path)
+
+
+def media_source_path(video_obj):
+    """The file to decode: the original upload, or the audio derivative once it was dropped"""
+    return video_obj.file.path if video_obj.file else video_obj.audio_file.path
+
+
+def encode_audio_derivative(video_obj):
+    """
+    Store a compact Opus copy of the audio track (speech at ~24 kbit/s) so the
+    original upload can be dropped and the video still reprocessed later.
+    Built from the decoded PCM cache when it is still around.
+    """
+    if video_obj.audio_file:
+        return video_obj.audio_file.name
+    checkpoint = get_checkpoint(video_obj, 'audio')
+    if checkpoint and os.path.exists(checkpoint['path']):
+        source = ['-f', 's16le', '-ar', str(SAMPLE_RATE), '-ac', '1', '-i', checkpoint['path']]
+    else:
+        source = ['-i', video_obj.file.path]
+    output_path = f"{audio_cache_path(video_obj)}.ogg"
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-y',
+        *source,
+        '-vn',
+        '-ac', '1',
+        '-c:a', 'libopus',
+        '-b:a', settings.MEDIA_AUDIO_BITRATE,
+        '-application', 'voip',
+        output_path
+    ]
+    try:
+        subprocess.run(cmd, capture_output=True, check=True)
+        with open(output_path, 'rb') as audio:
+            video_obj.audio_file.save(f"{video_obj.id}.ogg", File(audio), save=False)
+        acquire_blob(video_obj.audio_file.name)
+        video_obj.save(update_fields=['audio_file'])
+        return video_obj.audio_file.name
+    finally:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+
+
+def drop_original(video_obj):
+    """Release the original upload once an audio derivative exists"""
+    if not video_obj.file or not video_obj.audio_file:
+        return
+    release_blob(video_obj.file.name)
+    video_obj.file = ''
+    video_obj.save(update_fields=['file'])
+
+
+def archive_media(video_obj):
+    """
+    After processing: keep the Opus derivative and, if configured, drop the
+    original upload. Failures are logged only; the video is already processed.
+    """
+    try:
+        encode_audio_derivative(video_obj)
+        if settings.MEDIA_DROP_ORIGINAL_AFTER_PROCESSING:
+            drop_original(video_obj)
+    except Exception as e:
+        print(f"Error archiving media for video {video_obj.id}: {e}")
+
+
+def load_pcm(path, seconds=None, start=0.0):
+    """Read cached PCM (optionally only `seconds` from `start`) as float32"""
+    count = int(seconds * SAMPLE_RATE) if seconds else -1
+    offset = int(start * SAMPLE_RATE) * 2  # 2 bytes per s16 sample
+    return np.fromfile(path, dtype=np.int16, count=count, offset=offset).astype(np.float32) / 32768.0
+
+
+def is_pcm_cache(path):
+    return path.endswith('.pcm')
+
+
+def open_pcm_stream(file_path, start=0.0):
+    """ffmpeg decoding a media file to 16 kHz mono s16le on its stdout, from `start` seconds"""
+    cmd = [
+        'ffmpeg',
+        '-nostdin',
+        '-v', 'error',
+        '-ss', f"{start:.3f}",
+        '-i', file_path,
+        '-f', 's16le',
+        '-ac', '1',
+        '-acodec', 'pcm_s16le',
+        '-ar', str(SAMPLE_RATE),
+        'pipe:1'
+    ]
+    return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+
+def read_pcm(stream, seconds):
+    """Read up to `seconds` of s16le from a pipe as float32; a short read means end of stream"""
+    wanted = int(seconds * SAMPLE_RATE) * 2
+    buffer = bytearray(wanted)
+    view = memoryview(buffer)
+    filled = 0
+    while filled < wanted:
+        count = stream.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return np.frombuffer(buffer, dtype=np.int16, count=filled // 2).astype(np.float32) / 32768.0
+
+
+def pcm_windows(path, seconds, start=0.0):
+    """
+    Yield consecutive `seconds`-long float32 windows from `start` until the
+    audio ends (the last window is short or empty). The PCM cache is read
+    directly; any other file is decoded through one ffmpeg pipe, so only a
+    single window is ever held in memory whatever the file's length.
+    """
+    if is_pcm_cache(path):
+        while True:
+            audio = load_pcm(path, seconds=seconds, start=start)
+            yield audio
+            if len(audio) < int(seconds * SAMPLE_RATE):
+                return
+            start += seconds
+
+    process = open_pcm_stream(path, start)
+    try:
+        while True:
+            audio = read_pcm(process.stdout, seconds)
+            if len(audio) < int(seconds * SAMPLE_RATE) and process.wait() != 0:
+                raise subprocess.CalledProcessError(process.returncode, 'ffmpeg')
+            yield audio
+            if len(audio) < int(seconds * SAMPLE_RATE):
+                return
+    finally:
+        process.stdout.close()
+        if process.poll() is None:
+            process.kill()
+        process.wait()
+
+
+def load_audio(path, seconds, start=0.0):
+    """One window of audio from the PCM cache or, in streaming mode, from the media file"""
+    windows = pcm_windows(path, seconds, start)
+    try:
+        return next(windows)
+    finally:
+        windows.close()
+
+
+def ensure_audio(video_obj):
+    """Stage 1: decoded audio cache, reused by retries instead of decoding again"""
+    checkpoint = get_checkpoint(video_obj, 'audio')
+    if checkpoint and os.path.exists(checkpoint['path']):
+        return checkpoint['path']
+    path = audio_cache_path(video_obj)
+    decode_audio(media_source_path(video_obj), path)
+    save_checkpoint(video_obj, 'audio', {'path': path})
+    return path
+
+
+def release_audio(video_obj):
+    """Drop the decoded audio cache once the video is fully processed"""
+    checkpoint = get_checkpoint(video_obj, 'audio')
+    if checkpoint and os.path.exists(checkpoint['path']):
+        os.remove(checkpoint['path'])
+    clear_checkpoints(video_obj, 'audio')
+
+
+def detect_language(audio_path):
+    """
+    Detect the spoken language from a short sample at the start of the audio.
+    Returns (language_code, probability), or (None, 0.0) if detection fails.
+    """
+    try:
+        model = load_whisper_model(settings.WHISPER_LANGUAGE_DETECTION_MODEL)
+        audio = whisper.pad_or_trim(load_audio(audio_path, settings.WHISPER_LANGUAGE_SAMPLE_SECONDS))
+        mel = whisper.log_mel_spectrogram(audio, model.dims.n_mels).to(model.device)
+        _, probs = model.detect_language(mel)
+        language = max(probs, key=probs.get)
+        return language, probs[language]
+    except Exception as e:
+        print(f"Error detecting language: {e}")
+        return None, 0.0
+
+
+def detect_video_language(video_obj, audio_path):
+    """Detect and store the language of a video; returns the code to pin or None"""
+    language, probability = detect_language(audio_path)
+    if language is None or probability < settings.WHISPER_LANGUAGE_MIN_PROBABILITY:
+        return None
+    video_obj.language = language
+    video_obj.save(update_fields=['language'])
+    return language
+
+
+def english_model(model_name):
+    """Return the English-only checkpoint for a model size when one exists"""
+    english_name = f"{model_name}.en"
+    return english_name if english_name in whisper.available_models() else model_name
+
+
+def choose_model(video_obj, duration, language=None):
+    """
+    Pick the Whisper model for a video and record the choice on it.
+    English content is routed to the matching `.en` checkpoint.
+    """
+    queue_depth, backlog_seconds = get_backlog(exclude_video_id=video_obj.id)
+    model_name, reason = select_model(
+        duration,
+        quality=video_obj.quality,
+        queue_depth=queue_depth,
+        backlog_seconds=backlog_seconds,
+    )
+    if language == 'en' and english_model(model_name) != model_name:
+        model_name = english_model(model_name)
+        reason = f"{reason}; English detected: routed to {model_name}"
+    video_obj.duration = duration
+    video_obj.whisper_model = model_name
+    video_obj.model_selection_reason = reason
+    video_obj.save(update_fields=['duration', 'whisper_model', 'model_selection_reason'])
+    return model_name
+
+
+def save_transcript(video_obj, segments, language=''):
+    """
+    Stage 2 output: replace the video's transcript segments in one transaction
+    and checkpoint the stage, so reruns never leave duplicate transcripts.
+    """
+    with transaction.atomic():
+        Transcript.objects.filter(video=video_obj).delete()
+        transcripts = Transcript.objects.bulk_create([
+            Transcript(
+                video=video_obj,
+                text=segment['text'].strip(),
+                start_time=segment['start'],
+                end_time=segment['end'],
+                language=language,
+                word_timings=pack_words(segment.get('words'), segment['text'].strip()),
+            )
+            for segment in segments
+        ])
+        save_checkpoint(video_obj, 'transcript', {'segments': len(transcripts), 'language': language})
+        bump_content_version(video_obj)
+    return transcripts
+
+
+def edit_transcript(video_obj, edits):
+    """
+    Apply {segment id: corrected text} to the video's segments in one UPDATE
+    batch. Word timings of edited segments no longer match their text and are
+    dropped. Returns the number of segments whose text actually changed.
+    """
+    segments = list(Transcript.objects.filter(video=video_obj, id__in=edits).defer('word_timings'))
+    changed = [segment for segment in segments if segment.text != edits[segment.id]]
+    now = timezone.now()
+    for segment in changed:
+        segment.text = edits[segment.id]
+        segment.word_timings = b''
+        segment.updated_at = now
+    with transaction.atomic():
+        Transcript.objects.bulk_update(changed, ['text', 'word_timings', 'updated_at'])
+        if changed:
+            bump_content_version(video_obj)
+    return len(changed)
+
+
+def transcribe_video(video_obj, model, audio_path, language=None, summarizer=None):
+    """
+    Stage 2: transcribe in TRANSCRIPTION_STREAM_WINDOW_SECONDS windows,
+    committing each window's segments as soon as Whisper returns them
+    (readers can poll the transcript with ?since= while the rest is running).
+    `audio_path` is the PCM cache or, in streaming mode (AUDIO_STREAM_DECODE),
+    the media file itself, decoded through a pipe one window at a time.
+    A StreamingSummarizer, if given, is fed after every window.
+    Resumes from the 'transcript_progress' checkpoint after a retry.
+    """
+    progress = get_checkpoint(video_obj, 'transcript_progress') or {
+        **initial_progress(video_obj),
+        'window': settings.TRANSCRIPTION_STREAM_WINDOW_SECONDS,
+        'language': language or video_obj.language,
+    }
+    if progress['done']:
+        return transcript_segments(video_obj)
+    windows = pcm_windows(audio_path, progress['window'], progress['offset'])
+    carry = np.zeros(0, dtype=np.float32)  # audio after the committed boundary, redone with the next window
+    try:
+        while not progress['done']:
+            # A file ending exactly on a window boundary yields nothing more
+            fresh = next(windows, np.zeros(0, dtype=np.float32))
+            audio = np.concatenate([carry, fresh]) if len(carry) else fresh
+            start = progress['offset']
+            last = len(fresh) < int(progress['window'] * SAMPLE_RATE)
+            progress = transcribe_window_audio(video_obj, model, audio, progress, last)
+            carry = audio[int(round((progress['offset'] - start) * SAMPLE_RATE)):]
+            if summarizer is not None:
+                summarizer.submit()
+    finally:
+        windows.close()
+    return transcript_segments(video_obj)
+
+
+def needs_continuation(duration, model_name):
+    """Whether transcription is likely to outlive a single task's time budget"""
+    budget = settings.CELERY_TASK_SOFT_TIME_LIMIT * settings.TRANSCRIPTION_TASK_BUDGET_FRACTION
+    return duration * realtime_factor(model_name) > budget
+
+
+def initial_progress(video_obj):
+    return {
+        'offset': 0.0,
+        'window': settings.TRANSCRIPTION_WINDOW_SECONDS,
+        'language': video_obj.language,
+        'prompt': '',
+        'done': False,
+    }
+
+
+def transcribe_next_window(video_obj, model, audio_path, progress):
+    """Continuation mode: transcribe the window of cached audio at progress['offset']"""
+    audio = load_audio(audio_path, progress['window'], progress['offset'])
+    return transcribe_window_audio(video_obj, model, audio, progress)
+
+
+def window_boundary(segments, seconds):
+    """
+    Where to end a window that isn't the last: before its final segment if
+    that runs into the cut (TRANSCRIPTION_BOUNDARY_SECONDS), so the words
+    around the cut are transcribed again, whole, by the next window. Only
+    done when it still advances by half the window. Returns (seconds, segments to keep).
+    """
+    if segments:
+        tail = segments[-1]
+        if tail['end'] >= seconds - settings.TRANSCRIPTION_BOUNDARY_SECONDS and tail['start'] >= seconds / 2:
+            return tail['start'], segments[:-1]
+    return seconds, segments
+
+
+def store_window_segments(video_obj, rows, offset):
+    """
+    Write a window's segments over what an earlier run of the same window
+    wrote (a retry or reprocess), reusing those rows in order so segment ids
+    stay stable for clients polling with ?since=<id>.
+    """
+    existing = list(Transcript.objects.filter(video=video_obj, start_time__gte=offset).order_by('start_time', 'id'))
+    now = timezone.now()
+    for row, old in zip(rows, existing):
+        row.id = old.id
+        row.created_at = old.created_at
+        row.updated_at = now
+    reused = rows[:len(existing)]
+    Transcript.objects.bulk_update(reused, ['text', 'start_time', 'end_time', 'language', 'word_timings', 'updated_at'])
+    Transcript.objects.filter(id__in=[old.id for old in existing[len(rows):]]).delete()
+    Transcript.objects.bulk_create(rows[len(existing):])
+
+
+def transcribe_window_audio(video_obj, model, audio, progress, last=None):
+    """
+    Transcribe one window of audio starting at progress['offset'], persist its
+    segments and advance the 'transcript_progress' checkpoint in the same
+    transaction. The tail of the previous window's text is passed as prompt
+    to carry context across windows. Unless this is the `last` window (by
+    default: shorter than progress['window']), a final segment cut by the
+    window end is left to the next window, which starts at the returned offset.
+    """
+    offset = progress['offset']
+    if last is None:
+        last = len(audio) < progress['window'] * SAMPLE_RATE
+    if len(audio):
+        result = model.transcribe(
+            audio,
+            language=progress['language'] or None,
+            initial_prompt=progress['prompt'] or None,
+            word_timestamps=settings.TRANSCRIPTION_WORD_TIMESTAMPS,
+        )
+    else:
+        result = {"segments": [], "language": ""}  # previous window ended exactly at the end of the file
+    language = progress['language'] or result.get("language", "")
+    seconds = len(audio) / SAMPLE_RATE
+    segments = [segment for segment in result["segments"] if segment['text'].strip()]
+    if not last:
+        seconds, segments = window_boundary(segments, seconds)
+    end = offset + seconds
+    texts = [segment['text'].strip() for segment in segments]
+
+    with transaction.atomic():
+        # A redelivered window replaces what it wrote before
+        store_window_segments(video_obj, [
+            Transcript(
+                video=video_obj,
+                text=text,
+                start_time=offset + segment['start'],
+                end_time=min(end, offset + segment['end']),
+                language=language,
+                word_timings=pack_words(segment.get('words'), text, offset),
+            )
+            for segment, text in zip(segments, texts)
+        ], offset)
+        progress = {
+            **progress,
+            'offset': end,
+            'language': language,
+            'prompt': ' '.join(texts)[-settings.TRANSCRIPTION_PROMPT_CHARS:],
+            'done': last,
+        }
+        save_checkpoint(video_obj, 'transcript_progress', progress)
+        bump_content_version(video_obj)
+        if progress['done']:
+            count = Transcript.objects.filter(video=video_obj).count()
+            save_checkpoint(video_obj, 'transcript', {'segments': count, 'language': language})
+    return progress
+
+
+def transcript_segments(video_obj):
+    return list(Transcript.objects.filter(video=video_obj).order_by('start_time', 'id').defer('word_timings'))
 
-    # Save single transcript
-    transcript = Transcript.objects.create(
-        video=video_obj,
-        text=full_text,
-        start_time=0.0,
-        end_time=video_duration
+
+def is_batchable(duration):
+    """Whether a clip is short enough for the cross-video batching worker"""
+    return (
+        settings.WHISPER_BATCH_SHORT_CLIPS
+        and 0 < duration <= settings.WHISPER_BATCH_MAX_DURATION
     )
 
+
+def transcribe_audio_batch(model, audios, language=None, batch_size=None):
+    """
+    Transcribe several short clips with batched encoder/decoder passes.
+
+    Every clip (16 kHz float32 array) is cut into 30 s windows and all windows
+    go through `whisper.decode` together, `batch_size` mel windows at a time.
+    Returns, per clip, a list of {start, end, text, language} windows.
+    """
+    mels = []
+    windows = []  # (clip index, start seconds, end seconds)
+    for index, audio in enumerate(audios):
+        for offset in range(0, max(len(audio), 1), N_SAMPLES):
+            window = whisper.pad_or_trim(audio[offset:offset + N_SAMPLES])
+            mels.append(whisper.log_mel_spectrogram(window, model.dims.n_mels))
+            end = min(len(audio), offset + N_SAMPLES)
+            windows.append((index, offset / SAMPLE_RATE, end / SAMPLE_RATE))
+
+    options = whisper.DecodingOptions(
+        language=language,
+        without_timestamps=True,
+        fp16=model.device.type == 'cuda',
+    )
+    results = []
+    batch_size = batch_size or settings.WHISPER_BATCH_SIZE
+    for offset in range(0, len(mels), batch_size):
+        batch = torch.stack(mels[offset:offset + batch_size]).to(model.device)
+        results.extend(whisper.decode(model, batch, options))
+
+    clips = [[] for _ in audios]
+    for (index, start, end), result in zip(windows, results):
+        clips[index].append({
+            'start': start,
+            'end': end,
+            'text': result.text.strip(),
+            'language': result.language or '',
+        })
+    return clips
+
+
+def transcribe_clip_batch(model, file_paths, language=None):
+    """Decode short clip files and transcribe them as one batch (one by one for non-Whisper engines)"""
+    audios = [whisper.load_audio(path) for path in file_paths]
+    if supports_batching(model):
+        return transcribe_audio_batch(model, audios, language)
+    clips = []
+    for audio in audios:
+        result = model.transcribe(audio, language=language, word_timestamps=settings.TRANSCRIPTION_WORD_TIMESTAMPS)
+        clips.append([
+            {'start': s['start'], 'end': s['end'], 'text': s['text'].strip(), 'language': result.get('language', ''),
+             'words': s.get('words')}
+            for s in result['segments']
+        ])
+    return clips
+
+
+def process_video(video_obj):
+    """
+    Transcribe the full audio into transcript segments and summarize it.
+    Alternative function that takes video object directly; completed stages
+    are skipped, so it can also finish a partially processed video.
+    """
+    file_path = media_source_path(video_obj)
+
+    # Get actual video duration (cheap, drives the model choice)
+    video_duration = get_video_duration(file_path)
+    # Streaming mode decodes through a pipe while transcribing instead of caching PCM
+    audio_path = file_path if settings.AUDIO_STREAM_DECODE else ensure_audio(video_obj)
+
+    if get_checkpoint(video_obj, 'transcript') is None:
+        # Detect the language on a short sample so the model doesn't have to
+        language = detect_video_language(video_obj, audio_path)
+
+        # Load Whisper model picked by the selection policy
+        model = load_whisper_model(choose_model(video_obj, video_duration, language), video_obj.transcription_backend)
+        transcribe_video(video_obj, model, audio_path, language)
+    transcripts = transcript_segments(video_obj)
+    full_text = " ".join(t.text for t in transcripts)
+
+    # Mark the language before summarizing so the prompt can use it
+    video_obj.language = video_obj.language or (transcripts[0].language if transcripts else '')
+
     # Create summary using Groq
-    summary = generate_summary(transcript)
+    summary = generate_summary(video_obj)
 
     # Mark video as processed
     video_obj.processed = True
+    video_obj.status = 'completed'
     video_obj.duration = video_duration
     video_obj.save()
+    archive_media(video_obj)
+    release_audio(video_obj)
 
     # Return serializable data instead of model objects
     return {
-        "transcript_id": transcript.id,
-        "transcript_text": transcript.text,
+        "transcript_ids": [t.id for t in transcripts],
+        "transcript_text": full_text,
         "summary_id": summary.id,
         "summary_text": summary.text,
         "duration": video_obj.duration,
         "message": f"Successfully processed video {video_obj.id}"
     }
-
-def generate_summary(transcript):
-    """
-    Generate summary for a video's transcript using Groq LLM.
-    """
-    if not transcript or not transcript.text.strip():
-        raise ValueError("Transcript is empty, cannot generate summary.")
-
-    video_obj = transcript.video
-
-    # Ask Groq LLM to summarize
-    response = client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[
-            {"role": "system", "content": "You are an assistant that summarizes transcripts clearly and concisely."},
-            {"role": "user", "content": f"Summarize this transcript:\n\n{transcript.text}"}
-        ]
-    )
-
-    summary_text = response.choices[0].message.content
-
-    # Save summary in DB
-    summary = Summary.objects.create(video=video_obj, text=summary_text)
-    return summary
@@ -0,0 +1,77 @@
+# utils/word_timings.py - Word-level timestamps packed into one binary value per segment
+"""
+A segment's words are stored as three little-endian uint32 columns, one
+after the other:
+
+    starts[n]   word start, milliseconds from the start of the video
+    ends[n]     word end, milliseconds
+    offsets[n]  character offset of the word in the segment's text
+
+so a time range is found with a binary search on `starts` and the word
+texts are slices of the segment text. 12 bytes per word, no parsing.
+"""
+import numpy as np
+
+WORD_DTYPE = np.dtype('<u4')
+COLUMNS = 3
+
+
+def pack_words(words, text, offset=0.0):
+    """
+    Pack Whisper's word list ({'word', 'start', 'end'}, times relative to
+    `offset`) for a segment whose stored text is `text`. Returns b'' when
+    there are no words.
+    """
+    if not words:
+        return b''
+    starts, ends, positions = [], [], []
+    cursor = 0
+    for word in words:
+        token = word['word'].strip()
+        found = text.find(token, cursor) if token else -1
+        position = found if found >= 0 else cursor  # text no longer matches the words exactly
+        start_ms = round((offset + word['start']) * 1000)
+        starts.append(start_ms)
+        ends.append(max(start_ms, round((offset + word['end']) * 1000)))
+        positions.append(position)
+        cursor = position + len(token) if found >= 0 else cursor
+    return np.array([starts, ends, positions], dtype=WORD_DTYPE).tobytes()
+
+
+def unpack_words(packed):
+    """(starts, ends, offsets) arrays viewing `packed` without copying"""
+    columns = np.frombuffer(packed or b'', dtype=WORD_DTYPE)
+    return columns.reshape(COLUMNS, len(columns) // COLUMNS)
+
+
+def word_count(packed):
+    return len(packed or b'') // (WORD_DTYPE.itemsize * COLUMNS)
+
+
+def segment_words(packed, text, start=None, end=None):
+    """
+    Words of one segment overlapping [start, end) seconds, as
+    (start ms, end ms, word) tuples. Only the matching slice is decoded.
+    """
+    starts, ends, offsets = unpack_words(packed)
+    first = 0 if start is None else int(np.searchsorted(ends, round(start * 1000), side='right'))
+    last = len(starts) if end is None else int(np.searchsorted(starts, round(end * 1000), side='left'))
+    bounds = offsets[first:last + 1].tolist()
+    if len(bounds) == last - first:
+        bounds.append(len(text))
+    return [
+        (word_start, word_end, text[bounds[i]:bounds[i + 1]].strip())
+        for i, (word_start, word_end) in enumerate(zip(starts[first:last].tolist(), ends[first:last].tolist()))
+    ]
+
+
+def words_in_range(rows, start=None, end=None):
+    """
+    Words overlapping [start, end) seconds from (segment id, text, packed)
+    rows in time order, as {segment_id, start, end, word} dicts.
+    """
+    return [
+        {'segment_id': segment_id, 'start': word_start / 1000, 'end': word_end / 1000, 'word': word}
+        for segment_id, text, packed in rows
+        for word_start, word_end, word in segment_words(packed, text, start, end)
+    ]
@@ -0,0 +1,57 @@
+# utils/worker_memory.py - Share model weights between prefork children and measure what they cost
+import gc
+import time
+from collections import namedtuple
+
+from django.conf import settings
+
+MemoryUsage = namedtuple('MemoryUsage', ['rss', 'pss', 'uss'])  # bytes
+
+SMAPS_FIELDS = {'Rss': 'rss', 'Pss': 'pss', 'Private_Clean': 'uss', 'Private_Dirty': 'uss'}
+
+
+def parse_model_specs(value):
+    """'base,small:whisper-int8' -> [('base', ''), ('small', 'whisper-int8')]"""
+    specs = []
+    for item in value.split(','):
+        name, _, backend = item.strip().partition(':')
+        if name:
+            specs.append((name, backend))
+    return specs
+
+
+def preload_models(specs=None):
+    """
+    Load models in the worker parent before the pool forks. Children inherit
+    the load_whisper_model cache, and the weights stay shared copy-on-write
+    as long as nobody writes to them. Returns the seconds spent loading.
+    """
+    import torch
+    from utils.video_helper import load_whisper_model
+
+    specs = parse_model_specs(settings.WORKER_PRELOAD_MODELS) if specs is None else specs
+    if not specs:
+        return 0.0
+    # One thread: an OpenMP pool started in the parent is not fork-safe.
+    # Children set their own thread count in worker_process_init.
+    torch.set_num_threads(1)
+    started = time.monotonic()
+    for name, backend in specs:
+        load_whisper_model(name, backend)
+    # Keep the cyclic GC from touching (and so copying) the inherited objects in every child
+    gc.freeze()
+    return time.monotonic() - started
+
+
+def memory_usage(pid='self'):
+    """RSS, PSS and USS (private pages) of a process from /proc/<pid>/smaps_rollup, None if unavailable"""
+    totals = {'rss': 0, 'pss': 0, 'uss': 0}
+    try:
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                key, _, rest = line.partition(':')
+                if key in SMAPS_FIELDS:
+                    totals[SMAPS_FIELDS[key]] += int(rest.split()[0]) * 1024
+    except (OSError, ValueError):
+        return None
+    return MemoryUsage(**totals)